@@ -0,0 +1,56 @@
+"""Add performance indexes
+
+Revision ID: 3f9c1d7a2b64
+Revises: ae02454c4bed
+Create Date: 2026-10-18 10:12:41.512804
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c1d7a2b64"
+down_revision: Union[str, None] = "ae02454c4bed"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Index sur les clés étrangères et les colonnes filtrées par les DAO
+    op.create_index(
+        op.f("ix_clients_commercial_contact"), "clients", ["commercial_contact"]
+    )
+    op.create_index(op.f("ix_contracts_client_id"), "contracts", ["client_id"])
+    op.create_index(op.f("ix_contracts_commercial_id"), "contracts", ["commercial_id"])
+    op.create_index(op.f("ix_events_contract_id"), "events", ["contract_id"])
+    op.create_index(op.f("ix_events_support_contact"), "events", ["support_contact"])
+
+    # Index partiels : seules les lignes non signées / non payées sont indexées
+    op.create_index(
+        "ix_contracts_unsigned_client_id",
+        "contracts",
+        ["client_id"],
+        postgresql_where=sa.text("signed = false"),
+        sqlite_where=sa.text("signed = 0"),
+    )
+    op.create_index(
+        "ix_contracts_unpaid_client_id",
+        "contracts",
+        ["client_id"],
+        postgresql_where=sa.text("amount_remaining > 0"),
+        sqlite_where=sa.text("amount_remaining > 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contracts_unpaid_client_id", table_name="contracts")
+    op.drop_index("ix_contracts_unsigned_client_id", table_name="contracts")
+    op.drop_index(op.f("ix_events_support_contact"), table_name="events")
+    op.drop_index(op.f("ix_events_contract_id"), table_name="events")
+    op.drop_index(op.f("ix_contracts_commercial_id"), table_name="contracts")
+    op.drop_index(op.f("ix_contracts_client_id"), table_name="contracts")
+    op.drop_index(op.f("ix_clients_commercial_contact"), table_name="clients")
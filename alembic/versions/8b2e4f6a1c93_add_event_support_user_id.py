@@ -0,0 +1,107 @@
+"""Add events.support_user_id with a chunked backfill
+
+Revision ID: 8b2e4f6a1c93
+Revises: 3f9c1d7a2b64
+Create Date: 2026-10-18 14:37:05.208117
+
+Adds a typed integer FK to users.id next to the legacy text column
+events.support_contact, then copies the numeric values over in bounded
+id ranges, each committed on its own so no long lock is held on `events`.
+The chunk size can be tuned with `alembic -x backfill_chunk=N upgrade head`.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2e4f6a1c93"
+down_revision: Union[str, None] = "3f9c1d7a2b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_BACKFILL_CHUNK = 10000
+
+
+def _backfill_support_user_id(bind, chunk):
+    """Copy numeric support_contact values into support_user_id, chunk by chunk."""
+    if bind.dialect.name == "postgresql":
+        is_numeric = "support_contact ~ '^[0-9]{1,9}$'"
+    else:
+        is_numeric = (
+            "support_contact <> '' AND length(support_contact) <= 9 "
+            "AND support_contact NOT GLOB '*[^0-9]*'"
+        )
+    # Le CASE garantit que le CAST n'est évalué que sur des valeurs numériques
+    as_integer = f"CASE WHEN {is_numeric} THEN CAST(support_contact AS INTEGER) END"
+    update = (
+        f"UPDATE events SET support_user_id = {as_integer} "
+        f"WHERE support_user_id IS NULL AND {as_integer} IN (SELECT id FROM users)"
+    )
+    if context.is_offline_mode():
+        # En mode --sql, les bornes de la table ne sont pas connues : une seule requête
+        op.execute(update)
+        return
+
+    statement = sa.text(f"{update} AND id > :low AND id <= :high")
+    low, high = bind.execute(sa.text("SELECT MIN(id), MAX(id) FROM events")).one()
+    if low is None:
+        return
+    # Chaque plage d'IDs est validée séparément (autocommit)
+    for start in range(low - 1, high, chunk):
+        bind.execute(statement, {"low": start, "high": start + chunk})
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    chunk = int(
+        context.get_x_argument(as_dictionary=True).get(
+            "backfill_chunk", DEFAULT_BACKFILL_CHUNK
+        )
+    )
+
+    # Colonne nullable sans défaut : l'ajout ne réécrit pas la table
+    op.add_column("events", sa.Column("support_user_id", sa.Integer(), nullable=True))
+    if bind.dialect.name != "sqlite":
+        # NOT VALID : la contrainte s'applique aux nouvelles écritures sans scanner la table
+        op.create_foreign_key(
+            "fk_events_support_user_id_users",
+            "events",
+            "users",
+            ["support_user_id"],
+            ["id"],
+            postgresql_not_valid=True,
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_events_support_user_id"),
+            "events",
+            ["support_user_id"],
+            postgresql_concurrently=True,
+        )
+        _backfill_support_user_id(bind, chunk)
+        if bind.dialect.name == "postgresql":
+            # La validation ne bloque pas les écritures concurrentes
+            op.execute(
+                "ALTER TABLE events VALIDATE CONSTRAINT fk_events_support_user_id_users"
+            )
+
+    # L'ancienne colonne texte n'est plus filtrée par les DAO
+    op.drop_index(op.f("ix_events_support_contact"), table_name="events")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_events_support_contact"), "events", ["support_contact"])
+    op.drop_index(op.f("ix_events_support_user_id"), table_name="events")
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_constraint(
+            "fk_events_support_user_id_users", "events", type_="foreignkey"
+        )
+        op.drop_column("events", "support_user_id")
+    else:
+        with op.batch_alter_table("events") as batch_op:
+            batch_op.drop_column("support_user_id")
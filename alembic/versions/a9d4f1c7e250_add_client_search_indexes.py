@@ -0,0 +1,75 @@
+"""Add the client search indexes
+
+Revision ID: a9d4f1c7e250
+Revises: f2c6e8b1d947
+Create Date: 2026-10-18 20:26:37.118402
+
+PostgreSQL: pg_trgm GIN index on name, company and email, built
+concurrently. SQLite: FTS5 trigram table over the same columns, kept in
+sync by triggers and filled from the existing rows.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d4f1c7e250"
+down_revision: Union[str, None] = "f2c6e8b1d947"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_EXPRESSION = "(full_name || ' ' || coalesce(company_name, '') || ' ' || email)"
+
+SQLITE_TRIGGERS = {
+    "clients_search_ai": (
+        "AFTER INSERT ON clients BEGIN "
+        "INSERT INTO clients_search(rowid, full_name, company_name, email) "
+        "VALUES (new.id, new.full_name, new.company_name, new.email); END"
+    ),
+    "clients_search_ad": (
+        "AFTER DELETE ON clients BEGIN "
+        "INSERT INTO clients_search(clients_search, rowid, full_name, company_name, email) "
+        "VALUES ('delete', old.id, old.full_name, old.company_name, old.email); END"
+    ),
+    "clients_search_au": (
+        "AFTER UPDATE OF full_name, company_name, email ON clients BEGIN "
+        "INSERT INTO clients_search(clients_search, rowid, full_name, company_name, email) "
+        "VALUES ('delete', old.id, old.full_name, old.company_name, old.email); "
+        "INSERT INTO clients_search(rowid, full_name, company_name, email) "
+        "VALUES (new.id, new.full_name, new.company_name, new.email); END"
+    ),
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_clients_search_trgm ON clients "
+                f"USING gin ({SEARCH_EXPRESSION} gin_trgm_ops)"
+            )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE clients_search USING fts5("
+            "full_name, company_name, email, "
+            "content='clients', content_rowid='id', tokenize='trigram')"
+        )
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER {name} {body}")
+        # Construit l'index à partir des clients déjà présents
+        op.execute("INSERT INTO clients_search(clients_search) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_clients_search_trgm")
+    elif dialect == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS clients_search")
@@ -0,0 +1,32 @@
+"""Add users.token_version
+
+Revision ID: c41d7e9b5a28
+Revises: 8b2e4f6a1c93
+Create Date: 2026-10-18 17:03:22.946150
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d7e9b5a28"
+down_revision: Union[str, None] = "8b2e4f6a1c93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Version embarquée dans les JWT, incrémentée quand le rôle ou le mot de passe change
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
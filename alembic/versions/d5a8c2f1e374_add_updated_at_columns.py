@@ -0,0 +1,69 @@
+"""Add updated_at columns
+
+Revision ID: d5a8c2f1e374
+Revises: c41d7e9b5a28
+Create Date: 2026-10-18 18:12:40.517308
+
+Adds an indexed `updated_at` timestamp to users, clients, contracts and
+events, used by the `--since` filter of the list commands. Existing rows
+get the migration time as their first value.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a8c2f1e374"
+down_revision: Union[str, None] = "c41d7e9b5a28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("users", "clients", "contracts", "events")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table in TABLES:
+        if bind.dialect.name == "sqlite":
+            # SQLite refuse un défaut non constant dans ADD COLUMN : ajout nullable,
+            # remplissage, puis reconstruction de la table avec le défaut et NOT NULL
+            op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True))
+            op.execute(f"UPDATE {table} SET updated_at = CURRENT_TIMESTAMP")
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(
+                    "updated_at",
+                    existing_type=sa.DateTime(),
+                    nullable=False,
+                    server_default=sa.func.now(),
+                )
+        else:
+            # now() est stable : PostgreSQL enregistre la valeur sans réécrire la table
+            op.add_column(
+                table,
+                sa.Column(
+                    "updated_at",
+                    sa.DateTime(),
+                    nullable=False,
+                    server_default=sa.func.now(),
+                ),
+            )
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                op.f(f"ix_{table}_updated_at"),
+                table,
+                ["updated_at"],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(op.f(f"ix_{table}_updated_at"), table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("updated_at")
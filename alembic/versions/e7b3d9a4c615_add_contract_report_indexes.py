@@ -0,0 +1,60 @@
+"""Add covering indexes for the contract reports
+
+Revision ID: e7b3d9a4c615
+Revises: d5a8c2f1e374
+Create Date: 2026-10-18 19:02:11.384529
+
+The `report` commands aggregate every contract. These indexes hold all
+the columns they read, so the aggregates come from an index-only scan in
+GROUP BY order instead of one table lookup per contract. The partial
+unpaid index is replaced by a covering one under a new name, created
+before the old one is dropped so `contract list --unpaid` keeps an index.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b3d9a4c615"
+down_revision: Union[str, None] = "d5a8c2f1e374"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contracts_commercial_totals",
+            "contracts",
+            ["commercial_id", "signed", "total_amount", "amount_remaining"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_contracts_unpaid_balance",
+            "contracts",
+            ["client_id", "amount_remaining"],
+            postgresql_where=sa.text("amount_remaining > 0"),
+            sqlite_where=sa.text("amount_remaining > 0"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_contracts_unpaid_client_id",
+            table_name="contracts",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_contracts_unpaid_client_id",
+        "contracts",
+        ["client_id"],
+        postgresql_where=sa.text("amount_remaining > 0"),
+        sqlite_where=sa.text("amount_remaining > 0"),
+    )
+    op.drop_index("ix_contracts_unpaid_balance", table_name="contracts")
+    op.drop_index("ix_contracts_commercial_totals", table_name="contracts")
@@ -0,0 +1,44 @@
+"""Add the support schedule index on events
+
+Revision ID: f2c6e8b1d947
+Revises: e7b3d9a4c615
+Create Date: 2026-10-18 19:41:53.702216
+
+Replaces ix_events_support_user_id by a composite index on
+(support_user_id, start_date, end_date). It still serves the filter by
+support user and lets `event conflicts` read each schedule already sorted
+by start date, without touching the table.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6e8b1d947"
+down_revision: Union[str, None] = "e7b3d9a4c615"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Le nouvel index existe avant la suppression de l'ancien
+        op.create_index(
+            "ix_events_support_user_schedule",
+            "events",
+            ["support_user_id", "start_date", "end_date"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_events_support_user_id"),
+            table_name="events",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_events_support_user_id"), "events", ["support_user_id"])
+    op.drop_index("ix_events_support_user_schedule", table_name="events")
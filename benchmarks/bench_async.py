@@ -0,0 +1,156 @@
+"""Compare the latency of a multi-query dashboard with the sync and asyncio DAOs.
+
+Usage:
+    python benchmarks/bench_async.py [--url URL] [--clients N] [--contracts N] [--events N] [--repeat N]
+
+Seeds a throwaway database (SQLite by default), then times one "dashboard"
+(a client, the unpaid contracts of a commercial, the events of a support user
+and the top receivables) three ways: the synchronous DAOs one after the other,
+the asyncio DAOs awaited one after the other, and the asyncio DAOs run
+concurrently with one session per query.
+
+Against SQLite the queries run on this machine's CPU, so the concurrent
+variant only pays off against a server database (--url postgresql://...),
+where each query mostly waits on the network and the server.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from dao.client_dao import ClientDAO
+from dao.contract_dao import ContractDAO
+from dao.event_dao import EventDAO
+from dao.report_dao import ReportDAO
+from dao.async_dao import (
+    AsyncClientDAO,
+    AsyncContractDAO,
+    AsyncEventDAO,
+    AsyncReportDAO,
+    gather_in_sessions,
+)
+from database import async_database_url, engine_options
+from services.seed_service import role_of, seed_database
+
+
+def dashboard_args(rng, users, clients):
+    """Pick the ids queried by one dashboard."""
+    sales_ids = [i for i in range(1, users + 1) if role_of(i) == "SALES"]
+    support_ids = [i for i in range(1, users + 1) if role_of(i) == "SUPPORT"]
+    return rng.randint(1, clients), rng.choice(sales_ids), rng.choice(support_ids)
+
+
+def run_sync(Session, client_id, commercial_id, support_id):
+    session = Session()
+    try:
+        ClientDAO(session).get_client_by_id(client_id)
+        ContractDAO(session).get_unpaid_contracts(commercial_id)
+        EventDAO(session).get_events_for_support(support_id)
+        ReportDAO(session).receivables_by_client(limit=10)
+    finally:
+        session.close()
+
+
+async def run_async_sequential(AsyncSession, client_id, commercial_id, support_id):
+    async with AsyncSession() as session:
+        await AsyncClientDAO(session).get_client_by_id(client_id)
+        await AsyncContractDAO(session).get_unpaid_contracts(commercial_id)
+        await AsyncEventDAO(session).get_events_for_support(support_id)
+        await AsyncReportDAO(session).receivables_by_client(limit=10)
+
+
+async def run_async_concurrent(AsyncSession, client_id, commercial_id, support_id):
+    await gather_in_sessions(
+        lambda s: AsyncClientDAO(s).get_client_by_id(client_id),
+        lambda s: AsyncContractDAO(s).get_unpaid_contracts(commercial_id),
+        lambda s: AsyncEventDAO(s).get_events_for_support(support_id),
+        lambda s: AsyncReportDAO(s).receivables_by_client(limit=10),
+        session_factory=AsyncSession,
+    )
+
+
+def time_calls(call, args_list):
+    """Return the median time in ms of `call(*args)` over the argument list."""
+    timings = []
+    for args in args_list:
+        started = time.perf_counter()
+        call(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url",
+        help="Database URL; its tables are dropped and recreated (default: temporary SQLite file)",
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=20000)
+    parser.add_argument("--contracts", type=int, default=60000)
+    parser.add_argument("--events", type=int, default=60000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+
+    engine = create_engine(url, **engine_options(url))
+    Session = sessionmaker(bind=engine)
+    async_url = async_database_url(url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, asyncio=True))
+    AsyncSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    loop = asyncio.new_event_loop()
+    try:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        print(f"Seeding {args.clients} clients, {args.contracts} contracts, {args.events} events...")
+        seed_database(engine, args.users, args.clients, args.contracts, args.events)
+
+        rng = random.Random(7)
+        args_list = [dashboard_args(rng, args.users, args.clients) for _ in range(args.repeat)]
+        # Un premier tour ouvre les connexions des deux pools
+        run_sync(Session, *args_list[0])
+        loop.run_until_complete(run_async_concurrent(AsyncSession, *args_list[0]))
+
+        results = {
+            "sync, sequential": time_calls(lambda *a: run_sync(Session, *a), args_list),
+            "async, sequential": time_calls(
+                lambda *a: loop.run_until_complete(run_async_sequential(AsyncSession, *a)),
+                args_list,
+            ),
+            "async, concurrent": time_calls(
+                lambda *a: loop.run_until_complete(run_async_concurrent(AsyncSession, *a)),
+                args_list,
+            ),
+        }
+        baseline = results["sync, sequential"]
+        print(f"{'dashboard (4 queries)':<24}{'median (ms)':>14}{'vs sync':>10}")
+        for name, median in results.items():
+            print(f"{name:<24}{median:>14.2f}{baseline / median:>9.2f}x")
+    finally:
+        loop.run_until_complete(async_engine.dispose())
+        loop.close()
+        engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compare DAO filter queries with and without the performance indexes.
+
+Usage:
+    python benchmarks/bench_indexes.py [--url URL] [--clients N] [--contracts N] [--events N]
+
+Seeds a throwaway database (SQLite by default), times `get_unsigned_contracts`,
+`get_unpaid_contracts` and `get_events_for_support` without the secondary
+indexes, then creates them and times the same calls again.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from dao.contract_dao import ContractDAO
+from dao.event_dao import EventDAO
+from services.seed_service import role_of, seed_database
+
+INDEXED_TABLES = ("clients", "contracts", "events")
+
+
+def secondary_indexes():
+    """Return the model indexes of the benchmarked tables."""
+    return [
+        index
+        for name in INDEXED_TABLES
+        for index in Base.metadata.tables[name].indexes
+    ]
+
+
+def time_queries(Session, users, repeat):
+    """Return the median time in ms of each DAO call over `repeat` runs."""
+    rng = random.Random(7)
+    calls = {
+        "get_unsigned_contracts": (lambda s, uid: ContractDAO(s).get_unsigned_contracts(uid), "SALES"),
+        "get_unpaid_contracts": (lambda s, uid: ContractDAO(s).get_unpaid_contracts(uid), "SALES"),
+        "get_events_for_support": (lambda s, uid: EventDAO(s).get_events_for_support(uid), "SUPPORT"),
+    }
+    results = {}
+    for name, (call, role) in calls.items():
+        user_ids = [user_id for user_id in range(1, users + 1) if role_of(user_id) == role]
+        timings = []
+        for _ in range(repeat):
+            session = Session()
+            try:
+                started = time.perf_counter()
+                call(session, rng.choice(user_ids))
+                timings.append((time.perf_counter() - started) * 1000)
+            finally:
+                session.close()
+        results[name] = statistics.median(timings)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url",
+        help="Database URL; its tables are dropped and recreated (default: temporary SQLite file)",
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=100000)
+    parser.add_argument("--contracts", type=int, default=300000)
+    parser.add_argument("--events", type=int, default=300000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine)
+    try:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        print(f"Seeding {args.clients} clients, {args.contracts} contracts, {args.events} events...")
+        seed_database(engine, args.users, args.clients, args.contracts, args.events)
+        indexes = secondary_indexes()
+        with engine.begin() as conn:
+            for index in indexes:
+                index.drop(conn)
+
+        before = time_queries(Session, args.users, args.repeat)
+        with engine.begin() as conn:
+            for index in indexes:
+                index.create(conn)
+            conn.exec_driver_sql("ANALYZE")
+        after = time_queries(Session, args.users, args.repeat)
+
+        print(f"{'query':<26}{'before (ms)':>14}{'after (ms)':>14}{'speed-up':>10}")
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else float("inf")
+            print(f"{name:<26}{before[name]:>14.2f}{after[name]:>14.2f}{speedup:>9.1f}x")
+    finally:
+        if args.url is None:
+            engine.dispose()
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
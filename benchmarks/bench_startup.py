@@ -0,0 +1,108 @@
+"""Check the cold-start time of `cli.py --help` and `cli.py login` against budgets.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--help-budget MS] [--login-budget MS]
+
+Each command runs in a fresh interpreter against a throwaway SQLite database
+holding a single user. The median wall time of each command is compared with
+its budget and the script exits with status 1 when a budget is exceeded.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.user import User
+from utils.security import hash_password
+
+CLI = os.path.join(project_root, "cli.py")
+EMAIL = "bench@bench.local"
+PASSWORD = "bench-password"
+
+
+def create_database(path):
+    """Create the schema and the user used by the login benchmark."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        User(
+            employee_number=1,
+            name="Bench",
+            email=EMAIL,
+            password_hash=hash_password(PASSWORD),
+            role="MANAGEMENT",
+        )
+    )
+    session.commit()
+    session.close()
+    engine.dispose()
+
+
+def time_command(args, env, cwd, runs):
+    """Return the median wall time in ms of `python cli.py ARGS`."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, CLI, *args],
+            env=env,
+            cwd=cwd,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--help-budget", type=float, default=500.0, help="Budget of --help in ms")
+    parser.add_argument("--login-budget", type=float, default=2000.0, help="Budget of login in ms")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_database(os.path.join(tmpdir, "bench.db"))
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+            JWT_SECRET_KEY=os.environ.get("JWT_SECRET_KEY", "bench-secret"),
+        )
+        # Le token est écrit dans le répertoire courant : on l'isole dans tmpdir
+        results = {
+            "--help": (time_command(["--help"], env, tmpdir, args.runs), args.help_budget),
+            "login": (
+                time_command(
+                    ["login", "--email", EMAIL, "--password", PASSWORD],
+                    env,
+                    tmpdir,
+                    args.runs,
+                ),
+                args.login_budget,
+            ),
+        }
+
+    failed = False
+    print(f"{'command':<10}{'median (ms)':>14}{'budget (ms)':>14}")
+    for command, (median, budget) in results.items():
+        status = "ok" if median <= budget else "OVER BUDGET"
+        failed = failed or median > budget
+        print(f"{command:<10}{median:>14.1f}{budget:>14.1f}  {status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
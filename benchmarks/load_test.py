@@ -0,0 +1,196 @@
+"""Load-test the HTTP API and report requests/s and latency percentiles.
+
+Usage:
+    python benchmarks/load_test.py [--concurrency N] [--duration S] [--path PATH ...]
+    python benchmarks/load_test.py --url http://host:port --email EMAIL --password PASSWORD
+
+Without --url, seeds a throwaway SQLite database, starts `cli.py serve` on a
+free port and tests it. Each worker thread keeps one HTTP/1.1 connection open
+and sends requests back to back, cycling over the given paths.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+CLI = os.path.join(project_root, "cli.py")
+EMAIL = "user1@seed.local"
+PASSWORD = "load-password"
+DEFAULT_PATHS = ["/clients?page_size=50", "/events?page_size=50", "/contracts?page_size=50"]
+
+
+def create_database(path, users, clients, contracts, events):
+    """Create and seed the database; user 1 is the MANAGEMENT user the load test logs in as."""
+    from sqlalchemy import create_engine
+    from models.base import Base
+    from services.seed_service import seed_database
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    seed_database(engine, users, clients, contracts, events, password=PASSWORD)
+    engine.dispose()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(conn, method, path, body=None, headers=None):
+    """Send one request on a keep-alive connection; return (status, decoded body)."""
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def wait_until_up(host, port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            if request(conn, "GET", "/health")[0] == 200:
+                conn.close()
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on {host}:{port} did not start")
+
+
+def login(host, port, email, password):
+    conn = http.client.HTTPConnection(host, port)
+    status, body = request(
+        conn,
+        "POST",
+        "/login",
+        json.dumps({"email": email, "password": password}),
+        {"Content-Type": "application/json"},
+    )
+    conn.close()
+    if status != 200:
+        raise RuntimeError(f"Login failed ({status}): {body.decode()}")
+    return json.loads(body)["token"]
+
+
+def worker(host, port, token, paths, deadline, latencies, errors):
+    """Send requests until the deadline, recording each latency in ms."""
+    conn = http.client.HTTPConnection(host, port)
+    headers = {"Authorization": f"Bearer {token}"}
+    i = 0
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            status, _ = request(conn, "GET", paths[i % len(paths)], headers=headers)
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port)
+            status = None
+        latencies.append((time.perf_counter() - started) * 1000)
+        if status != 200:
+            errors.append(status)
+        i += 1
+    conn.close()
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(host, port, token, paths, concurrency, duration):
+    """Run the load test; return the stats of the measured requests."""
+    deadline = time.monotonic() + duration
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=worker, args=(host, port, token, paths, deadline, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p90": percentile(latencies, 0.90),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running server (default: start a local one)")
+    parser.add_argument("--email", default=EMAIL)
+    parser.add_argument("--password", default=PASSWORD)
+    parser.add_argument("--path", action="append", dest="paths", help="Path to request (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--contracts", type=int, default=30000)
+    parser.add_argument("--events", type=int, default=30000)
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    tmpdir, process = None, None
+    try:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            tmpdir = tempfile.TemporaryDirectory()
+            db_path = os.path.join(tmpdir.name, "load.db")
+            print(f"Seeding {args.clients} clients, {args.contracts} contracts, {args.events} events...")
+            create_database(db_path, args.users, args.clients, args.contracts, args.events)
+            host, port = "127.0.0.1", free_port()
+            env = dict(
+                os.environ,
+                DATABASE_URL=f"sqlite:///{db_path}",
+                JWT_SECRET_KEY=os.environ.get("JWT_SECRET_KEY", "bench-secret"),
+                SENTRY_ENABLED="false",
+            )
+            process = subprocess.Popen(
+                [sys.executable, CLI, "serve", "--host", host, "--port", str(port)],
+                env=env,
+                cwd=tmpdir.name,
+                stdout=subprocess.DEVNULL,
+            )
+        wait_until_up(host, port)
+        token = login(host, port, args.email, args.password)
+
+        print(f"{args.concurrency} connections for {args.duration:.0f} s on {', '.join(paths)}")
+        stats = run(host, port, token, paths, args.concurrency, args.duration)
+        print(f"requests   {stats['requests']:>10}  (errors: {stats['errors']})")
+        print(f"requests/s {stats['rps']:>10.1f}")
+        for name in ("p50", "p90", "p99", "max"):
+            print(f"{name:<10} {stats[name]:>10.2f} ms")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
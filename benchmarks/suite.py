@@ -0,0 +1,511 @@
+"""Time every public DAO method and the main CLI commands on a large seeded database.
+
+Usage:
+    python benchmarks/suite.py [--url URL] [--no-seed] [--users N] [--clients N] [--contracts N]
+                               [--events N] [--repeat N] [--cli-repeat N] [--only PATTERN]
+                               [--output FILE] [--baseline FILE] [--threshold FRACTION]
+    python benchmarks/suite.py --clients 1000000 --contracts 3000000 --events 5000000
+
+Seeds a database (a temporary SQLite file by default, or --url, for example a
+local PostgreSQL whose tables are dropped and recreated) with the rows of
+`cli.py seed` (services/seed_service.py), then times each public method of the DAOs in a fresh session and
+each main CLI command in a fresh interpreter; the writes of the DAO methods are
+rolled back, so every measurement sees the seeded rows. With --no-seed, an already seeded
+--url is reused as is. The timings are written as JSON (--output); with
+--baseline, a measurement slower than the baseline by more than --threshold
+(and by more than --min-delta ms) is a regression and the script exits with
+status 1. A public DAO method without a benchmark case also fails the run.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import sqlalchemy
+from sqlalchemy import create_engine, event, func, insert
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.user import User
+from models.client import Client
+from models.contract import Contract
+from models.event import Event
+from dao.client_dao import ClientDAO
+from dao.contract_dao import ContractDAO
+from dao.event_dao import EventDAO
+from dao.report_dao import ReportDAO
+from dao.user_dao import UserDAO
+from dao.pagination import DEFAULT_PAGE_SIZE
+from services.import_service import default_hash_workers
+from services.seed_service import DEFAULT_PASSWORD, seed_database, seed_user_email
+
+CLI = os.path.join(project_root, "cli.py")
+DAO_CLASSES = (ClientDAO, ContractDAO, EventDAO, UserDAO, ReportDAO)
+ROLES = ("MANAGEMENT", "SALES", "SUPPORT")
+
+# writes : le cas modifie la base, chaque exécution est annulée (voir time_case)
+Case = namedtuple("Case", "name call setup writes", defaults=(None, False))
+
+
+class Context:
+    """Ids, dates and unique values the benchmark cases draw from."""
+
+    def __init__(self, Session, seed_value=7):
+        session = Session()
+        try:
+            by_role = {
+                role: [user_id for (user_id,) in session.query(User.id).filter(User.role == role).order_by(User.id)]
+                for role in ROLES
+            }
+            self.management_ids = by_role["MANAGEMENT"]
+            self.sales_ids = by_role["SALES"]
+            self.support_ids = by_role["SUPPORT"]
+            self.max_ids = {
+                model: session.query(func.max(model.id)).scalar() or 0
+                for model in (User, Client, Contract, Event)
+            }
+            self.next_number = (session.query(func.max(User.employee_number)).scalar() or 0) + 1
+            self.first_day, self.last_day = session.query(
+                func.min(Event.start_date), func.max(Event.start_date)
+            ).one()
+            self.search_text = session.query(Client.full_name).filter(Client.id == 1).scalar() or "Martin"
+        finally:
+            session.close()
+        if not (self.management_ids and self.sales_ids and self.support_ids and self.max_ids[Event]):
+            raise SystemExit("The database needs users of every role and events; seed it first")
+        self.rng = random.Random(seed_value)
+        # Suffixe des valeurs uniques : plusieurs exécutions sur la même base ne se heurtent pas
+        self.tag = f"{int(time.time())}{os.getpid()}"
+        self.counter = itertools.count()
+
+    def unique(self):
+        return f"{self.tag}-{next(self.counter)}"
+
+    def employee_number(self):
+        self.next_number += 1
+        return self.next_number
+
+    def existing_id(self, session, model):
+        """Return the id of a random existing row (ids freed by deletions are skipped)."""
+        while True:
+            row_id = self.rng.randint(1, self.max_ids[model])
+            if session.get(model, row_id) is not None:
+                return row_id
+
+    def window(self, days=30):
+        """Return a random (date_from, date_to) window of `days` days."""
+        span = max((self.last_day - self.first_day).days - days, 0)
+        start = self.first_day + timedelta(days=self.rng.randint(0, span))
+        return start, start + timedelta(days=days)
+
+    def insert(self, session, model, **values):
+        """Insert a row the timed call works on (an update or a deletion) and return its id."""
+        row_id = session.execute(insert(model).returning(model.id), [values]).scalar_one()
+        session.commit()
+        return row_id
+
+    def new_client(self, session):
+        email = f"bench-{self.unique()}@bench.local"
+        return self.insert(session, Client, full_name="Bench client", email=email,
+                           commercial_contact=self.rng.choice(self.sales_ids))
+
+    def new_contract(self, session):
+        return self.insert(session, Contract, client_id=self.existing_id(session, Client),
+                           total_amount=1000.0, amount_remaining=1000.0, signed=False)
+
+    def new_event(self, session, support_user_id=None):
+        start = self.window()[0]
+        return self.insert(session, Event, contract_id=self.existing_id(session, Contract),
+                           start_date=start, end_date=start + timedelta(days=1),
+                           support_user_id=support_user_id, attendees=10)
+
+    def new_user(self, session):
+        return self.insert(session, User, employee_number=self.employee_number(), name="Bench user",
+                           email=f"bench-{self.unique()}@bench.local", password_hash="x", role="SUPPORT")
+
+
+def dao_cases(ctx):
+    """Return the benchmark cases; each public DAO method has at least one.
+
+    `setup(session)` runs untimed in its own session and returns the argument
+    of `call(session, arg)`, which is timed in a fresh session.
+    """
+    rng = ctx.rng
+    page = {"page_size": DEFAULT_PAGE_SIZE}
+
+    def deep_page(model):
+        return lambda s: ctx.rng.randint(1, ctx.max_ids[model])
+
+    return [
+        # ClientDAO
+        Case("ClientDAO.add_client", lambda s, email: ClientDAO(s).add_client(
+            Client(full_name="Bench client", email=email, commercial_contact=ctx.sales_ids[0])),
+            lambda s: f"bench-{ctx.unique()}@bench.local", writes=True),
+        Case("ClientDAO.add_client_from_params", lambda s, email: ClientDAO(s).add_client_from_params(
+            "Bench client", email, "0600000000", "Bench", ctx.sales_ids[0]),
+            lambda s: f"bench-{ctx.unique()}@bench.local", writes=True),
+        Case("ClientDAO.bulk_add_clients", lambda s, rows: ClientDAO(s).bulk_add_clients(rows),
+             lambda s: [{"full_name": "Bench client", "email": f"bench-{ctx.unique()}@bench.local",
+                         "commercial_contact": ctx.sales_ids[0]} for _ in range(1000)], writes=True),
+        Case("ClientDAO.get_client_by_id", lambda s, i: ClientDAO(s).get_client_by_id(i),
+             lambda s: ctx.existing_id(s, Client)),
+        Case("ClientDAO.get_all_clients", lambda s, after: ClientDAO(s).get_all_clients(
+            **page, after_id=after, with_related=True), deep_page(Client)),
+        Case("ClientDAO.search_clients", lambda s, text: ClientDAO(s).search_clients(text, with_related=True),
+             lambda s: ctx.search_text),
+        Case("ClientDAO.update_client", lambda s, i: ClientDAO(s).update_client(
+            i, "Bench client", f"bench-{ctx.unique()}@bench.local", "0600000000", "Bench"),
+            lambda s: ctx.existing_id(s, Client), writes=True),
+        Case("ClientDAO.delete_client", lambda s, i: ClientDAO(s).delete_client(i), ctx.new_client, writes=True),
+        # ContractDAO
+        Case("ContractDAO.add_contract", lambda s, client_id: ContractDAO(s).add_contract(
+            Contract(client_id=client_id, total_amount=1000.0, amount_remaining=1000.0, signed=False)),
+            lambda s: ctx.existing_id(s, Client), writes=True),
+        Case("ContractDAO.get_contract_by_id", lambda s, i: ContractDAO(s).get_contract_by_id(i),
+             lambda s: ctx.existing_id(s, Contract)),
+        Case("ContractDAO.get_all_contracts", lambda s, after: ContractDAO(s).get_all_contracts(
+            **page, after_id=after, with_related=True), deep_page(Contract)),
+        Case("ContractDAO.get_unsigned_contracts", lambda s, i: ContractDAO(s).get_unsigned_contracts(
+            i, **page, with_related=True), lambda s: rng.choice(ctx.sales_ids)),
+        Case("ContractDAO.get_unpaid_contracts", lambda s, i: ContractDAO(s).get_unpaid_contracts(
+            i, **page, with_related=True), lambda s: rng.choice(ctx.sales_ids)),
+        Case("ContractDAO.update_contract", lambda s, i: ContractDAO(s).update_contract(i, 1000.0, 500.0, True),
+             lambda s: ctx.existing_id(s, Contract), writes=True),
+        Case("ContractDAO.delete_contract", lambda s, i: ContractDAO(s).delete_contract(i), ctx.new_contract, writes=True),
+        # EventDAO
+        Case("EventDAO.add_event", lambda s, contract_id: EventDAO(s).add_event(
+            Event(contract_id=contract_id, start_date=date(2030, 1, 1), end_date=date(2030, 1, 2), attendees=10)),
+            lambda s: ctx.existing_id(s, Contract), writes=True),
+        Case("EventDAO.get_event_by_id", lambda s, i: EventDAO(s).get_event_by_id(i),
+             lambda s: ctx.existing_id(s, Event)),
+        Case("EventDAO.get_all_events", lambda s, after: EventDAO(s).get_all_events(
+            **page, after_id=after, with_related=True), deep_page(Event)),
+        Case("EventDAO.get_events_for_support", lambda s, i: EventDAO(s).get_events_for_support(
+            i, **page, with_related=True), lambda s: rng.choice(ctx.support_ids)),
+        Case("EventDAO.update_event", lambda s, i: EventDAO(s).update_event(
+            i, date(2030, 1, 1), date(2030, 1, 2), None, "Paris", 10, "bench"),
+            lambda s: ctx.existing_id(s, Event), writes=True),
+        Case("EventDAO.delete_event", lambda s, i: EventDAO(s).delete_event(i), ctx.new_event, writes=True),
+        # Planning d'un support (commande `event conflicts` d'un SUPPORT) puis d'un mois entier
+        Case("EventDAO.find_conflicts[support]", lambda s, i: EventDAO(s).find_conflicts(i),
+             lambda s: rng.choice(ctx.support_ids)),
+        Case("EventDAO.find_conflicts[month]", lambda s, w: EventDAO(s).find_conflicts(None, *w),
+             lambda s: ctx.window()),
+        Case("EventDAO.get_conflicting_events", lambda s, args: EventDAO(s).get_conflicting_events(*args),
+             lambda s: (rng.choice(ctx.support_ids), *ctx.window(2))),
+        Case("EventDAO.get_unassigned_events", lambda s, w: EventDAO(s).get_unassigned_events(*w),
+             lambda s: ctx.window()),
+        Case("EventDAO.get_support_schedules", lambda s, w: EventDAO(s).get_support_schedules(ctx.support_ids, *w),
+             lambda s: ctx.window()),
+        Case("EventDAO.assign_supports", lambda s, assignments: EventDAO(s).assign_supports(assignments),
+             lambda s: {ctx.new_event(s): rng.choice(ctx.support_ids) for _ in range(20)}, writes=True),
+        # UserDAO ; Argon2 domine create_user, authenticate_user et update_user(password)
+        Case("UserDAO.create_user", lambda s, args: UserDAO(s).create_user(*args),
+             lambda s: (ctx.employee_number(), "Bench user", f"bench-{ctx.unique()}@bench.local",
+                        DEFAULT_PASSWORD, "SUPPORT"), writes=True),
+        # Hachage remplacé par une valeur fixe : seule la partie base de données est mesurée
+        Case("UserDAO.bulk_create_users", lambda s, rows: UserDAO(s).bulk_create_users(
+            rows, hash_passwords=lambda passwords: ["x"] * len(passwords)),
+            lambda s: [{"employee_number": ctx.employee_number(), "name": "Bench user",
+                        "email": f"bench-{ctx.unique()}@bench.local", "password": "x",
+                        "role": "SUPPORT"} for _ in range(100)], writes=True),
+        Case("UserDAO.get_user_by_email", lambda s, email: UserDAO(s).get_user_by_email(email),
+             lambda s: s.get(User, ctx.existing_id(s, User)).email),
+        Case("UserDAO.get_user_by_id", lambda s, i: UserDAO(s).get_user_by_id(i),
+             lambda s: ctx.existing_id(s, User)),
+        Case("UserDAO.get_users_by_role", lambda s, role: UserDAO(s).get_users_by_role(role),
+             lambda s: "SUPPORT"),
+        Case("UserDAO.get_token_version", lambda s, i: UserDAO(s).get_token_version(i),
+             lambda s: ctx.existing_id(s, User)),
+        Case("UserDAO.authenticate_user", lambda s, email: UserDAO(s).authenticate_user(email, DEFAULT_PASSWORD),
+             lambda s: seed_user_email(rng.choice(ctx.sales_ids))),
+        Case("UserDAO.update_user", lambda s, i: UserDAO(s).update_user(i, name="Bench user"),
+             ctx.new_user, writes=True),
+        Case("UserDAO.delete_user", lambda s, i: UserDAO(s).delete_user(i), ctx.new_user, writes=True),
+        Case("UserDAO.get_all_users", lambda s, after: UserDAO(s).get_all_users(**page, after_id=after),
+             deep_page(User)),
+        # ReportDAO
+        Case("ReportDAO.revenue_by_commercial", lambda s, _: ReportDAO(s).revenue_by_commercial()),
+        Case("ReportDAO.receivables_by_client", lambda s, _: ReportDAO(s).receivables_by_client(
+            limit=DEFAULT_PAGE_SIZE)),
+        Case("ReportDAO.signed_summary", lambda s, _: ReportDAO(s).signed_summary()),
+    ]
+
+
+def public_methods(dao_class):
+    """Return the names of the public methods defined by a DAO class."""
+    return [name for name, value in vars(dao_class).items() if callable(value) and not name.startswith("_")]
+
+
+def uncovered_methods(cases):
+    """Return the public DAO methods without a benchmark case."""
+    covered = {case.name.split("[")[0] for case in cases}
+    return [
+        f"{dao_class.__name__}.{name}"
+        for dao_class in DAO_CLASSES
+        for name in public_methods(dao_class)
+        if f"{dao_class.__name__}.{name}" not in covered
+    ]
+
+
+def summarize(timings):
+    """Return the statistics kept for one measurement (ms)."""
+    timings = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(timings[0], 3),
+        "max_ms": round(timings[-1], 3),
+        "runs": len(timings),
+    }
+
+
+def enable_savepoints(engine):
+    """Let pysqlite run SAVEPOINTs inside an explicit transaction (recipe of the SQLAlchemy docs)."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def no_implicit_begin(dbapi_connection, connection_record):
+        # Sinon pysqlite ouvre ses transactions lui-même et RELEASE valide le savepoint
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+def time_case(Session, case, repeat):
+    """Run a case once untimed (warm-up), then `repeat` timed runs in fresh sessions.
+
+    A write case runs, setup included, in a transaction rolled back after each
+    run: the DAO commits only release savepoints, so every run and every later
+    case see the seeded rows unchanged. The engine needs enable_savepoints().
+    """
+    timings = []
+    for run in range(repeat + 1):
+        outer = Session() if case.writes else None
+        options = {}
+        if outer is not None:
+            options = {"bind": outer.connection(), "join_transaction_mode": "create_savepoint"}
+        try:
+            session = Session(**options)
+            try:
+                arg = case.setup(session) if case.setup else None
+            finally:
+                session.close()
+            session = Session(**options)
+            try:
+                started = time.perf_counter()
+                result = case.call(session, arg)
+                if hasattr(result, "__next__"):
+                    list(result)  # Un résultat diffusé compte jusqu'à la dernière ligne
+                elapsed = (time.perf_counter() - started) * 1000
+            finally:
+                session.close()
+        finally:
+            if outer is not None:
+                outer.rollback()
+                outer.close()
+        if run:
+            timings.append(elapsed)
+    return summarize(timings)
+
+
+def cli_cases(ctx):
+    """Return (name, role, cli arguments) of the timed CLI commands."""
+    date_from, date_to = (day.isoformat() for day in ctx.window())
+    return [
+        ("--help", None, ["--help"]),
+        ("login", "MANAGEMENT", ["login", "--email", seed_user_email(ctx.management_ids[0]),
+                                 "--password", DEFAULT_PASSWORD]),
+        ("client list", "MANAGEMENT", ["client", "list", "--format", "table"]),
+        ("client list --format ndjson (all rows)", "MANAGEMENT", ["client", "list", "--format", "ndjson"]),
+        ("client search", "MANAGEMENT", ["client", "search", ctx.search_text, "--format", "table"]),
+        ("contract list", "MANAGEMENT", ["contract", "list", "--format", "table"]),
+        ("contract list --unpaid", "SALES", ["contract", "list", "--unpaid", "--format", "table"]),
+        ("event list", "MANAGEMENT", ["event", "list", "--format", "table"]),
+        ("event list (support)", "SUPPORT", ["event", "list", "--format", "table"]),
+        ("event conflicts (support)", "SUPPORT", ["event", "conflicts", "--format", "table"]),
+        ("event assign --auto --dry-run", "MANAGEMENT",
+         ["event", "assign", "--auto", "--dry-run", "--from", date_from, "--to", date_to]),
+        ("collaborator list", "MANAGEMENT", ["collaborator", "list", "--format", "table"]),
+        ("report revenue", "MANAGEMENT", ["report", "revenue", "--format", "table"]),
+        ("report receivables", "MANAGEMENT", ["report", "receivables", "--format", "table"]),
+        ("report signed", "MANAGEMENT", ["report", "signed", "--format", "table"]),
+    ]
+
+
+def run_cli(args, env, cwd, stdout=subprocess.DEVNULL):
+    return subprocess.run([sys.executable, CLI, *args], env=env, cwd=cwd, stdout=stdout,
+                          stderr=subprocess.PIPE, text=True)
+
+
+def time_cli(name, args, env, cwd, repeat):
+    """Time `python cli.py ARGS`; the untimed first run checks the command succeeds."""
+    check = run_cli(args, env, cwd, stdout=subprocess.PIPE)
+    # Les commandes affichent leurs erreurs sans changer le code de retour
+    if check.returncode or "Error" in check.stdout[:2000]:
+        raise RuntimeError(f"`{name}` failed: {(check.stdout[:2000] + check.stderr).strip()}")
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_cli(args, env, cwd)
+        timings.append((time.perf_counter() - started) * 1000)
+    return summarize(timings)
+
+
+def log_in_roles(ctx, env, workdir):
+    """Log in one seeded user of each role; return {role: directory holding its token.json}."""
+    directories = {}
+    for role, ids in (("MANAGEMENT", ctx.management_ids), ("SALES", ctx.sales_ids), ("SUPPORT", ctx.support_ids)):
+        directories[role] = os.path.join(workdir, role.lower())
+        os.makedirs(directories[role], exist_ok=True)
+        result = run_cli(["login", "--email", seed_user_email(ids[0]), "--password", DEFAULT_PASSWORD],
+                         env, directories[role], stdout=subprocess.PIPE)
+        if not os.path.exists(os.path.join(directories[role], "token.json")):
+            raise RuntimeError(f"Login as {role} failed: {result.stdout.strip()}")
+    return directories
+
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Return (name, baseline ms, current ms) of the measurements that regressed."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        before, after = previous["median_ms"], current["median_ms"]
+        if after > before * (1 + threshold) and after - before > min_delta_ms:
+            regressions.append((name, before, after))
+    return regressions
+
+
+def print_results(results, baseline):
+    print(f"{'benchmark':<48}{'median (ms)':>13}{'baseline':>12}{'ratio':>8}")
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if previous:
+            ratio = stats["median_ms"] / previous["median_ms"] if previous["median_ms"] else float("inf")
+            print(f"{name:<48}{stats['median_ms']:>13.2f}{previous['median_ms']:>12.2f}{ratio:>7.2f}x")
+        else:
+            print(f"{name:<48}{stats['median_ms']:>13.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--no-seed", action="store_true", help="Reuse the rows already in --url")
+    parser.add_argument("--users", type=int, default=None, help="Default: one per 100 events, at least 30")
+    parser.add_argument("--clients", type=int, default=100000)
+    parser.add_argument("--contracts", type=int, default=300000)
+    parser.add_argument("--events", type=int, default=500000)
+    parser.add_argument("--workers", type=int, default=None, help="Processes generating the seed rows")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs of each DAO method")
+    parser.add_argument("--cli-repeat", type=int, default=5, help="Timed runs of each CLI command")
+    parser.add_argument("--only", help="Only run the benchmarks whose name matches this regex")
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON file written")
+    parser.add_argument("--baseline", help="Earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown over the baseline, as a fraction (default: 0.25)")
+    parser.add_argument("--min-delta", type=float, default=2.0,
+                        help="Slowdowns smaller than this many ms are noise, not regressions")
+    args = parser.parse_args()
+    if args.no_seed and not args.url:
+        parser.error("--no-seed needs --url")
+    users = args.users or max(30, args.events // 100)
+
+    tmpdir = tempfile.TemporaryDirectory()
+    url = args.url or f"sqlite:///{os.path.join(tmpdir.name, 'suite.db')}"
+    engine = create_engine(url)
+    enable_savepoints(engine)
+    Session = sessionmaker(bind=engine)
+    try:
+        if not args.no_seed:
+            Base.metadata.drop_all(engine)
+            Base.metadata.create_all(engine)
+            print(f"Seeding {users} users, {args.clients} clients, {args.contracts} contracts, "
+                  f"{args.events} events...")
+            started = time.perf_counter()
+            seed_database(engine, users, args.clients, args.contracts, args.events,
+                          workers=args.workers or default_hash_workers())
+            print(f"Seeded in {time.perf_counter() - started:.1f} s")
+        ctx = Context(Session)
+        cases = dao_cases(ctx)
+        missing = uncovered_methods(cases)
+        if missing:
+            raise SystemExit(f"Public DAO methods without a benchmark case: {', '.join(missing)}")
+        selected = re.compile(args.only) if args.only else None
+
+        results = {}
+        for case in cases:
+            name = f"dao.{case.name}"
+            if selected is None or selected.search(name):
+                results[name] = time_case(Session, case, args.repeat)
+                print(f"{name:<48}{results[name]['median_ms']:>13.2f} ms")
+        engine.dispose()
+
+        env = dict(os.environ, DATABASE_URL=url, SENTRY_ENABLED="false",
+                   JWT_SECRET_KEY=os.environ.get("JWT_SECRET_KEY", "bench-secret"))
+        directories = log_in_roles(ctx, env, tmpdir.name)
+        for label, role, cli_args in cli_cases(ctx):
+            name = f"cli.{label}"
+            if selected is None or selected.search(name):
+                cwd = directories[role] if role else tmpdir.name
+                results[name] = time_cli(name, cli_args, env, cwd, args.cli_repeat)
+                print(f"{name:<48}{results[name]['median_ms']:>13.2f} ms")
+
+        with engine.connect() as conn:
+            volumes = {
+                model.__tablename__: conn.execute(sqlalchemy.select(func.count()).select_from(model)).scalar()
+                for model in (User, Client, Contract, Event)
+            }
+        report = {
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "dialect": engine.dialect.name,
+                "volumes": volumes,
+                "repeat": args.repeat,
+                "cli_repeat": args.cli_repeat,
+                "python": platform.python_version(),
+                "sqlalchemy": sqlalchemy.__version__,
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+
+        baseline = {}
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as file:
+                baseline = json.load(file)["results"]
+        print()
+        print_results(results, baseline)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.2f} ms -> {after:.2f} ms")
+        if regressions:
+            sys.exit(1)
+    finally:
+        engine.dispose()
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,162 @@
+import time
+
+# Début du chargement de la CLI, référence du rapport `--timing`
+_started_at = time.perf_counter()
+
 import click
-from rich.console import Console
-from rich.table import Table
-from dao.client_dao import ClientDAO
-from dao.contract_dao import ContractDAO
-from dao.event_dao import EventDAO
-from dao.user_dao import UserDAO
-from database import Session
-from models.client import Client
-from models.contract import Contract
-from models.event import Event
+from dao.pagination import DEFAULT_PAGE_SIZE
 from utils.auth import auth_required
+from utils.console import console, err_console
+from utils.output import (
+    ASSIGNMENT_COLUMNS,
+    CLIENT_COLUMNS,
+    CONFLICT_COLUMNS,
+    CONTRACT_COLUMNS,
+    EVENT_COLUMNS,
+    OUTPUT_FORMATS,
+    POOL_STATS_COLUMNS,
+    RECEIVABLE_COLUMNS,
+    REVENUE_COLUMNS,
+    SIGNED_COLUMNS,
+    USER_COLUMNS,
+    client_row,
+    conflict_row,
+    contract_row,
+    default_format,
+    event_row,
+    render_rows,
+    user_row,
+)
+from utils.timing import StartupTimer
 import utils.validation
-from sentry import call_sentry
 import services.auth_service
-import datetime
-import os
-
-# Gérer les permissions avec des décorateurs et autorisations
-call_sentry()
+import services.import_service
+import services.seed_service
+import shlex
+import sys
 
-console = Console()
+# Les DAO, les modèles, SQLAlchemy et Sentry sont importés à la première
+# utilisation : `cli.py --help` ne paie que le chargement de click.
 
 
 def init_db():
     """Initialize a new session."""
+    from database import Session
+
     return Session()
 
 
+def pagination_options(f):
+    """Add the keyset pagination and --since options shared by every `list` command."""
+    f = click.option(
+        "--since",
+        type=click.DateTime(),
+        default=None,
+        help="Only show rows created or modified at or after this timestamp "
+        "(database time, e.g. 2026-10-18T08:00:00).",
+    )(f)
+    f = click.option(
+        "--after-id",
+        type=int,
+        default=None,
+        help="Only show rows whose ID is greater than this one (next page cursor).",
+    )(f)
+    f = click.option(
+        "--page-size",
+        type=click.IntRange(min=1),
+        default=None,
+        help=f"Maximum number of rows to display "
+        f"(default: {DEFAULT_PAGE_SIZE} for tables, unlimited for streamed formats).",
+    )(f)
+    return f
+
+
+def format_option(f):
+    """Add the --format option selecting the renderer of a `list` command."""
+    return click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(OUTPUT_FORMATS),
+        default=None,
+        help="Output format (default: table on a terminal, ndjson when piped).",
+    )(f)
+
+
+def resolve_list_output(output_format, page_size):
+    """Pick the defaults of a `list` command: tables are paged, streams are not."""
+    output_format = output_format or default_format(console)
+    if page_size is None and output_format == "table":
+        page_size = DEFAULT_PAGE_SIZE
+    return output_format, page_size
+
+
+def print_booking_conflicts(support_user_id, conflicts):
+    """Explain why an event overlapping other bookings of its support user was refused."""
+    ids = ", ".join(str(conflict.id) for conflict in conflicts)
+    console.print(
+        f"[bold red]Conflict: support user {support_user_id} is already booked "
+        f"on event(s) {ids} for these dates.[/bold red]"
+    )
+
+
+def print_next_page_hint(count, last_row, page_size):
+    """Tell the user how to fetch the next page when the current one is full."""
+    if page_size and count == page_size:
+        # Sur stderr, pour ne pas polluer une sortie redirigée vers un autre outil
+        err_console.print(f"[dim]More results: use --after-id {last_row['id']}[/dim]")
+
+
 @click.group()
-def cli():
+@click.option(
+    "--timing", is_flag=True, help="Print how long startup and the command took."
+)
+@click.option(
+    "--trace-sql", is_flag=True, help="Print the query count, timings and N+1 suspects of the command."
+)
+@click.option(
+    "--trace-sql-json",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the SQL trace of the command to this JSON file.",
+)
+@click.pass_context
+def cli(ctx, timing, trace_sql, trace_sql_json):
     """CLI for CRM Application."""
-    pass
+    global _started_at
+    # Dans le mode `shell`, seule la première commande compte le chargement des modules
+    timer = StartupTimer(_started_at)
+    _started_at = None
+    timer.mark("imports")
+
+    from sentry import call_sentry
+
+    call_sentry()
+    timer.mark("sentry init")
+
+    if timing:
+
+        def report():
+            timer.mark("command")
+            timer.report(err_console)
+
+        ctx.call_on_close(report)
+
+    if trace_sql or trace_sql_json:
+        from database import get_engine
+        from utils.sql_trace import SQLTrace
+
+        # Ligne de commande tracée : celle du processus, ou celle tapée dans `shell`
+        command = " ".join((ctx.obj or {}).get("args", sys.argv[1:]))
+        trace = SQLTrace().attach(get_engine())
+
+        def report_sql():
+            trace.detach()
+            if trace_sql:
+                trace.report(err_console)
+            if trace_sql_json:
+                trace.write_json(trace_sql_json, command)
+
+        ctx.call_on_close(report_sql)
 
 
 # CLIENT COMMANDS
@@ -54,6 +180,39 @@ def login(email, password):
         console.print(f"[bold red]Error during login: {e}[/bold red]")
 
 
+@cli.command("calibrate")
+@click.option(
+    "--target-ms",
+    type=click.FloatRange(min=1),
+    default=250.0,
+    show_default=True,
+    help="Target password verification time in milliseconds.",
+)
+@click.option("--memory-cost", type=click.IntRange(min=8), default=None, help="Starting memory cost in KiB.")
+@click.option("--parallelism", type=click.IntRange(min=1), default=None, help="Argon2 lanes.")
+def calibrate(target_ms, memory_cost, parallelism):
+    """Find Argon2 parameters hitting a target verify time on this host."""
+    from utils.security import calibrate as calibrate_argon2
+
+    options = {}
+    if memory_cost is not None:
+        options["memory_cost"] = memory_cost
+    if parallelism is not None:
+        options["parallelism"] = parallelism
+    try:
+        result = calibrate_argon2(target_ms, **options)
+        console.print(
+            f"[bold green]Verify time: {result['verify_ms']:.1f} ms "
+            f"(target {target_ms:.0f} ms).[/bold green]"
+        )
+        console.print("Add these lines to your .env file:")
+        console.print(f"ARGON2_TIME_COST={result['time_cost']}", highlight=False)
+        console.print(f"ARGON2_MEMORY_COST={result['memory_cost']}", highlight=False)
+        console.print(f"ARGON2_PARALLELISM={result['parallelism']}", highlight=False)
+    except Exception as e:
+        console.print(f"[bold red]Error during calibration: {e}[/bold red]")
+
+
 @client.command("update")
 @auth_required(["SALES"])
 @click.option("--client_id", prompt="client_id")
@@ -63,21 +222,20 @@ def login(email, password):
 @click.option("--company", help="New client company.", prompt="company")
 def update_client(user_id, client_id, name, email, phone, company):
     """Update a client (Only for SALES on their own clients)."""
+    from dao.client_dao import ClientDAO
+
     session = init_db()
     try:
         client_dao = ClientDAO(session)
-        client = client_dao.get_client_by_id(client_id)
-
-        if client.commercial_contact != user_id:
-            console.print(
-                "[bold red]Unauthorized: You can only modify your own clients.[/bold red]"
-            )
-            return
-
-        client_dao.update_client(client_id, name, email, phone, company)
+        # Le contrôle du propriétaire se fait dans la requête de mise à jour
+        client_dao.update_client(client_id, name, email, phone, company, commercial_id=user_id)
         console.print(
             f"[bold green]Client {client_id} updated successfully![/bold green]"
         )
+    except PermissionError:
+        console.print(
+            "[bold red]Unauthorized: You can only modify your own clients.[/bold red]"
+        )
     except Exception as e:
         console.print(f"[bold red]Error updating client: {e}[/bold red]")
     finally:
@@ -86,53 +244,73 @@ def update_client(user_id, client_id, name, email, phone, company):
 
 @client.command("list")
 @auth_required(read_only=True)
-def list_clients(user_id):
+@pagination_options
+@format_option
+def list_clients(user_id, page_size, after_id, since, output_format):
     """List all clients."""
+    from dao.client_dao import ClientDAO
+
     session = init_db()
     try:
+        output_format, page_size = resolve_list_output(output_format, page_size)
         client_dao = ClientDAO(session)
-        clients = client_dao.get_all_clients()
-        table = Table(title="Clients")
-        table.add_column("ID", style="cyan")
-        table.add_column("Name", style="magenta")
-        table.add_column("Email", style="green")
-        table.add_column("Phone", style="yellow")
-        table.add_column("Company", style="blue")
-        table.add_column("Commercial ID", style="red")  # Ajout de cette colonne
-        table.add_column("Creation Date", style="white")
-        table.add_column("Last Contact Date", style="white")
-
-        for client in clients:
-            table.add_row(
-                str(client.id),
-                client.full_name,
-                client.email,
-                client.phone,
-                client.company_name or "N/A",
-                (
-                    str(client.commercial_contact)
-                    if client.commercial_contact
-                    else "N/A"
-                ),  # Ajout ici
-                (
-                    client.creation_date.strftime("%Y-%m-%d")
-                    if client.creation_date
-                    else "N/A"
-                ),
-                (
-                    client.last_contact_date.strftime("%Y-%m-%d")
-                    if client.last_contact_date
-                    else "N/A"
-                ),
-            )
-
-        console.print(table)
+        clients = client_dao.get_all_clients(
+            page_size=page_size,
+            after_id=after_id,
+            stream=output_format != "table",
+            since=since,
+            with_related=True,
+        )
+        count, last = render_rows(
+            console,
+            "Clients",
+            CLIENT_COLUMNS,
+            (client_row(client) for client in clients),
+            output_format,
+        )
+        print_next_page_hint(count, last, page_size)
     except Exception as e:
         console.print(f"[bold red]Error listing clients: {e}[/bold red]")
     finally:
         session.close()
 
 
+@client.command("search")
+@auth_required(read_only=True)
+@click.argument("text")
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Maximum number of clients returned, best matches first.",
+)
+@format_option
+def search_clients(user_id, text, limit, output_format):
+    """Search clients by name, company or email (typos tolerated)."""
+    from dao.client_dao import MIN_SEARCH_LENGTH, ClientDAO
+
+    if len(text.strip()) < MIN_SEARCH_LENGTH:
+        console.print(
+            f"[bold red]Error: Search text must be at least {MIN_SEARCH_LENGTH} characters.[/bold red]"
+        )
+        return
+    session = init_db()
+    try:
+        clients = ClientDAO(session).search_clients(text, limit=limit, with_related=True)
+        render_rows(
+            console,
+            f"Clients matching '{text}'",
+            CLIENT_COLUMNS,
+            (client_row(client) for client in clients),
+            output_format or default_format(console),
+        )
+    except Exception as e:
+        console.print(f"[bold red]Error searching clients: {e}[/bold red]")
+    finally:
+        session.close()
+
+
 @client.command("add")
 @click.option("--name", prompt="Name", help="The name of the client.")
 @click.option("--email", prompt="Email", help="The email address of the client.")
@@ -141,6 +319,8 @@ def list_clients(user_id):
 @auth_required(["SALES"])  # Seuls les commerciaux peuvent créer un client
 def add_client(user_id, name, email, phone, company):
     """Add a new client."""
+    from dao.client_dao import ClientDAO
+
     if not utils.validation.validate_email(email):
         console.print("[bold red]Invalid email format![/bold red]")
         return
@@ -161,6 +341,43 @@ def add_client(user_id, name, email, phone, company):
         session.close()
 
 
+@client.command("import")
+@auth_required(["SALES"])  # Les clients importés sont attribués au commercial connecté
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=services.import_service.DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Number of clients inserted per round trip.",
+)
+@click.option(
+    "--rejects",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="JSONL file receiving rejected rows (default: FILE.rejects.jsonl).",
+)
+def import_clients(user_id, file, batch_size, rejects):
+    """Import clients in bulk from a CSV, TSV or JSONL file."""
+    session = init_db()
+    try:
+        report = services.import_service.import_clients(
+            session, file, user_id, batch_size=batch_size, rejects_path=rejects
+        )
+        console.print(
+            f"[bold green]{report['inserted']} client(s) imported.[/bold green]"
+        )
+        if report["rejected"]:
+            console.print(
+                f"[bold yellow]{report['rejected']} row(s) rejected, "
+                f"see {report['rejects_path']}[/bold yellow]"
+            )
+    except Exception as e:
+        console.print(f"[bold red]Error importing clients: {e}[/bold red]")
+    finally:
+        session.close()
+
+
 # CONTRACT COMMANDS
 @cli.group()
 def contract():
@@ -178,40 +395,43 @@ def contract():
 @click.option(
     "--unpaid", is_flag=True, help="Afficher uniquement les contrats non payés"
 )
-def list_contracts(user_id, unsigned, unpaid):
+@pagination_options
+@format_option
+def list_contracts(user_id, unsigned, unpaid, page_size, after_id, since, output_format):
     """List contracts with optional filters."""
+    from dao.contract_dao import ContractDAO
+
     session = init_db()
     try:
+        output_format, page_size = resolve_list_output(output_format, page_size)
         contract_dao = ContractDAO(session)
+        page = {
+            "page_size": page_size,
+            "after_id": after_id,
+            "stream": output_format != "table",
+            "since": since,
+            "with_related": True,  # Noms affichés sans une requête par ligne
+        }
 
         if unsigned:
             contracts = contract_dao.get_unsigned_contracts(
-                user_id
+                user_id, **page
             )  # Récupère les contrats non signés
         elif unpaid:
             contracts = contract_dao.get_unpaid_contracts(
-                user_id
+                user_id, **page
             )  # Récupère les contrats non payés
         else:
-            contracts = contract_dao.get_all_contracts()  # Récupère tous les contrats
-
-        table = Table(title="Contracts")
-        table.add_column("ID", style="cyan")
-        table.add_column("Client ID", style="magenta")
-        table.add_column("Total Amount", style="green")
-        table.add_column("Amount Remaining", style="red")
-        table.add_column("Signed", style="yellow")
-
-        for contract in contracts:
-            table.add_row(
-                str(contract.id),
-                str(contract.client_id),
-                f"${contract.total_amount}",
-                f"${contract.amount_remaining}",
-                "Yes" if contract.signed else "No",
-            )
-
-        console.print(table)
+            contracts = contract_dao.get_all_contracts(**page)  # Récupère tous les contrats
+
+        count, last = render_rows(
+            console,
+            "Contracts",
+            CONTRACT_COLUMNS,
+            (contract_row(contract) for contract in contracts),
+            output_format,
+        )
+        print_next_page_hint(count, last, page_size)
     except Exception as e:
         console.print(f"[bold red]Error listing contracts: {e}[/bold red]")
     finally:
@@ -226,23 +446,22 @@ def list_contracts(user_id, unsigned, unpaid):
 @click.option("--signed", type=bool, help="Mark contract as signed (yes/no).", prompt="signed")
 def update_contract(user_id, contract_id, total_amount, amount_remaining, signed):
     """Update a contract (Only for SALES on their own contracts)."""
+    from dao.contract_dao import ContractDAO
+
     session = init_db()
     try:
         contract_dao = ContractDAO(session)
-        contract = contract_dao.get_contract_by_id(contract_id)
-
-        if contract.commercial_id != user_id:
-            console.print(
-                "[bold red]Unauthorized: You can only modify your own contracts.[/bold red]"
-            )
-            return
-
+        # Le contrôle du propriétaire se fait dans la requête de mise à jour
         contract_dao.update_contract(
-            contract_id, total_amount, amount_remaining, signed
+            contract_id, total_amount, amount_remaining, signed, commercial_id=user_id
         )
         console.print(
             f"[bold green]Contract {contract_id} updated successfully![/bold green]"
         )
+    except PermissionError:
+        console.print(
+            "[bold red]Unauthorized: You can only modify your own contracts.[/bold red]"
+        )
     except Exception as e:
         console.print(f"[bold red]Error updating contract: {e}[/bold red]")
     finally:
@@ -274,11 +493,16 @@ def update_contract(user_id, contract_id, total_amount, amount_remaining, signed
 )
 def add_contract(user_id, client_id, total_amount, amount_remaining, signed):
     """Add a new contract for a client."""
+    from dao.contract_dao import ContractDAO
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+    from models.contract import Contract
+
     session = init_db()
     try:
         contract_dao = ContractDAO(session)
         user_dao = UserDAO(
-            session
+            session, cache=shared_user_cache()
         )  # ✅ Fix : Initialiser UserDAO avec une session active
 
         # Validation de l'entrée "signed"
@@ -329,10 +553,10 @@ def event():
     "--end_date", prompt="End Date (YYYY-MM-DD)", help="The end date of the event."
 )
 @click.option(
-    "--support_contact",
-    prompt="Support Contact",
-    help="The name of the support contact.",
-    default="",
+    "--support_user_id",
+    type=int,
+    default=None,
+    help="The ID of the SUPPORT collaborator assigned to the event.",
 )
 @click.option(
     "--location", prompt="Location", help="The location of the event.", default=""
@@ -344,11 +568,19 @@ def event():
     type=int,
     default=0,
 )
+@click.option(
+    "--check-conflicts",
+    is_flag=True,
+    help="Refuse the event if its support user is already booked on these dates.",
+)
 @auth_required(["SALES", "SUPPORT"])
 def add_event(
-    user_id, contract_id, start_date, end_date, support_contact, location, attendees
+    user_id, contract_id, start_date, end_date, support_user_id, location, attendees, check_conflicts
 ):
     """Add a new event."""
+    from dao.event_dao import EventDAO
+    from models.event import Event
+
     session = init_db()
     try:
         start_date = utils.validation.parse_date(start_date)
@@ -358,11 +590,16 @@ def add_event(
             return
 
         event_dao = EventDAO(session)
+        if check_conflicts and support_user_id is not None:
+            conflicts = event_dao.get_conflicting_events(support_user_id, start_date, end_date)
+            if conflicts:
+                print_booking_conflicts(support_user_id, conflicts)
+                return
         event = Event(
             contract_id=contract_id,
             start_date=start_date,
             end_date=end_date,
-            support_contact=support_contact,
+            support_user_id=support_user_id,
             location=location,
             attendees=attendees,
         )
@@ -378,8 +615,15 @@ def add_event(
 @event.command("update")
 @auth_required(["SUPPORT"])  # Seuls les supports peuvent modifier leurs événements
 @click.argument("event_id", type=int)
-def update_event(user_id, event_id):
+@click.option(
+    "--check-conflicts",
+    is_flag=True,
+    help="Refuse the new dates if they overlap another event of the support user.",
+)
+def update_event(user_id, event_id, check_conflicts):
     """Update an event (only for SUPPORT, only their assigned events)."""
+    from dao.event_dao import EventDAO
+
     session = init_db()
     try:
         event_dao = EventDAO(session)
@@ -388,7 +632,7 @@ def update_event(user_id, event_id):
         if not event:
             console.print("[bold red]Error: Event not found![/bold red]")
             return
-        if int(event.support_contact) != int(user_id):
+        if event.support_user_id != int(user_id):
             console.print("[bold red]Unauthorized: You can only modify your assigned events.[/bold red]")
             return
 
@@ -404,6 +648,17 @@ def update_event(user_id, event_id):
         event.location = new_location
         event.attendees = new_attendees
 
+        if check_conflicts:
+            # L'autoflush écrirait les nouvelles dates avant la vérification
+            with session.no_autoflush:
+                conflicts = event_dao.get_conflicting_events(
+                    event.support_user_id, event.start_date, event.end_date, exclude_event_id=event_id
+                )
+            if conflicts:
+                session.rollback()
+                print_booking_conflicts(event.support_user_id, conflicts)
+                return
+
         session.commit()
         console.print(f"[bold green]Event {event_id} updated successfully![/bold green]")
 
@@ -414,64 +669,142 @@ def update_event(user_id, event_id):
 
 @event.command("list")
 @auth_required(["MANAGEMENT", "SUPPORT"])  # Tous les rôles peuvent voir des événements
-def list_events(user_id):
+@pagination_options
+@format_option
+def list_events(user_id, page_size, after_id, since, output_format):
     """List events, filtering for support users."""
+    from dao.event_dao import EventDAO
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+
     session = init_db()
     try:
+        output_format, page_size = resolve_list_output(output_format, page_size)
         event_dao = EventDAO(session)
         user_dao = UserDAO(
-            session
+            session, cache=shared_user_cache()
         )  # ✅ Fix : Initialiser UserDAO avec une session active
 
         # Récupérer l'utilisateur pour vérifier son rôle
         user = user_dao.get_user_by_id(user_id)
 
+        page = {
+            "page_size": page_size,
+            "after_id": after_id,
+            "stream": output_format != "table",
+            "since": since,
+            "with_related": True,  # Noms affichés sans une requête par ligne
+        }
         if user.role == "SUPPORT":
-            events = event_dao.get_events_for_support(user_id)  # Filtre pour SUPPORT
+            events = event_dao.get_events_for_support(user_id, **page)  # Filtre pour SUPPORT
         else:
             events = (
-                event_dao.get_all_events()
+                event_dao.get_all_events(**page)
             )  # Tous les événements pour MANAGEMENT & SALES
 
-        table = Table(title="Events")
-        table.add_column("ID", style="cyan")
-        table.add_column("Contract ID", style="magenta")
-        table.add_column("Start Date", style="green")
-        table.add_column("End Date", style="red")
-        table.add_column("Support Contact", style="yellow")
-        table.add_column("Location", style="blue")
-        table.add_column("Attendees", style="white")
-
-        for event in events:
-            table.add_row(
-                str(event.id),
-                str(event.contract_id),
-                event.start_date.strftime("%Y-%m-%d"),
-                event.end_date.strftime("%Y-%m-%d"),
-                str(event.support_contact) if event.support_contact else "N/A",
-                event.location or "N/A",
-                str(event.attendees),
-            )
-
-        console.print(table)
+        count, last = render_rows(
+            console,
+            "Events",
+            EVENT_COLUMNS,
+            (event_row(event) for event in events),
+            output_format,
+        )
+        print_next_page_hint(count, last, page_size)
     except Exception as e:
         console.print(f"[bold red]Error listing events: {e}[/bold red]")
     finally:
         session.close()
+@event.command("conflicts")
+@auth_required(["MANAGEMENT", "SUPPORT"])
+@click.option("--support", "support_user_id", type=int, default=None, help="Only check this support user.")
+@click.option("--from", "date_from", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Ignore events ending before this date.")
+@click.option("--to", "date_to", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Ignore events starting after this date.")
+@format_option
+def event_conflicts(user_id, support_user_id, date_from, date_to, output_format):
+    """List overlapping events of each support user."""
+    from dao.event_dao import EventDAO
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+
+    session = init_db()
+    try:
+        user = UserDAO(session, cache=shared_user_cache()).get_user_by_id(user_id)
+        if user.role == "SUPPORT":
+            support_user_id = user.id  # Un support ne voit que son propre planning
+        conflicts = EventDAO(session).find_conflicts(
+            support_user_id,
+            date_from.date() if date_from else None,
+            date_to.date() if date_to else None,
+        )
+        count, _ = render_rows(
+            console,
+            "Event conflicts",
+            CONFLICT_COLUMNS,
+            (conflict_row(first, second) for first, second in conflicts),
+            output_format or default_format(console),
+        )
+        if not count:
+            err_console.print("[bold green]No conflicting events.[/bold green]")
+    except Exception as e:
+        console.print(f"[bold red]Error finding conflicts: {e}[/bold red]")
+    finally:
+        session.close()
+
+
+@event.command("assign")
+@auth_required(["MANAGEMENT"])
+@click.option("--auto", is_flag=True, help="Assign every unstaffed event of the window automatically.")
+@click.option("--from", "date_from", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Ignore events ending before this date.")
+@click.option("--to", "date_to", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Ignore events starting after this date.")
+@click.option("--dry-run", is_flag=True, help="Show the assignment without saving it.")
+@format_option
+def assign_events(user_id, auto, date_from, date_to, dry_run, output_format):
+    """Assign unstaffed events to SUPPORT users without overlapping bookings."""
+    from services.assignment_service import auto_assign
+
+    if not auto:
+        raise click.UsageError("Only automatic assignment is available: pass --auto.")
+    session = init_db()
+    try:
+        result = auto_assign(
+            session,
+            date_from.date() if date_from else None,
+            date_to.date() if date_to else None,
+            dry_run=dry_run,
+        )
+        render_rows(
+            console,
+            "Support load",
+            ASSIGNMENT_COLUMNS,
+            result["supports"],
+            output_format or default_format(console),
+        )
+        verb = "would be assigned (dry run)" if dry_run else "assigned"
+        err_console.print(f"[bold green]{result['assigned']} event(s) {verb}.[/bold green]")
+        if result["unassigned"]:
+            ids = ", ".join(str(event_id) for event_id in result["unassigned"][:20])
+            more = "..." if len(result["unassigned"]) > 20 else ""
+            err_console.print(
+                f"[bold yellow]{len(result['unassigned'])} event(s) left unassigned, "
+                f"no support user is free: {ids}{more}[/bold yellow]"
+            )
+    except Exception as e:
+        console.print(f"[bold red]Error assigning events: {e}[/bold red]")
+    finally:
+        session.close()
+
+
 @event.command("delete")
 @auth_required(["MANAGEMENT"])  # Seuls les managers peuvent supprimer des événements
 @click.argument("event_id", type=int)
 def delete_event(user_id, event_id):
     """Delete an event (only for MANAGEMENT)."""
+    from dao.event_dao import EventDAO
+
     session = init_db()
     try:
         event_dao = EventDAO(session)
-        event = event_dao.get_event_by_id(event_id)
-
-        if not event:
-            console.print("[bold red]Error: Event not found![/bold red]")
-            return
-
+        # Un événement absent est signalé par la suppression elle-même
         event_dao.delete_event(event_id)
         console.print(f"[bold green]Event {event_id} deleted successfully![/bold green]")
 
@@ -503,6 +836,9 @@ def collaborator():
 @click.option("--role", prompt="Role", help="The role of the collaborator.")
 def add_collaborator(user_id, employee_number, name, email, password, role):
     """Add a new collaborator."""
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+
     if role not in ["MANAGEMENT", "SUPPORT", "SALES"]:
         console.print(
             "[bold red]Error: Role must be MANAGEMENT, SUPPORT or SALES.[/bold red]"
@@ -510,7 +846,7 @@ def add_collaborator(user_id, employee_number, name, email, password, role):
         return
     session = init_db()
     try:
-        user_dao = UserDAO(session)
+        user_dao = UserDAO(session, cache=shared_user_cache())
         collaborator = user_dao.create_user(
             employee_number=employee_number,
             name=name,
@@ -527,6 +863,49 @@ def add_collaborator(user_id, employee_number, name, email, password, role):
         session.close()
 
 
+@collaborator.command("import")
+@auth_required(["MANAGEMENT"])
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=services.import_service.DEFAULT_COLLABORATOR_BATCH_SIZE,
+    show_default=True,
+    help="Number of collaborators hashed and inserted per batch.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Processes hashing passwords (default: number of available cores).",
+)
+@click.option(
+    "--rejects",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="JSONL file receiving rejected rows (default: FILE.rejects.jsonl).",
+)
+def import_collaborators(user_id, file, batch_size, workers, rejects):
+    """Import collaborators in bulk from a CSV, TSV or JSONL file."""
+    session = init_db()
+    try:
+        report = services.import_service.import_collaborators(
+            session, file, batch_size=batch_size, workers=workers, rejects_path=rejects
+        )
+        console.print(
+            f"[bold green]{report['inserted']} collaborator(s) imported.[/bold green]"
+        )
+        if report["rejected"]:
+            console.print(
+                f"[bold yellow]{report['rejected']} row(s) rejected, "
+                f"see {report['rejects_path']}[/bold yellow]"
+            )
+    except Exception as e:
+        console.print(f"[bold red]Error importing collaborators: {e}[/bold red]")
+    finally:
+        session.close()
+
+
 @collaborator.command("update")
 @click.argument("collaborator_id")
 @click.option("--name", prompt="Name", help="The new name of the collaborator.")
@@ -537,9 +916,12 @@ def add_collaborator(user_id, employee_number, name, email, password, role):
 @click.option("--role", prompt="Role", help="The new role of the collaborator.")
 def update_collaborator(collaborator_id, name, email, password, role):
     """Update a collaborator's information."""
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+
     session = init_db()
     try:
-        user_dao = UserDAO(session)
+        user_dao = UserDAO(session, cache=shared_user_cache())
         user_dao.update_user(
             user_id=collaborator_id,
             name=name,
@@ -560,9 +942,12 @@ def update_collaborator(collaborator_id, name, email, password, role):
 @click.argument("collaborator_id")
 def delete_collaborator(collaborator_id):
     """Delete a collaborator."""
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+
     session = init_db()
     try:
-        user_dao = UserDAO(session)
+        user_dao = UserDAO(session, cache=shared_user_cache())
         user_dao.delete_user(user_id=collaborator_id)
         console.print(
             f"[bold green]Collaborator {collaborator_id} deleted successfully![/bold green]"
@@ -575,36 +960,252 @@ def delete_collaborator(collaborator_id):
 
 @collaborator.command("list")
 @auth_required(["MANAGEMENT"])
-def list_collaborators(user_id):
+@pagination_options
+@format_option
+def list_collaborators(user_id, page_size, after_id, since, output_format):
     """List all collaborators."""
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+
     session = init_db()
     try:
-        user_dao = UserDAO(session)
-        collaborators = (
-            user_dao.get_all_users()
+        output_format, page_size = resolve_list_output(output_format, page_size)
+        user_dao = UserDAO(session, cache=shared_user_cache())
+        collaborators = user_dao.get_all_users(
+            page_size=page_size,
+            after_id=after_id,
+            stream=output_format != "table",
+            since=since,
         )  # Using get_all_users method from the DAO
-        table = Table(title="Collaborators")
-        table.add_column("ID", style="cyan")
-        table.add_column("Employee Number", style="magenta")
-        table.add_column("Name", style="green")
-        table.add_column("Email", style="yellow")
-        table.add_column("Role", style="blue")
-
-        for collaborator in collaborators:
-            table.add_row(
-                str(collaborator.id),
-                str(collaborator.employee_number),
-                collaborator.name,
-                collaborator.email,
-                collaborator.role,
-            )
-
-        console.print(table)
+        count, last = render_rows(
+            console,
+            "Collaborators",
+            USER_COLUMNS,
+            (user_row(collaborator) for collaborator in collaborators),
+            output_format,
+        )
+        print_next_page_hint(count, last, page_size)
     except Exception as e:
         console.print(f"[bold red]Error listing collaborators: {e}[/bold red]")
     finally:
         session.close()
 
 
+# REPORT COMMANDS
+@cli.group()
+def report():
+    """Contract reports computed by the database."""
+    pass
+
+
+@report.command("revenue")
+@auth_required(["MANAGEMENT"])
+@format_option
+def report_revenue(user_id, output_format):
+    """Signed revenue, amount collected and balance per commercial."""
+    from dao.report_dao import ReportDAO
+
+    session = init_db()
+    try:
+        render_rows(
+            console,
+            "Revenue per commercial",
+            REVENUE_COLUMNS,
+            ReportDAO(session).revenue_by_commercial(),
+            output_format or default_format(console),
+        )
+    except Exception as e:
+        console.print(f"[bold red]Error building report: {e}[/bold red]")
+    finally:
+        session.close()
+
+
+@report.command("receivables")
+@auth_required(["MANAGEMENT"])
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help=f"Only show the clients owing the most "
+    f"(default: {DEFAULT_PAGE_SIZE} for tables, unlimited for streamed formats).",
+)
+@format_option
+def report_receivables(user_id, limit, output_format):
+    """Outstanding balance per client, largest first."""
+    from dao.report_dao import ReportDAO
+
+    session = init_db()
+    try:
+        output_format, limit = resolve_list_output(output_format, limit)
+        render_rows(
+            console,
+            "Outstanding balance per client",
+            RECEIVABLE_COLUMNS,
+            ReportDAO(session).receivables_by_client(limit=limit),
+            output_format,
+        )
+    except Exception as e:
+        console.print(f"[bold red]Error building report: {e}[/bold red]")
+    finally:
+        session.close()
+
+
+@report.command("signed")
+@auth_required(["MANAGEMENT"])
+@format_option
+def report_signed(user_id, output_format):
+    """Totals of signed versus unsigned contracts."""
+    from dao.report_dao import ReportDAO
+
+    session = init_db()
+    try:
+        render_rows(
+            console,
+            "Signed vs unsigned contracts",
+            SIGNED_COLUMNS,
+            ReportDAO(session).signed_summary(),
+            output_format or default_format(console),
+        )
+    except Exception as e:
+        console.print(f"[bold red]Error building report: {e}[/bold red]")
+    finally:
+        session.close()
+
+
+@cli.command("pool-stats")
+@format_option
+def pool_stats(output_format):
+    """Connection pool checkout and wait statistics of this process."""
+    import database
+
+    stats = database.pool_stats()
+    if stats is None:
+        # Commande isolée : rien n'a encore été ouvert, les compteurs ont du sens dans `shell`
+        console.print("[bold yellow]No database connection opened yet in this process.[/bold yellow]")
+        return
+    render_rows(
+        console,
+        "Connection pool",
+        POOL_STATS_COLUMNS,
+        ({"metric": key, "value": value} for key, value in stats.items()),
+        output_format or default_format(console),
+    )
+
+
+@cli.command("serve")
+@click.option("--host", default=None, help="Interface to listen on (default: API_HOST, 127.0.0.1).")
+@click.option("--port", type=click.IntRange(min=0, max=65535), default=None, help="Port (default: API_PORT, 8000).")
+@click.option("--access-log", is_flag=True, help="Log every request on stderr.")
+def serve(host, port, access_log):
+    """Serve the JSON API over HTTP (keep-alive, shared connection pool)."""
+    from config import API_HOST, API_PORT
+    from server import make_server
+
+    try:
+        httpd = make_server(host or API_HOST, API_PORT if port is None else port, quiet=not access_log)
+    except Exception as e:
+        console.print(f"[bold red]Error starting server: {e}[/bold red]")
+        return
+    address, bound_port = httpd.server_address[:2]
+    console.print(f"[bold green]Serving the CRM API on http://{address}:{bound_port}[/bold green]")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        console.print("[bold yellow]Server stopped.[/bold yellow]")
+    finally:
+        httpd.server_close()
+
+
+@cli.command("seed")
+@click.option("--users", type=click.IntRange(min=3), default=services.seed_service.DEFAULT_USERS, show_default=True, help="Collaborators (1 manager, 4 sales, 5 support out of 10).")
+@click.option("--clients", type=click.IntRange(min=0), default=services.seed_service.DEFAULT_CLIENTS, show_default=True, help="Clients, each followed by a SALES user.")
+@click.option("--contracts", type=click.IntRange(min=0), default=services.seed_service.DEFAULT_CONTRACTS, show_default=True, help="Contracts, owned by the commercial of their client.")
+@click.option("--events", type=click.IntRange(min=0), default=services.seed_service.DEFAULT_EVENTS, show_default=True, help="Events, most of them staffed by a SUPPORT user.")
+@click.option("--seed", "seed_value", type=int, default=services.seed_service.DEFAULT_SEED, show_default=True, help="Random seed: the same seed gives the same rows.")
+@click.option("--password", default=services.seed_service.DEFAULT_PASSWORD, show_default=True, help="Password of every generated collaborator.")
+@click.option("--workers", type=click.IntRange(min=1), default=None, help="Processes generating rows (default: number of available cores).")
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=services.seed_service.DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Rows generated per task and written per round trip.",
+)
+def seed(users, clients, contracts, events, seed_value, password, workers, batch_size):
+    """Fill an empty database with synthetic data for capacity testing."""
+    from database import get_engine
+
+    def table_done(table, rows, seconds):
+        if table == "indexes":
+            err_console.print(f"[dim]{rows} indexes rebuilt in {seconds:.1f} s[/dim]")
+        else:
+            err_console.print(f"[dim]{table}: {rows} rows in {seconds:.1f} s[/dim]")
+
+    try:
+        timings = services.seed_service.seed_database(
+            get_engine(),
+            users=users,
+            clients=clients,
+            contracts=contracts,
+            events=events,
+            seed=seed_value,
+            password=password,
+            workers=workers or services.import_service.default_hash_workers(),
+            batch_size=batch_size,
+            on_table_done=table_done,
+        )
+        total = sum(rows for table, (rows, _) in timings.items() if table != "indexes")
+        seconds = sum(seconds for _, seconds in timings.values())
+        console.print(
+            f"[bold green]{total} rows seeded in {seconds:.1f} s. "
+            f"Log in as {services.seed_service.seed_user_email(1)} (MANAGEMENT).[/bold green]"
+        )
+    except Exception as e:
+        console.print(f"[bold red]Error seeding database: {e}[/bold red]")
+
+
+@cli.command("shell")
+def shell():
+    """Run commands in one long-lived process (warm connection pool and token)."""
+    try:
+        import readline  # noqa: F401 (historique et édition de ligne pour input())
+    except ImportError:
+        pass
+
+    console.print(
+        "[bold]CRM shell[/bold]: type a command such as 'client list', "
+        "'help' to list commands, 'exit' to quit."
+    )
+    while True:
+        try:
+            line = input("crm> ").strip()
+        except EOFError:
+            break
+        except KeyboardInterrupt:
+            console.print()
+            continue
+        if not line:
+            continue
+        if line in ("exit", "quit"):
+            break
+        try:
+            args = ["--help"] if line == "help" else shlex.split(line)
+        except ValueError as e:
+            console.print(f"[bold red]Invalid command line: {e}[/bold red]")
+            continue
+        if args[0] == "shell":
+            console.print("[bold yellow]Already in the shell.[/bold yellow]")
+            continue
+
+        # Les groupes click existants sont appelés dans le même processus : le moteur,
+        # le pool de connexions et le token décodé restent en mémoire entre les commandes
+        try:
+            cli.main(args, prog_name="crm", standalone_mode=False, obj={"args": args})
+        except click.exceptions.Abort:
+            console.print("[bold yellow]Aborted.[/bold yellow]")
+        except click.ClickException as e:
+            e.show()
+
+
 if __name__ == "__main__":
     cli()
@@ -16,11 +16,50 @@ from dotenv import load_dotenv
 # Load environment variables from the .env file
 load_dotenv()
 
-# JWT configuration
+# Sentry configuration
 SENTRY_DSN = os.getenv("SENTRY_DSN")
+# Mode "désactivé" : SENTRY_ENABLED=false (ou aucun DSN) n'importe même pas sentry_sdk
+SENTRY_ENABLED = os.getenv("SENTRY_ENABLED", "true").lower() not in ("0", "false", "no", "off")
+SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", 0.1))
+# 0 désactive le profilage ; s'applique aux transactions déjà échantillonnées
+SENTRY_PROFILES_SAMPLE_RATE = float(os.getenv("SENTRY_PROFILES_SAMPLE_RATE", 0.0))
+# Temps maximal (secondes) passé à vider la file d'envoi à la sortie du processus
+SENTRY_SHUTDOWN_TIMEOUT = float(os.getenv("SENTRY_SHUTDOWN_TIMEOUT", 0.5))
+
+# JWT configuration
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXP_DELTA_SECONDS = int(os.getenv("JWT_EXP_DELTA_SECONDS", 3600))
+# Durée pendant laquelle une vérification de version de token reste valable en mémoire
+TOKEN_VERSION_CACHE_TTL = float(os.getenv("TOKEN_VERSION_CACHE_TTL", 30))
+# Coût Argon2 des mots de passe : les valeurs par défaut sont celles d'argon2-cffi,
+# `cli.py calibrate` propose des valeurs adaptées à la machine
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))  # en KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 4))
+# Cache des utilisateurs de UserDAO : nombre d'entrées et durée de vie (0 le désactive)
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 1024))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 60))
 TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
+# URL du moteur asyncio (DAO de dao/async_dao.py) ; par défaut DATABASE_URL avec
+# le pilote aiosqlite ou asyncpg
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or None
+# `--trace-sql` : une requête identique exécutée au moins autant de fois est signalée N+1
+SQL_TRACE_REPEAT_THRESHOLD = int(os.getenv("SQL_TRACE_REPEAT_THRESHOLD", 5))
+# Adresse d'écoute de `cli.py serve` (API HTTP locale)
+API_HOST = os.getenv("API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("API_PORT", 8000))
+# Pool de connexions (ignorés par SQLite sauf avec DB_SQLITE_POOL_CLASS=QueuePool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# Durée de vie maximale (secondes) d'une connexion, à garder sous le délai
+# d'inactivité du serveur ou de PgBouncer ; -1 la désactive
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+# Vérifie chaque connexion au checkout et remplace celles coupées par le serveur
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() not in ("0", "false", "no", "off")
+# Classe de pool pour SQLite : QueuePool, NullPool, StaticPool ou SingletonThreadPool
+# (vide : choix par défaut de SQLAlchemy selon fichier ou mémoire)
+DB_SQLITE_POOL_CLASS = os.getenv("DB_SQLITE_POOL_CLASS") or None
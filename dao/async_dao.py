@@ -0,0 +1,146 @@
+import asyncio
+import functools
+from collections import deque
+from sqlalchemy.ext.asyncio import AsyncSession
+from dao.client_dao import ClientDAO
+from dao.contract_dao import ContractDAO
+from dao.event_dao import EventDAO
+from dao.report_dao import ReportDAO
+from dao.user_dao import UserDAO
+from utils.security import check_password, hash_password
+
+# Les DAO asyncio exécutent les méthodes des DAO synchrones dans AsyncSession.run_sync :
+# requêtes, validations et messages d'erreur restent définis à un seul endroit.
+# Une AsyncSession ne supporte pas d'appels simultanés : pour interroger la base en
+# parallèle, chaque tâche utilise sa propre session (voir gather_in_sessions).
+
+
+def _async_method(name, method):
+    """Wrap a synchronous DAO method into a coroutine running it through run_sync."""
+
+    @functools.wraps(method)
+    async def call(self, *args, **kwargs):
+        # Un curseur yield_per ne peut pas être lu hors de run_sync : les lignes
+        # sont toujours renvoyées sous forme de liste
+        kwargs.pop("stream", None)
+
+        return await self._run(name, *args, **kwargs)
+
+    return call
+
+
+async def _off_loop(function, *args):
+    """Run CPU-bound work (Argon2) in the default executor instead of the event loop thread."""
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+class AsyncDAO:
+    """Base of the asyncio DAOs, exposing every public method of `dao_class` as a coroutine."""
+
+    dao_class = None
+
+    def __init__(self, session: AsyncSession, **options):
+        # Les options sont transmises au DAO synchrone (ex. cache= pour UserDAO)
+        self.session = session
+        self._options = options
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Les méthodes redéfinies par la sous-classe ne sont pas enveloppées
+        for name, method in vars(cls.dao_class).items():
+            if not name.startswith("_") and callable(method) and name not in vars(cls):
+                setattr(cls, name, _async_method(name, method))
+
+    async def _run(self, name, *args, **kwargs):
+        """Call the synchronous DAO method `name` through run_sync."""
+
+        def run(session):
+            return getattr(self.dao_class(session, **self._options), name)(*args, **kwargs)
+
+        return await self.session.run_sync(run)
+
+
+class AsyncClientDAO(AsyncDAO):
+    dao_class = ClientDAO
+
+
+class AsyncContractDAO(AsyncDAO):
+    dao_class = ContractDAO
+
+
+class AsyncEventDAO(AsyncDAO):
+    dao_class = EventDAO
+
+
+class AsyncUserDAO(AsyncDAO):
+    """Async UserDAO: Argon2 runs in an executor, only the SQL goes through run_sync.
+
+    A hash or a verification takes tens of milliseconds of CPU; run inside
+    run_sync, it would block every other coroutine of the event loop.
+    """
+
+    dao_class = UserDAO
+
+    async def create_user(self, employee_number, name, email, password, role):
+        """Create a user, hashing the password in an executor."""
+        password_hash = await _off_loop(hash_password, password)
+        return await self._run("_insert_user", employee_number, name, email, password_hash, role)
+
+    async def update_user(self, user_id, name=None, email=None, password=None, role=None):
+        """Update a user, hashing a new password in an executor."""
+        password_hash = await _off_loop(hash_password, password) if password is not None else None
+        return await self._run("_update_user", user_id, name, email, password_hash, role)
+
+    async def authenticate_user(self, email, password):
+        """Authenticate a user, verifying the password in an executor."""
+        try:
+            user = await self._run("_user_for_login", email)
+            if user is None:
+                return None
+            valid, new_hash = await _off_loop(check_password, user.password_hash, password)
+        except Exception as e:
+            raise Exception(f"Error authenticating user: {e}")
+        if not valid:
+            return None
+        if new_hash:
+            await self._run("_save_rehash", user, new_hash)
+        return user
+
+    async def bulk_create_users(self, rows, hash_passwords=None):
+        """Insert a batch of users, hashing every password in an executor first."""
+        # Les mots de passe sont hachés d'avance ; ceux des lignes rejetées sont ignorés
+        passwords = [row["password"] for row in rows]
+        hashes = await _off_loop(hash_passwords or _hash_all, passwords)
+        pending = {}
+        for password, password_hash in zip(passwords, hashes):
+            pending.setdefault(password, deque()).append(password_hash)
+
+        def precomputed(accepted):
+            return [pending[password].popleft() for password in accepted]
+
+        return await self._run("bulk_create_users", rows, hash_passwords=precomputed)
+
+
+def _hash_all(passwords):
+    return [hash_password(password) for password in passwords]
+
+
+class AsyncReportDAO(AsyncDAO):
+    dao_class = ReportDAO
+
+
+async def gather_in_sessions(*calls, session_factory=None):
+    """Run DAO calls concurrently, each one in its own AsyncSession.
+
+    Each call is a function taking an AsyncSession and returning an awaitable,
+    e.g. `lambda s: AsyncClientDAO(s).get_client_by_id(1)`. Results come back
+    in the order of the calls.
+    """
+    if session_factory is None:
+        from database import AsyncSession as session_factory
+
+    async def run(call):
+        async with session_factory() as session:
+            return await call(session)
+
+    return await asyncio.gather(*(run(call) for call in calls))
@@ -10,8 +10,36 @@
 #                                                                              #
 # **************************************************************************** #
 
-from sqlalchemy.orm import Session
+import csv
+import io
+from sqlalchemy import delete, exists, func, insert, literal, literal_column, or_, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
 from models.client import Client
+from models.contract import Contract
+from models.client_search import SEARCH_EXPRESSION, SQLITE_SEARCH_TABLE
+from dao.pagination import fetch, keyset_paginate, updated_since
+
+# Nombre de résultats renvoyés par `client search` quand aucun n'est précisé
+DEFAULT_SEARCH_LIMIT = 20
+
+# Les index trigrammes ne servent qu'à partir de 3 caractères ; en dessous, la
+# recherche parcourrait toute la table
+MIN_SEARCH_LENGTH = 3
+
+# Relations affichées par `client list` : le commercial est lu dans la même requête
+LIST_RELATED = (joinedload(Client.commercial),)
+
+
+def _like_pattern(text_query):
+    """Build a substring LIKE pattern, escaping the wildcards typed by the user."""
+    escaped = text_query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(text_query):
+    """Quote a text as an FTS5 phrase so its punctuation is not read as query syntax."""
+    return '"' + text_query.replace('"', '""') + '"'
 
 
 class ClientDAO:
@@ -39,54 +67,78 @@ class ClientDAO:
             # Gestion des erreurs survenues lors de la récupération du client
             raise Exception(f"Error retrieving client by ID: {e}")
 
-    def get_all_clients(self) -> list[Client]:
-        """Retrieve all clients."""
+    def get_all_clients(
+        self, page_size=None, after_id=None, stream=False, since=None, with_related=False
+    ) -> list[Client]:
+        """Retrieve clients, one keyset page at a time when page_size is given."""
         try:
-            # Récupère tous les clients dans la base de données
-            return self.session.query(Client).all()
+            # Récupère les clients triés par ID, à partir du curseur `after_id`
+            query = self.session.query(Client)
+            if with_related:
+                query = query.options(*LIST_RELATED)
+            query = updated_since(query, Client.updated_at, since)
+            query = keyset_paginate(query, Client.id, page_size, after_id)
+            return fetch(query, stream)
         except Exception as e:
             # Gestion des erreurs pendant la récupération de tous les clients
             raise Exception(f"Error retrieving all clients: {e}")
 
-    def update_client(self, client_id, full_name, email, phone, company_name):
-        """Update an existing client's information."""
+    def update_client(self, client_id, full_name, email, phone, company_name, commercial_id=None):
+        """Update a client in one UPDATE ... RETURNING; with commercial_id, only if it follows the client."""
         try:
-            # Recherche du client à mettre à jour
-            existing_client = self.get_client_by_id(client_id)
-            if not existing_client:
-                # Si le client n'existe pas, une exception est levée
+            # Une seule requête : le contrôle du propriétaire fait partie du WHERE
+            statement = update(Client).where(Client.id == client_id)
+            if commercial_id is not None:
+                statement = statement.where(Client.commercial_contact == commercial_id)
+            client = self.session.execute(
+                statement.values(
+                    full_name=full_name, email=email, phone=phone, company_name=company_name
+                ).returning(Client)
+            ).scalar_one_or_none()
+            if client is None:
+                # Aucune ligne modifiée : une lecture, seulement dans ce cas, en donne la raison
+                if commercial_id is not None and self._exists(client_id):
+                    raise PermissionError("You can only modify your own clients")
                 raise Exception("Client not found")
 
-            # Mise à jour des informations du client
-            existing_client.full_name = full_name
-            existing_client.email = email
-            existing_client.phone = phone
-            existing_client.company_name = company_name
-
             # Commit des modifications dans la base de données
             self.session.commit()
+            return client
+        except PermissionError:
+            self.session.rollback()
+            raise
         except Exception as e:
             # Si une erreur se produit, annule la transaction en cours
             self.session.rollback()
             raise Exception(f"Error updating client: {e}")
 
     def delete_client(self, client_id: int):
-        """Delete a client."""
+        """Delete a client without contracts in one DELETE ... RETURNING."""
         try:
-            # Recherche du client à supprimer
-            client = self.get_client_by_id(client_id)
-            if not client:
+            # Un client ayant des contrats est conservé, comme avec session.delete()
+            # qui échouait en voulant vider leur client_id
+            deleted = self.session.execute(
+                delete(Client)
+                .where(
+                    Client.id == client_id,
+                    ~exists().where(Contract.client_id == Client.id),
+                )
+                .returning(Client.id)
+            ).first()
+            if deleted is None:
+                if self._exists(client_id):
+                    raise Exception("Client has contracts")
                 # Si le client n'existe pas, une exception est levée
                 raise Exception("Client not found")
-
-            # Suppression du client de la base de données
-            self.session.delete(client)
             self.session.commit()  # Validation de la suppression
         except Exception as e:
             # Si une erreur se produit, annule la transaction en cours
             self.session.rollback()
             raise Exception(f"Error deleting client: {e}")
 
+    def _exists(self, client_id):
+        return self.session.query(Client.id).filter(Client.id == client_id).first() is not None
+
     def add_client_from_params(
         self, name: str, email: str, phone: str, company: str, commercial_contact: int
     ):
@@ -107,3 +159,149 @@ class ClientDAO:
             # Si une erreur se produit, annule la transaction en cours
             self.session.rollback()
             raise Exception(f"Error adding client: {e}")
+
+    def search_clients(self, text_query, limit=DEFAULT_SEARCH_LIMIT, with_related=False) -> list[Client]:
+        """Return the clients best matching a text in their name, company or email."""
+        # Les recherches FTS passent par from_statement, où une jointure est
+        # impossible : le commercial est chargé par une seconde requête IN (...)
+        options = (selectinload(Client.commercial),) if with_related else ()
+        try:
+            text_query = text_query.strip()
+            if len(text_query) < MIN_SEARCH_LENGTH:
+                raise Exception(f"Search text must be at least {MIN_SEARCH_LENGTH} characters")
+            dialect = self.session.get_bind().dialect.name
+            if dialect == "postgresql":
+                return self._search_trigram(text_query, limit, options)
+            if dialect == "sqlite":
+                return self._search_fts(text_query, limit, options)
+            return self._search_like(text_query, limit, options)
+        except Exception as e:
+            raise Exception(f"Error searching clients: {e}")
+
+    def _search_trigram(self, text_query, limit, options=()):
+        """Search with the pg_trgm GIN index, ranked by word similarity."""
+        search_text = literal_column(SEARCH_EXPRESSION)
+        return (
+            self.session.query(Client)
+            .options(*options)
+            .filter(
+                or_(
+                    literal(text_query).op("<%")(search_text),  # Mot approchant (fautes de frappe)
+                    search_text.ilike(_like_pattern(text_query), escape="\\"),  # Sous-chaîne exacte
+                )
+            )
+            .order_by(func.word_similarity(text_query, search_text).desc(), Client.id)
+            .limit(limit)
+            .all()
+        )
+
+    def _search_fts(self, text_query, limit, options=()):
+        """Search the FTS5 trigram table, ranked by bm25, loosening the match until something is found."""
+        # Du plus strict au plus tolérant : le texte exact, tous ses mots dans n'importe
+        # quel ordre, puis les trigrammes du texte (tolère une faute de frappe), restreints
+        # si possible aux lignes contenant l'un des mots. Les étapes larges coûtent plus
+        # cher et ne servent que si les précédentes n'ont rien trouvé.
+        words = [_fts_phrase(word) for word in text_query.split() if len(word) >= MIN_SEARCH_LENGTH]
+        lowered = text_query.lower()
+        trigrams = " OR ".join(
+            _fts_phrase(trigram) for trigram in sorted({lowered[i : i + 3] for i in range(len(lowered) - 2)})
+        )
+        stages = [_fts_phrase(text_query)]
+        if len(words) > 1:
+            stages += [" AND ".join(words), f"({' OR '.join(words)}) AND ({trigrams})"]
+        stages.append(trigrams)
+        for match in stages:
+            clients = self._fts_match(match, limit, options)
+            if clients:
+                return clients
+        return []
+
+    def _fts_match(self, match, limit, options=()):
+        # Le nom pèse plus que la société, elle-même plus que l'email
+        statement = text(
+            f"SELECT clients.* FROM {SQLITE_SEARCH_TABLE} "
+            f"JOIN clients ON clients.id = {SQLITE_SEARCH_TABLE}.rowid "
+            f"WHERE {SQLITE_SEARCH_TABLE} MATCH :match "
+            f"ORDER BY bm25({SQLITE_SEARCH_TABLE}, 10.0, 5.0, 1.0) LIMIT :limit"
+        ).bindparams(match=match, limit=limit)
+        return self.session.query(Client).options(*options).from_statement(statement).all()
+
+    def _search_like(self, text_query, limit, options=()):
+        """Search with ILIKE on each column, for short texts and other databases."""
+        pattern = _like_pattern(text_query)
+        return (
+            self.session.query(Client)
+            .options(*options)
+            .filter(
+                or_(
+                    Client.full_name.ilike(pattern, escape="\\"),
+                    Client.company_name.ilike(pattern, escape="\\"),
+                    Client.email.ilike(pattern, escape="\\"),
+                )
+            )
+            .order_by(Client.full_name, Client.id)
+            .limit(limit)
+            .all()
+        )
+
+    def bulk_add_clients(self, rows: list[dict]):
+        """Insert a batch of client dicts in one round trip; return (inserted, rejected)."""
+        if not rows:
+            return 0, []
+        try:
+            # Les emails déjà présents en base sont écartés avant l'insertion
+            emails = [row["email"] for row in rows]
+            existing = {
+                email
+                for (email,) in self.session.query(Client.email).filter(
+                    Client.email.in_(emails)
+                )
+            }
+            rejected = [(row, "Email already exists") for row in rows if row["email"] in existing]
+            rows = [row for row in rows if row["email"] not in existing]
+            if not rows:
+                return 0, rejected
+
+            try:
+                self._insert_clients(rows)
+                self.session.commit()
+                return len(rows), rejected
+            except IntegrityError:
+                # Conflit inattendu (insertion concurrente) : on rejoue le lot ligne
+                # par ligne dans des savepoints pour n'écarter que les lignes fautives
+                self.session.rollback()
+
+            inserted = 0
+            for row in rows:
+                try:
+                    with self.session.begin_nested():
+                        self.session.execute(insert(Client), [row])
+                    inserted += 1
+                except IntegrityError as e:
+                    rejected.append((row, f"Integrity error: {e.orig}"))
+            self.session.commit()
+            return inserted, rejected
+        except Exception as e:
+            self.session.rollback()
+            raise Exception(f"Error importing clients: {e}")
+
+    def _insert_clients(self, rows: list[dict]):
+        """Insert rows with COPY on PostgreSQL/psycopg2, executemany elsewhere."""
+        dialect = self.session.get_bind().dialect
+        if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+            columns = list(rows[0].keys())
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows([row[c] for c in columns] for row in rows)
+            buffer.seek(0)
+            # COPY s'exécute dans la transaction de la session et sera validé avec elle
+            statement = f"COPY clients ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+            cursor = self.session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(statement, buffer)
+            except dialect.dbapi.IntegrityError as e:
+                # Le curseur brut lève l'erreur du driver : on la ramène à celle de SQLAlchemy
+                raise IntegrityError(statement, None, e)
+            finally:
+                cursor.close()
+        else:
+            self.session.execute(insert(Client), rows)
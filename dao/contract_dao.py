@@ -10,9 +10,16 @@
 #                                                                              #
 # **************************************************************************** #
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
+from models.client import Client
 from models.contract import Contract
+from models.event import Event
+from dao.pagination import fetch, keyset_paginate, updated_since
+
+# Relations affichées par `contract list` : le client est lu dans la même requête
+LIST_RELATED = (joinedload(Contract.client),)
 
 
 class ContractDAO:
@@ -51,32 +58,46 @@ class ContractDAO:
             # Gère toutes les exceptions pendant la récupération du contrat
             raise Exception(f"Error retrieving contract by ID: {e}")
 
-    def get_all_contracts(self) -> list[Contract]:
-        """Retrieve all contracts."""
+    def get_all_contracts(
+        self, page_size=None, after_id=None, stream=False, since=None, with_related=False
+    ) -> list[Contract]:
+        """Retrieve contracts, one keyset page at a time when page_size is given."""
         try:
-            # Récupère tous les contrats dans la base de données
-            return self.session.query(Contract).all()
+            # Récupère les contrats triés par ID, à partir du curseur `after_id`
+            query = self.session.query(Contract)
+            if with_related:
+                query = query.options(*LIST_RELATED)
+            query = updated_since(query, Contract.updated_at, since)
+            query = keyset_paginate(query, Contract.id, page_size, after_id)
+            return fetch(query, stream)
         except Exception as e:
             # Gère toute erreur qui pourrait survenir lors de la récupération de tous les contrats
             raise Exception(f"Error retrieving all contracts: {e}")
 
-    def update_contract(self, contract_id, total_amount, amount_remaining, signed):
-        """Update an existing contract's details."""
+    def update_contract(self, contract_id, total_amount, amount_remaining, signed, commercial_id=None):
+        """Update a contract in one UPDATE ... RETURNING; with commercial_id, only if it owns the contract."""
         try:
-            # Récupère le contrat existant à partir de son ID
-            existing_contract = self.get_contract_by_id(contract_id)
-            if not existing_contract:
-                # Si le contrat n'est pas trouvé, une exception est levée
+            # Une seule requête : le contrôle du propriétaire fait partie du WHERE
+            statement = update(Contract).where(Contract.id == contract_id)
+            if commercial_id is not None:
+                statement = statement.where(Contract.commercial_id == commercial_id)
+            contract = self.session.execute(
+                statement.values(
+                    total_amount=total_amount, amount_remaining=amount_remaining, signed=signed
+                ).returning(Contract)
+            ).scalar_one_or_none()
+            if contract is None:
+                # Aucune ligne modifiée : une lecture, seulement dans ce cas, en donne la raison
+                if commercial_id is not None and self._exists(contract_id):
+                    raise PermissionError("You can only modify your own contracts")
                 raise Exception("Contract not found")
 
-            # Mise à jour des détails du contrat
-            existing_contract.total_amount = total_amount
-            existing_contract.amount_remaining = amount_remaining
-            existing_contract.signed = signed
-
             # Validation des changements dans la base de données
             self.session.commit()
-            return existing_contract  # Retourne le contrat mis à jour
+            return contract  # Retourne le contrat mis à jour
+        except PermissionError:
+            self.session.rollback()
+            raise
         except IntegrityError as e:
             # Si une erreur d'intégrité se produit, annule la transaction
             self.session.rollback()
@@ -86,18 +107,24 @@ class ContractDAO:
             self.session.rollback()
             raise Exception(f"Error updating contract: {e}")
 
-
     def delete_contract(self, contract_id: int):
-        """Delete a contract."""
+        """Delete a contract without events in one DELETE ... RETURNING."""
         try:
-            # Récupère le contrat par son ID
-            contract = self.get_contract_by_id(contract_id)
-            if not contract:
+            # Un contrat ayant des événements est conservé, comme avec session.delete()
+            # qui échouait en voulant vider leur contract_id
+            deleted = self.session.execute(
+                delete(Contract)
+                .where(
+                    Contract.id == contract_id,
+                    ~exists().where(Event.contract_id == Contract.id),
+                )
+                .returning(Contract.id)
+            ).first()
+            if deleted is None:
+                if self._exists(contract_id):
+                    raise Exception("Contract has events")
                 # Si le contrat n'est pas trouvé, une exception est levée
                 raise Exception("Contract not found")
-
-            # Supprime le contrat de la base de données
-            self.session.delete(contract)
             self.session.commit()  # Validation de la suppression dans la base de données
         except IntegrityError as e:
             # Si une erreur d'intégrité se produit (par exemple, si le contrat est référencé ailleurs), annule la transaction
@@ -108,38 +135,52 @@ class ContractDAO:
             self.session.rollback()
             raise Exception(f"Error deleting contract: {e}")
 
-    def get_unsigned_contracts(self, commercial_id):
+    def _exists(self, contract_id):
+        return self.session.query(Contract.id).filter(Contract.id == contract_id).first() is not None
+
+    def get_unsigned_contracts(
+        self, commercial_id, page_size=None, after_id=None, stream=False, since=None, with_related=False
+    ):
         """Retrieve all unsigned contracts for a specific commercial."""
         try:
             # Récupère tous les contrats non signés pour un commercial spécifique
-            return (
-                self.session.query(Contract)
-                .filter(
-                    Contract.signed == False,  # Filtre les contrats non signés
-                    Contract.client.has(
-                        commercial_contact=commercial_id  # Filtre par le contact commercial
-                    ),
-                )
-                .all()
+            query = self.session.query(Contract).filter(
+                Contract.signed == False,  # Filtre les contrats non signés
+                Contract.client_id.in_(self._client_ids_of(commercial_id)),
             )
+            if with_related:
+                query = query.options(*LIST_RELATED)
+            query = updated_since(query, Contract.updated_at, since)
+            query = keyset_paginate(query, Contract.id, page_size, after_id)
+            return fetch(query, stream)
         except Exception as e:
             # Gère les erreurs de récupération des contrats non signés
             raise Exception(f"Error retrieving unsigned contracts: {e}")
 
-    def get_unpaid_contracts(self, commercial_id):
+    def get_unpaid_contracts(
+        self, commercial_id, page_size=None, after_id=None, stream=False, since=None, with_related=False
+    ):
         """Retrieve all unpaid contracts for a specific commercial."""
         try:
             # Récupère tous les contrats non payés pour un commercial spécifique
-            return (
-                self.session.query(Contract)
-                .filter(
-                    Contract.amount_remaining > 0,  # Filtre les contrats avec un solde restant
-                    Contract.client.has(
-                        commercial_contact=commercial_id  # Filtre par le contact commercial
-                    ),
-                )
-                .all()
+            query = self.session.query(Contract).filter(
+                Contract.amount_remaining > 0,  # Filtre les contrats avec un solde restant
+                Contract.client_id.in_(self._client_ids_of(commercial_id)),
             )
+            if with_related:
+                query = query.options(*LIST_RELATED)
+            query = updated_since(query, Contract.updated_at, since)
+            query = keyset_paginate(query, Contract.id, page_size, after_id)
+            return fetch(query, stream)
         except Exception as e:
             # Gère les erreurs de récupération des contrats impayés
             raise Exception(f"Error retrieving unpaid contracts: {e}")
+
+    @staticmethod
+    def _client_ids_of(commercial_id):
+        """Subquery of the IDs of the clients followed by a commercial."""
+        # Un IN sur un sous-select (plutôt qu'un EXISTS corrélé) permet d'utiliser
+        # ix_clients_commercial_contact puis les index partiels sur contracts.client_id
+        return select(Client.id).where(
+            Client.commercial_contact == commercial_id  # Filtre par le contact commercial
+        )
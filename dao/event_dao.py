@@ -1,6 +1,14 @@
-from sqlalchemy.orm import Session
+from itertools import groupby
+from sqlalchemy import bindparam, delete, update
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
+from models.contract import Contract
 from models.event import Event
+from dao.pagination import STREAM_BATCH_SIZE, fetch, keyset_paginate, updated_since
+from utils.scheduling import find_overlaps
+
+# Relations affichées par `event list` : le contrat et son client sont lus dans la même requête
+LIST_RELATED = (joinedload(Event.contract).joinedload(Contract.client),)
 
 
 class EventDAO:
@@ -37,34 +45,45 @@ class EventDAO:
             # Gère toutes les exceptions survenues pendant la récupération de l'événement
             raise Exception(f"Error retrieving event by ID: {e}")  # Relance l'exception après avoir signalé l'erreur
 
-    def get_all_events(self) -> list[Event]:
-        """Retrieve all events."""
+    def get_all_events(
+        self, page_size=None, after_id=None, stream=False, since=None, with_related=False
+    ) -> list[Event]:
+        """Retrieve events, one keyset page at a time when page_size is given."""
         try:
-            # Récupère tous les événements présents dans la base de données
-            return self.session.query(Event).all()
+            # Récupère les événements triés par ID, à partir du curseur `after_id`
+            query = self.session.query(Event)
+            if with_related:
+                query = query.options(*LIST_RELATED)
+            query = updated_since(query, Event.updated_at, since)
+            query = keyset_paginate(query, Event.id, page_size, after_id)
+            return fetch(query, stream)
         except Exception as e:
             # Gère toute erreur de récupération des événements
             raise Exception(f"Error retrieving all events: {e}")
 
-    def update_event(self, event_id, start_date, end_date, support_contact, location, attendees, notes):
-        """Update an existing event's details."""
+    def update_event(self, event_id, start_date, end_date, support_user_id, location, attendees, notes):
+        """Update an event in one UPDATE ... RETURNING."""
         try:
-            # Récupère l'événement existant à partir de son ID
-            existing_event = self.get_event_by_id(event_id)
-            if not existing_event:
-                raise Exception("Event not found")  # Si l'événement n'est pas trouvé, une exception est levée
-
-            # Mise à jour des attributs de l'événement
-            existing_event.start_date = start_date
-            existing_event.end_date = end_date
-            existing_event.support_contact = support_contact
-            existing_event.location = location
-            existing_event.attendees = attendees
-            existing_event.notes = notes
+            # Mise à jour et relecture de l'événement en une seule requête
+            event = self.session.execute(
+                update(Event)
+                .where(Event.id == event_id)
+                .values(
+                    start_date=start_date,
+                    end_date=end_date,
+                    support_user_id=support_user_id,
+                    location=location,
+                    attendees=attendees,
+                    notes=notes,
+                )
+                .returning(Event)
+            ).scalar_one_or_none()
+            if event is None:
+                raise Exception("Event not found")  # Aucune ligne modifiée : l'événement n'existe pas
 
             # Commit des changements dans la base de données
             self.session.commit()
-            return existing_event  # Retourne l'événement mis à jour
+            return event  # Retourne l'événement mis à jour
         except IntegrityError as e:
             # Si une erreur d'intégrité se produit, rollback et levée de l'exception avec message d'erreur détaillé
             self.session.rollback()
@@ -75,15 +94,14 @@ class EventDAO:
             raise Exception(f"Error updating event: {e}")
 
     def delete_event(self, event_id: int):
-        """Delete an event."""
+        """Delete an event in one DELETE ... RETURNING."""
         try:
-            # Récupère l'événement à supprimer
-            event = self.get_event_by_id(event_id)
-            if not event:
-                raise Exception("Event not found")  # Si l'événement n'est pas trouvé, une exception est levée
-
-            # Supprime l'événement de la session
-            self.session.delete(event)
+            # Supprime l'événement sans le charger au préalable
+            deleted = self.session.execute(
+                delete(Event).where(Event.id == event_id).returning(Event.id)
+            ).first()
+            if deleted is None:
+                raise Exception("Event not found")  # Aucune ligne supprimée : l'événement n'existe pas
             self.session.commit()  # Commit pour valider la suppression
         except IntegrityError as e:
             # En cas d'erreur d'intégrité (par exemple, si l'événement est référencé ailleurs), rollback
@@ -94,15 +112,116 @@ class EventDAO:
             self.session.rollback()
             raise Exception(f"Error deleting event: {e}")
 
-    def get_events_for_support(self, support_user_id):
+    def get_events_for_support(
+        self, support_user_id, page_size=None, after_id=None, stream=False, since=None, with_related=False
+    ):
         """Retrieve events assigned to a specific support user."""
         try:
             # Récupère les événements assignés à un utilisateur de support spécifique (en fonction de l'ID)
-            return (
-                self.session.query(Event)
-                .filter(Event.support_contact == support_user_id)  # Filtre par le contact de support affecté
-                .all()
+            query = self.session.query(Event).filter(
+                Event.support_user_id == support_user_id  # Filtre par le support affecté (colonne indexée)
             )
+            if with_related:
+                query = query.options(*LIST_RELATED)
+            query = updated_since(query, Event.updated_at, since)
+            query = keyset_paginate(query, Event.id, page_size, after_id)
+            return fetch(query, stream)
         except Exception as e:
             # Gère toute erreur de récupération d'événements pour un utilisateur de support spécifique
             raise Exception(f"Error retrieving events for support: {e}")
+
+    def find_conflicts(self, support_user_id=None, date_from=None, date_to=None) -> list[tuple]:
+        """Return the pairs of overlapping events of each support user."""
+        try:
+            # Seules les colonnes de l'index de planning sont lues, dans son ordre
+            query = self.session.query(
+                Event.id, Event.support_user_id, Event.start_date, Event.end_date
+            ).filter(Event.support_user_id.isnot(None))
+            if support_user_id is not None:
+                query = query.filter(Event.support_user_id == support_user_id)
+            query = self._in_window(query, date_from, date_to)
+            query = query.order_by(Event.support_user_id, Event.start_date)
+
+            conflicts = []
+            rows = query.yield_per(STREAM_BATCH_SIZE)
+            for _, events in groupby(rows, key=lambda row: row.support_user_id):
+                conflicts.extend(
+                    find_overlaps((row.start_date, row.end_date, row) for row in events)
+                )
+            return conflicts
+        except Exception as e:
+            raise Exception(f"Error finding event conflicts: {e}")
+
+    def get_conflicting_events(self, support_user_id, start_date, end_date, exclude_event_id=None):
+        """Return the events of a support user overlapping the given dates."""
+        try:
+            query = self.session.query(
+                Event.id, Event.start_date, Event.end_date
+            ).filter(
+                Event.support_user_id == support_user_id,
+                Event.start_date <= end_date,  # Borne de l'index de planning
+                Event.end_date >= start_date,
+            )
+            if exclude_event_id is not None:
+                query = query.filter(Event.id != exclude_event_id)
+            return query.order_by(Event.start_date).all()
+        except Exception as e:
+            raise Exception(f"Error checking event conflicts: {e}")
+
+    def get_unassigned_events(self, date_from=None, date_to=None):
+        """Return (id, start_date, end_date) of the events without support user in a window."""
+        try:
+            query = self.session.query(Event.id, Event.start_date, Event.end_date).filter(
+                Event.support_user_id.is_(None)
+            )
+            return self._in_window(query, date_from, date_to).order_by(Event.start_date).all()
+        except Exception as e:
+            raise Exception(f"Error retrieving unassigned events: {e}")
+
+    def get_support_schedules(self, support_user_ids, date_from=None, date_to=None) -> dict:
+        """Return the booked (start_date, end_date) intervals of each support user in a window."""
+        try:
+            query = self.session.query(
+                Event.support_user_id, Event.start_date, Event.end_date
+            ).filter(Event.support_user_id.in_(support_user_ids))
+            schedules = {support_user_id: [] for support_user_id in support_user_ids}
+            for row in self._in_window(query, date_from, date_to):
+                schedules[row.support_user_id].append((row.start_date, row.end_date))
+            return schedules
+        except Exception as e:
+            raise Exception(f"Error retrieving support schedules: {e}")
+
+    def assign_supports(self, assignments: dict) -> int:
+        """Assign support users to events ({event_id: support_user_id}) in one transaction."""
+        if not assignments:
+            return 0
+        try:
+            # Un seul UPDATE exécuté en lot ; un événement affecté entre-temps est ignoré
+            statement = (
+                update(Event.__table__)
+                .where(Event.id == bindparam("event_id"), Event.support_user_id.is_(None))
+                .values(support_user_id=bindparam("assigned_support_id"))
+            )
+            result = self.session.execute(
+                statement,
+                [
+                    {"event_id": event_id, "assigned_support_id": support_user_id}
+                    for event_id, support_user_id in assignments.items()
+                ],
+            )
+            self.session.commit()
+            if self.session.get_bind().dialect.supports_sane_multi_rowcount:
+                return result.rowcount
+            return len(assignments)
+        except Exception as e:
+            self.session.rollback()
+            raise Exception(f"Error assigning events: {e}")
+
+    @staticmethod
+    def _in_window(query, date_from=None, date_to=None):
+        """Keep the events overlapping the [date_from, date_to] window."""
+        if date_from is not None:
+            query = query.filter(Event.end_date >= date_from)
+        if date_to is not None:
+            query = query.filter(Event.start_date <= date_to)
+        return query
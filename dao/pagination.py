@@ -0,0 +1,35 @@
+# Taille de page utilisée par les commandes `list` quand aucune n'est précisée
+DEFAULT_PAGE_SIZE = 50
+
+# Nombre de lignes lues par aller-retour quand les résultats sont diffusés
+STREAM_BATCH_SIZE = 1000
+
+
+def updated_since(query, updated_at_column, since=None):
+    """Keep only the rows written at or after `since` (incremental sync)."""
+    # Borne incluse : une ligne modifiée dans la même seconde que la dernière
+    # synchronisation est relue plutôt que perdue
+    if since is not None:
+        query = query.filter(updated_at_column >= since)
+    return query
+
+
+def keyset_paginate(query, id_column, page_size=None, after_id=None):
+    """Apply keyset pagination (WHERE id > after_id ORDER BY id LIMIT page_size)."""
+    # On filtre sur la clé primaire plutôt que d'utiliser OFFSET : le coût d'une
+    # page reste constant, quelle que soit sa position dans la table.
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    query = query.order_by(id_column)
+    if page_size is not None:
+        query = query.limit(page_size)
+    return query
+
+
+def fetch(query, stream=False, batch_size=STREAM_BATCH_SIZE):
+    """Return the rows of a query as a list, or lazily when streaming."""
+    if stream:
+        # yield_per active un curseur côté serveur (stream_results) : les lignes
+        # arrivent par lots et la mémoire reste constante.
+        return query.yield_per(batch_size)
+    return query.all()
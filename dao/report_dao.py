@@ -0,0 +1,130 @@
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from models.client import Client
+from models.contract import Contract
+from models.user import User
+
+
+def _amount(value):
+    """Round an aggregated amount for display (SUM over no row gives NULL)."""
+    return round(value or 0.0, 2)
+
+
+class ReportDAO:
+    """Aggregate queries over contracts: only the totals leave the database."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def revenue_by_commercial(self) -> list[dict]:
+        """Return, per commercial, the signed revenue, the amount collected and the balance."""
+        try:
+            # Sans contrat signé, SUM vaut NULL, que PostgreSQL placerait en tête du tri décroissant
+            signed_total = func.coalesce(func.sum(case((Contract.signed == True, Contract.total_amount))), 0)
+            signed_remaining = func.coalesce(
+                func.sum(case((Contract.signed == True, Contract.amount_remaining))), 0
+            )
+            # Agrégation d'abord, jointure ensuite : users n'est lu que pour les lignes du résultat
+            totals = (
+                select(
+                    Contract.commercial_id,
+                    func.count(case((Contract.signed == True, 1))).label("contracts"),
+                    signed_total.label("revenue"),
+                    (signed_total - signed_remaining).label("collected"),
+                    signed_remaining.label("outstanding"),
+                )
+                .group_by(Contract.commercial_id)
+                .subquery()
+            )
+            query = (
+                select(totals, User.name.label("commercial_name"))
+                .outerjoin(User, User.id == totals.c.commercial_id)
+                .order_by(totals.c.revenue.desc())
+            )
+            return [
+                {
+                    "commercial_id": row.commercial_id,
+                    "commercial_name": row.commercial_name or "Unassigned",
+                    "contracts": row.contracts,
+                    "revenue": _amount(row.revenue),
+                    "collected": _amount(row.collected),
+                    "outstanding": _amount(row.outstanding),
+                }
+                for row in self.session.execute(query)
+            ]
+        except Exception as e:
+            raise Exception(f"Error computing revenue report: {e}")
+
+    def receivables_by_client(self, limit=None) -> list[dict]:
+        """Return the outstanding balance of each client that still owes money, largest first."""
+        try:
+            # Le filtre reprend le prédicat de l'index partiel ix_contracts_unpaid_balance
+            totals = (
+                select(
+                    Contract.client_id,
+                    func.count().label("contracts"),
+                    func.sum(Contract.amount_remaining).label("outstanding"),
+                )
+                .where(Contract.amount_remaining > 0)
+                .group_by(Contract.client_id)
+                .order_by(func.sum(Contract.amount_remaining).desc())
+                .limit(limit)
+                .subquery()
+            )
+            query = (
+                select(totals, Client.full_name, Client.company_name)
+                .join(Client, Client.id == totals.c.client_id)
+                .order_by(totals.c.outstanding.desc())
+            )
+            return [
+                {
+                    "client_id": row.client_id,
+                    "full_name": row.full_name,
+                    "company_name": row.company_name,
+                    "contracts": row.contracts,
+                    "outstanding": _amount(row.outstanding),
+                }
+                for row in self.session.execute(query)
+            ]
+        except Exception as e:
+            raise Exception(f"Error computing receivables report: {e}")
+
+    def signed_summary(self) -> list[dict]:
+        """Return the contract count and amounts of signed and unsigned contracts."""
+        try:
+            # Pré-agrégation par (commercial, signé) dans l'ordre de
+            # ix_contracts_commercial_totals, puis regroupement des quelques lignes obtenues
+            per_commercial = (
+                select(
+                    Contract.signed,
+                    func.count().label("contracts"),
+                    func.sum(Contract.total_amount).label("total_amount"),
+                    func.sum(Contract.amount_remaining).label("amount_remaining"),
+                )
+                .group_by(Contract.commercial_id, Contract.signed)
+                .subquery()
+            )
+            # `signed` est nullable : un contrat sans valeur compte comme non signé
+            signed = func.coalesce(per_commercial.c.signed, False)
+            query = select(
+                signed.label("signed"),
+                func.sum(per_commercial.c.contracts).label("contracts"),
+                func.sum(per_commercial.c.total_amount).label("total_amount"),
+                func.sum(per_commercial.c.amount_remaining).label("amount_remaining"),
+            ).group_by(signed)
+            totals = {bool(row.signed): row for row in self.session.execute(query)}
+            report = []
+            # Les deux lignes sont toujours présentes, même sans contrat de l'une des sortes
+            for is_signed in (True, False):
+                row = totals.get(is_signed)
+                report.append(
+                    {
+                        "signed": is_signed,
+                        "contracts": row.contracts if row else 0,
+                        "total_amount": _amount(row.total_amount if row else None),
+                        "amount_remaining": _amount(row.amount_remaining if row else None),
+                    }
+                )
+            return report
+        except Exception as e:
+            raise Exception(f"Error computing signed contracts report: {e}")
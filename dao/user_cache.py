@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from config import USER_CACHE_SIZE, USER_CACHE_TTL
+
+
+class UserCache:
+    """LRU + TTL cache of user rows, looked up by id or by email.
+
+    Only column values are stored, never ORM instances, so the cache can be
+    shared between sessions (and threads) without attaching objects to the
+    wrong session.
+    """
+
+    def __init__(self, max_size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # {user_id: (colonnes, enregistré_à)}, du moins au plus récemment utilisé
+        self._entries = OrderedDict()
+        self._ids_by_email = {}
+        self._lock = threading.Lock()
+
+    def get_by_id(self, user_id):
+        """Return the cached column values of a user, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and self.clock() - entry[1] >= self.ttl:
+                self._remove(user_id)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def get_by_email(self, email):
+        """Return the cached column values of the user with this email, or None."""
+        user_id = self._ids_by_email.get(email)
+        if user_id is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        return self.get_by_id(user_id)
+
+    def put(self, values):
+        """Store the column values of a user, evicting the least recently used one if full."""
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._remove(values["id"])
+            self._entries[values["id"]] = (values, self.clock())
+            self._ids_by_email[values["email"]] = values["id"]
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, user_id):
+        """Forget a user after it was modified or deleted."""
+        with self._lock:
+            self._remove(user_id)
+
+    def clear(self):
+        """Forget every user and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._ids_by_email.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters and the current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _remove(self, user_id):
+        entry = self._entries.pop(user_id, None)
+        if entry is not None and self._ids_by_email.get(entry[0]["email"]) == user_id:
+            del self._ids_by_email[entry[0]["email"]]
+
+
+# Cache partagé par les commandes d'un même processus (mode `shell` notamment)
+_shared_cache = None
+
+
+def shared_user_cache():
+    """Return the process-wide user cache configured in config.py."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = UserCache()
+    return _shared_cache
@@ -1,18 +1,47 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, or_
+from sqlalchemy.orm import Session, make_transient_to_detached
 from sqlalchemy.exc import IntegrityError
 from models.user import User
-from utils.security import hash_password, verify_password
+from dao.pagination import fetch, keyset_paginate, updated_since
+from dao.user_cache import UserCache
+from utils.security import check_password, hash_password
 
 
 class UserDAO:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, cache: UserCache = None):
         # Initialisation du DAO avec une session SQLAlchemy, permettant l'interaction avec la base de données.
         self.session = session
+        # Cache optionnel des lectures par ID et par email
+        self.cache = cache
+
+    def _from_cache(self, values) -> User:
+        """Attach a user rebuilt from cached column values to the session, without a SELECT."""
+        user = User(**values)
+        make_transient_to_detached(user)
+        return self.session.merge(user, load=False)
+
+    def _cache_user(self, user):
+        if self.cache is not None and user is not None:
+            self.cache.put({column.key: getattr(user, column.key) for column in User.__table__.columns})
+
+    def _invalidate(self, user_id):
+        if self.cache is not None:
+            self.cache.invalidate(int(user_id))
+
+    @staticmethod
+    def _forget_token_version(user_id):
+        # Les tokens révoqués sont refusés tout de suite, sans attendre TOKEN_VERSION_CACHE_TTL
+        from utils.auth import forget_token_version
+
+        forget_token_version(user_id)
 
     def create_user(self, employee_number, name, email, password, role):
         """Create a new user with a hashed password."""
         # Hashage du mot de passe avant d'ajouter l'utilisateur à la base de données pour la sécurité
-        password_hash = hash_password(password)
+        return self._insert_user(employee_number, name, email, hash_password(password), role)
+
+    def _insert_user(self, employee_number, name, email, password_hash, role):
+        # Sans hachage : AsyncUserDAO hache le mot de passe hors de la boucle d'événements
         user = User(
             employee_number=employee_number,
             name=name,
@@ -34,11 +63,83 @@ class UserDAO:
             self.session.rollback()
             raise Exception(f"Error creating user: {e}")
 
+    def bulk_create_users(self, rows: list[dict], hash_passwords=None):
+        """Insert a batch of user dicts with plain passwords; return (inserted, rejected).
+
+        `hash_passwords` maps a list of passwords to their hashes (for example
+        over a process pool); by default they are hashed one after the other.
+        """
+        if not rows:
+            return 0, []
+        try:
+            # Les conflits avec la base sont écartés avant le hachage, qui est la partie coûteuse
+            existing_emails, existing_numbers = set(), set()
+            for email, employee_number in self.session.query(User.email, User.employee_number).filter(
+                or_(
+                    User.email.in_([row["email"] for row in rows]),
+                    User.employee_number.in_([row["employee_number"] for row in rows]),
+                )
+            ):
+                existing_emails.add(email)
+                existing_numbers.add(employee_number)
+            rejected, accepted = [], []
+            for row in rows:
+                if row["email"] in existing_emails:
+                    rejected.append((row, "Email already exists"))
+                elif row["employee_number"] in existing_numbers:
+                    rejected.append((row, "Employee number already exists"))
+                else:
+                    accepted.append(row)
+            if not accepted:
+                return 0, rejected
+
+            passwords = [row["password"] for row in accepted]
+            hashes = hash_passwords(passwords) if hash_passwords else [hash_password(p) for p in passwords]
+            values = [
+                {
+                    "employee_number": row["employee_number"],
+                    "name": row["name"],
+                    "email": row["email"],
+                    "password_hash": password_hash,
+                    "role": row["role"],
+                }
+                for row, password_hash in zip(accepted, hashes)
+            ]
+
+            try:
+                self.session.execute(insert(User), values)
+                self.session.commit()
+                return len(values), rejected
+            except IntegrityError:
+                # Conflit inattendu (insertion concurrente) : on rejoue le lot ligne
+                # par ligne dans des savepoints pour n'écarter que les lignes fautives
+                self.session.rollback()
+
+            inserted = 0
+            for row, value in zip(accepted, values):
+                try:
+                    with self.session.begin_nested():
+                        self.session.execute(insert(User), [value])
+                    inserted += 1
+                except IntegrityError as e:
+                    rejected.append((row, f"Integrity error: {e.orig}"))
+            self.session.commit()
+            return inserted, rejected
+        except Exception as e:
+            self.session.rollback()
+            raise Exception(f"Error importing users: {e}")
+
     def get_user_by_email(self, email) -> User:
         """Retrieve a user by their email."""
         try:
+            if self.cache is not None:
+                values = self.cache.get_by_email(email)
+                if values is not None:
+                    return self._from_cache(values)
             # Recherche de l'utilisateur par son email
-            return self.session.query(User).filter(User.email == email).first()
+            user = self.session.query(User).filter(User.email == email).first()
+            self._cache_user(user)
+            return user
         except Exception as e:
             # Gestion des erreurs pendant la recherche de l'utilisateur
             raise Exception(f"Error retrieving user by email: {e}")
@@ -46,25 +147,67 @@ class UserDAO:
     def get_user_by_id(self, id) -> User:
         """Retrieve a user by their id."""
         try:
+            if self.cache is not None:
+                values = self.cache.get_by_id(int(id))
+                if values is not None:
+                    return self._from_cache(values)
             # Recherche de l'utilisateur par son ID
-            return self.session.query(User).filter(User.id == id).first()
+            user = self.session.query(User).filter(User.id == id).first()
+            self._cache_user(user)
+            return user
         except Exception as e:
             # Gestion des erreurs pendant la recherche de l'utilisateur
             raise Exception(f"Error retrieving user by id: {e}")
 
+    def get_users_by_role(self, role) -> list[User]:
+        """Retrieve every user holding a role, ordered by ID."""
+        try:
+            return self.session.query(User).filter(User.role == role).order_by(User.id).all()
+        except Exception as e:
+            raise Exception(f"Error retrieving users by role: {e}")
+
+    def get_token_version(self, user_id) -> int | None:
+        """Return the token version of a user, or None if the user does not exist."""
+        try:
+            # Lecture d'une seule colonne par clé primaire : l'aller-retour le moins coûteux
+            return (
+                self.session.query(User.token_version).filter(User.id == user_id).scalar()
+            )
+        except Exception as e:
+            raise Exception(f"Error retrieving token version: {e}")
+
     def authenticate_user(self, email, password) -> User:
         """Authenticate a user by verifying their password."""
         try:
-            # Récupère l'utilisateur par son email
-            user = self.get_user_by_email(email)
-            if user and verify_password(user.password_hash, password):
-                # Vérifie si le mot de passe fourni correspond au mot de passe hashé
-                return user
-            return None  # Retourne None si l'utilisateur n'existe pas ou si le mot de passe est incorrect
+            user = self._user_for_login(email)
+            if user is None:
+                return None  # Retourne None si l'utilisateur n'existe pas
+            # Vérifie si le mot de passe fourni correspond au mot de passe hashé
+            valid, new_hash = check_password(user.password_hash, password)
+            if not valid:
+                return None  # Retourne None si le mot de passe est incorrect
+            if new_hash:
+                self._save_rehash(user, new_hash)
+            return user
         except Exception as e:
             # Gestion des erreurs d'authentification
             raise Exception(f"Error authenticating user: {e}")
 
+    def _user_for_login(self, email):
+        # Lecture directe en base : un hash en cache pourrait être périmé
+        return self.session.query(User).filter(User.email == email).first()
+
+    def _save_rehash(self, user, password_hash):
+        """Store a password re-hashed with the configured Argon2 parameters after a successful login."""
+        try:
+            # Le mot de passe ne change pas : token_version n'est pas incrémenté
+            user.password_hash = password_hash
+            self.session.commit()
+            self._invalidate(user.id)
+        except Exception:
+            # Une mise à niveau ratée ne doit pas empêcher la connexion
+            self.session.rollback()
+
     def update_user(
         self,
         user_id,
@@ -74,6 +217,12 @@ class UserDAO:
         role=None,  # Mise à jour du rôle de l'utilisateur, si nécessaire
     ):
         """Update an existing user's information."""
+        # Hashage du nouveau mot de passe, s'il est fourni
+        password_hash = hash_password(password) if password is not None else None
+        return self._update_user(user_id, name, email, password_hash, role)
+
+    def _update_user(self, user_id, name, email, password_hash, role):
+        # Sans hachage : AsyncUserDAO hache le mot de passe hors de la boucle d'événements
         try:
             # Recherche de l'utilisateur par son ID
             user = self.session.query(User).filter(User.id == user_id).first()
@@ -81,17 +230,25 @@ class UserDAO:
                 # Si l'utilisateur n'existe pas, une exception est levée
                 raise Exception("User not found")
 
+            role_changed = role is not None and role != user.role
+
             # Mise à jour des informations de l'utilisateur uniquement si de nouvelles valeurs sont fournies
             if name is not None:
                 user.name = name
             if email is not None:
                 user.email = email
-            if password is not None:
-                user.password_hash = hash_password(password)  # Hashage du nouveau mot de passe
+            if password_hash is not None:
+                user.password_hash = password_hash
             if role is not None:
                 user.role = role
+            if password_hash is not None or role_changed:
+                # Les tokens émis avec l'ancien rôle ou l'ancien mot de passe sont révoqués
+                user.token_version = (user.token_version or 0) + 1
 
             self.session.commit()  # Validation des changements dans la base de données
+            self._invalidate(user_id)
+            if password_hash is not None or role_changed:
+                self._forget_token_version(user_id)
             return user  # Retourne l'utilisateur mis à jour
         except IntegrityError as e:
             # Si une erreur d'intégrité se produit, la transaction est annulée
@@ -103,27 +260,31 @@ class UserDAO:
             raise Exception(f"Error updating user: {e}")
 
     def delete_user(self, user_id):
-        """Delete a user by their ID."""
+        """Delete a user by their ID in one DELETE ... RETURNING."""
         try:
-            # Recherche de l'utilisateur par son ID
-            user = self.session.query(User).filter(User.id == user_id).first()
-            if not user:
+            # Suppression directe, le nombre de lignes supprimées indique si l'utilisateur existait
+            deleted = self.session.execute(
+                delete(User).where(User.id == user_id).returning(User.id)
+            ).first()
+            if deleted is None:
                 # Si l'utilisateur n'existe pas, une exception est levée
                 raise Exception("User not found")
-
-            # Suppression de l'utilisateur de la base de données
-            self.session.delete(user)
             self.session.commit()  # Validation de la suppression
+            self._invalidate(user_id)
+            self._forget_token_version(user_id)
         except Exception as e:
             # Gestion des erreurs pendant la suppression de l'utilisateur
             self.session.rollback()
             raise Exception(f"Error deleting user: {e}")
 
-    def get_all_users(self) -> list[User]:
-        """Retrieve all users."""
+    def get_all_users(self, page_size=None, after_id=None, stream=False, since=None) -> list[User]:
+        """Retrieve users, one keyset page at a time when page_size is given."""
         try:
-            # Récupère tous les utilisateurs présents dans la base de données
-            return self.session.query(User).all()
+            # Récupère les utilisateurs triés par ID, à partir du curseur `after_id`
+            query = self.session.query(User)
+            query = updated_since(query, User.updated_at, since)
+            query = keyset_paginate(query, User.id, page_size, after_id)
+            return fetch(query, stream)
         except Exception as e:
             # Gestion des erreurs pendant la récupération de tous les utilisateurs
             raise Exception(f"Error retrieving all users: {e}")
@@ -10,16 +10,130 @@
 #                                                                              #
 # **************************************************************************** #
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
-from models.base import Base
+from config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_SQLITE_POOL_CLASS,
+)
 
-# Create an SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+# Le moteur et la fabrique de sessions sont créés à la première utilisation :
+# `cli.py --help` n'importe pas SQLAlchemy et n'ouvre aucune connexion.
+_engine = None
+_session_factory = None
+_pool_metrics = None
+_async_engine = None
+_async_session_factory = None
 
-# Create a configured "Session" class
-Session = sessionmaker(bind=engine)
+SQLITE_POOL_CLASSES = ("QueuePool", "NullPool", "StaticPool", "SingletonThreadPool")
 
-# Create a session
-session = Session()
+# Pilote asyncio utilisé pour chaque base quand ASYNC_DATABASE_URL n'est pas défini
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def engine_options(url=DATABASE_URL, sqlite_pool_class=DB_SQLITE_POOL_CLASS, asyncio=False) -> dict:
+    """Build the create_engine() pool arguments for `url` from config.py."""
+    from sqlalchemy import pool
+    from sqlalchemy.engine import make_url
+    from utils.pool_metrics import TimedQueuePool
+
+    url = make_url(url)
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    if url.get_backend_name() == "sqlite":
+        if sqlite_pool_class is None:
+            # Choix de SQLAlchemy : QueuePool pour un fichier, un pool par thread en mémoire
+            in_memory = url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+            if in_memory:
+                return options
+        elif sqlite_pool_class not in SQLITE_POOL_CLASSES:
+            raise ValueError(
+                f"Unknown SQLite pool class '{sqlite_pool_class}' "
+                f"(use {', '.join(SQLITE_POOL_CLASSES)})"
+            )
+        elif sqlite_pool_class != "QueuePool":
+            options["poolclass"] = getattr(pool, sqlite_pool_class)
+            return options
+
+    # Même comportement que QueuePool, avec la mesure du temps d'attente au checkout
+    options.update(
+        poolclass=pool.AsyncAdaptedQueuePool if asyncio else TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def get_engine():
+    """Return the SQLAlchemy engine, creating it on first use."""
+    global _engine, _pool_metrics
+    if _engine is None:
+        from sqlalchemy import create_engine
+        from utils.pool_metrics import PoolMetrics
+
+        _engine = create_engine(DATABASE_URL, **engine_options())
+        _pool_metrics = PoolMetrics().attach(_engine)
+    return _engine
+
+
+def pool_stats():
+    """Return the pool counters of this process, or None before the first connection."""
+    if _engine is None:
+        return None
+    return _pool_metrics.snapshot(_engine.pool)
+
+
+def Session():
+    """Create a new session bound to the shared engine."""
+    global _session_factory
+    if _session_factory is None:
+        from sqlalchemy.orm import sessionmaker
+
+        # Create a configured "Session" class
+        _session_factory = sessionmaker(bind=get_engine())
+    return _session_factory()
+
+
+def async_database_url(url=DATABASE_URL) -> str:
+    """Return `url` with the asyncio driver of its database (aiosqlite, asyncpg)."""
+    from sqlalchemy.engine import make_url
+
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for '{backend}' (set ASYNC_DATABASE_URL)")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    """Return the asyncio engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = ASYNC_DATABASE_URL or async_database_url()
+        _async_engine = create_async_engine(url, **engine_options(url, asyncio=True))
+    return _async_engine
+
+
+def AsyncSession():
+    """Create a new AsyncSession bound to the shared asyncio engine."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # Les objets restent lisibles après commit : un rechargement implicite
+        # hors de la boucle d'événements lèverait MissingGreenlet
+        _async_session_factory = async_sessionmaker(bind=get_async_engine(), expire_on_commit=False)
+    return _async_session_factory()
+
+
+def __getattr__(name):
+    # Compatibilité : `database.engine` reste accessible, créé à la demande
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
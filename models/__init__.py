@@ -0,0 +1,7 @@
+# Importer tous les modèles ici permet à SQLAlchemy de résoudre les relations
+# déclarées par nom ("Contract", "User"...) quel que soit le module importé en premier.
+from models.user import User
+from models.client import Client
+from models.contract import Contract
+from models.event import Event
+from models import client_search  # Index de recherche créés avec la table clients
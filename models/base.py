@@ -10,6 +10,21 @@
 #                                                                              #
 # **************************************************************************** #
 
+from sqlalchemy import Column, DateTime, func
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+
+def updated_at_column():
+    """Return an indexed timestamp set on insert and refreshed on every update."""
+    # default/onupdate couvrent l'ORM et les insert()/update() Core des DAO,
+    # server_default les écritures qui ne passent pas par SQLAlchemy (COPY)
+    return Column(
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        onupdate=func.now(),
+        server_default=func.now(),
+        index=True,
+    )
@@ -12,7 +12,7 @@
 
 from sqlalchemy import Column, Integer, String, Date, ForeignKey
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, updated_at_column
 
 
 class Client(Base):
@@ -26,7 +26,10 @@ class Client(Base):
     creation_date = Column(Date)
     last_contact_date = Column(Date)
     # commercial_contact = Column(String)#relier a un user commercant relationship
-    commercial_contact = Column(Integer, ForeignKey("users.id"), nullable=True)
+    commercial_contact = Column(
+        Integer, ForeignKey("users.id"), nullable=True, index=True
+    )
+    updated_at = updated_at_column()
     # Relationships
     contracts = relationship("Contract", back_populates="client")
     commercial = relationship("User")
@@ -0,0 +1,57 @@
+from sqlalchemy import DDL, event
+from .client import Client
+
+# Texte indexé pour `client search` ; toutes les fonctions sont IMMUTABLE, ce qui
+# permet à PostgreSQL d'en faire un index d'expression
+SEARCH_EXPRESSION = "(full_name || ' ' || coalesce(company_name, '') || ' ' || email)"
+
+# Table FTS5 « external content » : elle ne stocke que l'index trigramme, le texte
+# reste dans `clients` (rowid = clients.id)
+SQLITE_SEARCH_TABLE = "clients_search"
+POSTGRESQL_SEARCH_INDEX = "ix_clients_search_trgm"
+
+SQLITE_SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE {SQLITE_SEARCH_TABLE} USING fts5("
+    "full_name, company_name, email, "
+    "content='clients', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER clients_search_ai AFTER INSERT ON clients BEGIN "
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, full_name, company_name, email) "
+    "VALUES (new.id, new.full_name, new.company_name, new.email); END",
+    f"CREATE TRIGGER clients_search_ad AFTER DELETE ON clients BEGIN "
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, full_name, company_name, email) "
+    "VALUES ('delete', old.id, old.full_name, old.company_name, old.email); END",
+    # Seules les colonnes indexées déclenchent la mise à jour (pas updated_at)
+    f"CREATE TRIGGER clients_search_au AFTER UPDATE OF full_name, company_name, email "
+    f"ON clients BEGIN "
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, full_name, company_name, email) "
+    "VALUES ('delete', old.id, old.full_name, old.company_name, old.email); "
+    f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, full_name, company_name, email) "
+    "VALUES (new.id, new.full_name, new.company_name, new.email); END",
+]
+
+POSTGRESQL_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX {POSTGRESQL_SEARCH_INDEX} ON clients USING gin ({SEARCH_EXPRESSION} gin_trgm_ops)",
+]
+
+# Les mêmes objets sont créés par la migration ; ces événements couvrent create_all()
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Client.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(Client.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    Client.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}").execute_if(dialect="sqlite"),
+)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Hide the search objects, absent from Base.metadata, from alembic autogenerate."""
+    # La table FTS5 et ses tables internes (clients_search_data, _idx, ...) ainsi que
+    # l'index trigramme sont créés par ces événements et par la migration a9d4f1c7e250
+    if type_ == "table" and name.startswith(SQLITE_SEARCH_TABLE):
+        return False
+    if type_ == "index" and name == POSTGRESQL_SEARCH_INDEX:
+        return False
+    return True
@@ -10,22 +10,50 @@
 #                                                                              #
 # **************************************************************************** #
 
-from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey, Date
+from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey, Date, Index, text
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, updated_at_column
 
 
 class Contract(Base):
     __tablename__ = "contracts"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
-    commercial_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True)
+    commercial_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     total_amount = Column(Float, nullable=False)
     amount_remaining = Column(Float, nullable=False)
     creation_date = Column(Date)
     signed = Column(Boolean, default=False)
+    updated_at = updated_at_column()
 
     client = relationship("Client", back_populates="contracts")
     commercial = relationship("User")  # Relation avec User (Commercial)
     events = relationship("Event", back_populates="contract")
+
+    # Index partiels pour les filtres `--unsigned` et `--unpaid` de `contract list`
+    __table_args__ = (
+        Index(
+            "ix_contracts_unsigned_client_id",
+            "client_id",
+            postgresql_where=text("signed = false"),
+            sqlite_where=text("signed = 0"),
+        ),
+        # Le montant dans la clé rend l'index couvrant pour `report receivables`
+        Index(
+            "ix_contracts_unpaid_balance",
+            "client_id",
+            "amount_remaining",
+            postgresql_where=text("amount_remaining > 0"),
+            sqlite_where=text("amount_remaining > 0"),
+        ),
+        # Index couvrant des rapports `revenue` et `signed` : parcours de l'index seul,
+        # déjà dans l'ordre du GROUP BY, sans lire la table
+        Index(
+            "ix_contracts_commercial_totals",
+            "commercial_id",
+            "signed",
+            "total_amount",
+            "amount_remaining",
+        ),
+    )
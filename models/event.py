@@ -10,22 +10,38 @@
 #                                                                              #
 # **************************************************************************** #
 
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, updated_at_column
 
 
 class Event(Base):
     __tablename__ = "events"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
+    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False, index=True)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
-    support_contact = Column(String, nullable=True)  # Peut être null
+    support_contact = Column(String, nullable=True)  # Ancienne colonne texte, remplacée par support_user_id
+    support_user_id = Column(
+        Integer, ForeignKey("users.id"), nullable=True
+    )  # Peut être null tant qu'aucun support n'est assigné
     location = Column(String, nullable=True)
     attendees = Column(Integer, nullable=True, default=0)
     notes = Column(String, nullable=True)  # Peut être null
+    updated_at = updated_at_column()
 
     # Relations
     contract = relationship("Contract", back_populates="events")
+    support_user = relationship("User")  # Relation avec User (Support)
+
+    # Planning des supports : sert le filtre par support et, couvrant les deux
+    # dates, la détection des chevauchements dans l'ordre (support, début)
+    __table_args__ = (
+        Index(
+            "ix_events_support_user_schedule",
+            "support_user_id",
+            "start_date",
+            "end_date",
+        ),
+    )
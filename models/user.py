@@ -12,7 +12,7 @@
 
 from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, updated_at_column
 
 
 class User(Base):
@@ -24,6 +24,9 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(String, nullable=False)  # New column for role
+    # Incrémentée à chaque changement de rôle ou de mot de passe : révoque les tokens émis
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = updated_at_column()
 
     def __repr__(self):
         return f"<User(name={self.name}, email={self.email}, role={self.role})>"
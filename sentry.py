@@ -10,18 +10,55 @@
 #                                                                              #
 # **************************************************************************** #
 
-import sentry_sdk
-from config import SENTRY_DSN
-
-
-def call_sentry():
-    sentry_sdk.init(
-        dsn=SENTRY_DSN,
-        # Set traces_sample_rate to 1.0 to capture 100%
-        # of transactions for performance monitoring.
-        traces_sample_rate=1.0,
-        # Set profiles_sample_rate to 1.0 to profile 100%
-        # of sampled transactions.
-        # We recommend adjusting this value in production.
-        profiles_sample_rate=1.0,
-    )
+import threading
+from config import (
+    SENTRY_DSN,
+    SENTRY_ENABLED,
+    SENTRY_PROFILES_SAMPLE_RATE,
+    SENTRY_SHUTDOWN_TIMEOUT,
+    SENTRY_TRACES_SAMPLE_RATE,
+)
+
+# Thread d'initialisation lancé par call_sentry(), une seule fois par processus
+_init_thread = None
+
+
+def sentry_options(**overrides):
+    """Build the sentry_sdk.init() keyword arguments from config.py."""
+    options = {
+        "dsn": SENTRY_DSN,
+        "traces_sample_rate": SENTRY_TRACES_SAMPLE_RATE,
+        "profiles_sample_rate": SENTRY_PROFILES_SAMPLE_RATE,
+        "shutdown_timeout": SENTRY_SHUTDOWN_TIMEOUT,
+    }
+    options.update(overrides)
+    return options
+
+
+def _init_sentry(options):
+    import sentry_sdk
+
+    sentry_sdk.init(**options)
+
+
+def call_sentry(enabled=SENTRY_ENABLED, background=True, **overrides):
+    """Initialize Sentry, in a background thread by default.
+
+    Returns the initialization thread (or None when Sentry is disabled or
+    initialized inline), so callers can join it when they need to.
+    """
+    global _init_thread
+    options = sentry_options(**overrides)
+    if not enabled or not options["dsn"]:
+        return None
+    if not background:
+        _init_sentry(options)
+        return None
+    if _init_thread is None:
+        # L'import de sentry_sdk et la configuration des intégrations ne
+        # retardent plus le démarrage de la commande
+        _init_thread = threading.Thread(
+            target=_init_sentry, args=(options,), name="sentry-init", daemon=True
+        )
+        _init_thread.start()
+    return _init_thread
@@ -0,0 +1,359 @@
+import json
+import logging
+import re
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from config import API_HOST, API_PORT
+from dao.pagination import DEFAULT_PAGE_SIZE
+from utils.auth import AuthError, authorize
+from utils.output import (
+    CLIENT_COLUMNS,
+    CONTRACT_COLUMNS,
+    EVENT_COLUMNS,
+    RECEIVABLE_COLUMNS,
+    REVENUE_COLUMNS,
+    SIGNED_COLUMNS,
+    USER_COLUMNS,
+    client_row,
+    contract_row,
+    event_row,
+    plain_row,
+    user_row,
+)
+
+# Plus grande page servie : une requête HTTP ne diffuse pas de curseur, la page est en mémoire
+MAX_PAGE_SIZE = 1000
+
+# Taille maximale acceptée pour un corps de requête JSON (POST /login)
+MAX_BODY_SIZE = 64 * 1024
+
+# Routes : (méthode, motif compilé, fonction, rôles, lecture seule, authentification)
+ROUTES = []
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """Error returned to the HTTP client as {"error": message} with `status`."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    """What a route handler sees of an HTTP request."""
+
+    def __init__(self, params, path_args, body, user_id=None, role=None):
+        self.params = params
+        self.path_args = path_args
+        self.body = body
+        self.user_id = user_id
+        self.role = role
+
+    def param(self, name, default=None):
+        values = self.params.get(name)
+        return values[-1] if values else default
+
+    def int_param(self, name, default=None, minimum=None, maximum=None):
+        value = self.param(name)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            raise HTTPError(400, f"'{name}' must be an integer")
+        if minimum is not None and value < minimum:
+            raise HTTPError(400, f"'{name}' must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            raise HTTPError(400, f"'{name}' must be at most {maximum}")
+        return value
+
+    def bool_param(self, name):
+        return (self.param(name) or "").lower() in ("1", "true", "yes", "on")
+
+    def datetime_param(self, name):
+        value = self.param(name)
+        if value is None:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise HTTPError(400, f"'{name}' must be an ISO 8601 timestamp")
+
+    def page(self):
+        """Return the keyset pagination arguments of a list endpoint."""
+        return {
+            "page_size": self.int_param("page_size", DEFAULT_PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE),
+            "after_id": self.int_param("after_id"),
+            "since": self.datetime_param("since"),
+        }
+
+
+def route(method, pattern, roles=None, read_only=False, public=False):
+    """Register a handler; the rules are those of `auth_required` on the CLI command."""
+
+    def decorator(handler):
+        ROUTES.append((method, re.compile(f"^{pattern}$"), handler, roles, read_only, public))
+        return handler
+
+    return decorator
+
+
+def _session():
+    from database import Session
+
+    return Session()
+
+
+def _page_body(rows, columns, page_size):
+    """Build the body of a list endpoint, with the cursor of the next page."""
+    items = [plain_row(row, columns) for row in rows]
+    full = len(items) == page_size
+    return {"items": items, "next_after_id": items[-1]["id"] if full else None}
+
+
+@route("GET", "/health", public=True)
+def health(request):
+    return {"status": "ok"}
+
+
+@route("POST", "/login", public=True)
+def login(request):
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+    from utils.jwt_utils import generate_jwt
+
+    email, password = request.body.get("email"), request.body.get("password")
+    if not email or not password:
+        raise HTTPError(400, "'email' and 'password' are required")
+    session = _session()
+    try:
+        user = UserDAO(session, cache=shared_user_cache()).authenticate_user(email, password)
+        if not user:
+            raise HTTPError(401, "Invalid credentials")
+        return {"token": generate_jwt(user.id, user.role, user.token_version)}
+    finally:
+        session.close()
+
+
+@route("GET", "/clients", read_only=True)
+def list_clients(request):
+    from dao.client_dao import ClientDAO
+
+    page = request.page()
+    session = _session()
+    try:
+        clients = ClientDAO(session).get_all_clients(**page, with_related=True)
+        return _page_body((client_row(c) for c in clients), CLIENT_COLUMNS, page["page_size"])
+    finally:
+        session.close()
+
+
+@route("GET", "/clients/search", read_only=True)
+def search_clients(request):
+    from dao.client_dao import DEFAULT_SEARCH_LIMIT, MIN_SEARCH_LENGTH, ClientDAO
+
+    text = (request.param("q") or "").strip()
+    if len(text) < MIN_SEARCH_LENGTH:
+        raise HTTPError(400, f"Search text must be at least {MIN_SEARCH_LENGTH} characters")
+    limit = request.int_param("limit", DEFAULT_SEARCH_LIMIT, minimum=1, maximum=MAX_PAGE_SIZE)
+    session = _session()
+    try:
+        clients = ClientDAO(session).search_clients(text, limit=limit, with_related=True)
+        return {"items": [plain_row(client_row(c), CLIENT_COLUMNS) for c in clients]}
+    finally:
+        session.close()
+
+
+@route("GET", r"/clients/(\d+)", read_only=True)
+def get_client(request):
+    from dao.client_dao import ClientDAO
+
+    session = _session()
+    try:
+        client = ClientDAO(session).get_client_by_id(int(request.path_args[0]))
+        if client is None:
+            raise HTTPError(404, "Client not found")
+        return plain_row(client_row(client), CLIENT_COLUMNS)
+    finally:
+        session.close()
+
+
+@route("GET", "/contracts", roles=["MANAGEMENT", "SALES"])
+def list_contracts(request):
+    from dao.contract_dao import ContractDAO
+
+    page = dict(request.page(), with_related=True)
+    session = _session()
+    try:
+        contract_dao = ContractDAO(session)
+        # Mêmes filtres que `contract list --unsigned / --unpaid`
+        if request.bool_param("unsigned"):
+            contracts = contract_dao.get_unsigned_contracts(request.user_id, **page)
+        elif request.bool_param("unpaid"):
+            contracts = contract_dao.get_unpaid_contracts(request.user_id, **page)
+        else:
+            contracts = contract_dao.get_all_contracts(**page)
+        return _page_body((contract_row(c) for c in contracts), CONTRACT_COLUMNS, page["page_size"])
+    finally:
+        session.close()
+
+
+@route("GET", "/events", roles=["MANAGEMENT", "SUPPORT"])
+def list_events(request):
+    from dao.event_dao import EventDAO
+
+    page = dict(request.page(), with_related=True)
+    session = _session()
+    try:
+        event_dao = EventDAO(session)
+        if request.role == "SUPPORT":
+            events = event_dao.get_events_for_support(request.user_id, **page)
+        else:
+            events = event_dao.get_all_events(**page)
+        return _page_body((event_row(e) for e in events), EVENT_COLUMNS, page["page_size"])
+    finally:
+        session.close()
+
+
+@route("GET", "/collaborators", roles=["MANAGEMENT"])
+def list_collaborators(request):
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+
+    page = request.page()
+    session = _session()
+    try:
+        users = UserDAO(session, cache=shared_user_cache()).get_all_users(**page)
+        return _page_body((user_row(u) for u in users), USER_COLUMNS, page["page_size"])
+    finally:
+        session.close()
+
+
+@route("GET", "/reports/(revenue|receivables|signed)", roles=["MANAGEMENT"])
+def get_report(request):
+    from dao.report_dao import ReportDAO
+
+    name = request.path_args[0]
+    session = _session()
+    try:
+        report_dao = ReportDAO(session)
+        if name == "revenue":
+            rows, columns = report_dao.revenue_by_commercial(), REVENUE_COLUMNS
+        elif name == "receivables":
+            limit = request.int_param("limit", DEFAULT_PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE)
+            rows, columns = report_dao.receivables_by_client(limit=limit), RECEIVABLE_COLUMNS
+        else:
+            rows, columns = report_dao.signed_summary(), SIGNED_COLUMNS
+        return {"items": [plain_row(row, columns) for row in rows]}
+    finally:
+        session.close()
+
+
+@route("GET", "/pool-stats", roles=["MANAGEMENT"])
+def pool_stats(request):
+    import database
+
+    return database.pool_stats() or {}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """JSON API over the DAOs; HTTP/1.1 keeps client connections open between requests."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "EpicEventsCRM"
+    quiet = True
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        try:
+            status, body = 200, self._handle(method)
+        except HTTPError as e:
+            status, body = e.status, {"error": str(e)}
+        except AuthError as e:
+            status, body = e.status, {"error": str(e)}
+        except Exception:
+            # Le détail (messages des DAO, erreurs SQL du pilote) reste dans les logs
+            logger.exception("Error handling %s %s", method, self.path)
+            status, body = 500, {"error": "Internal server error"}
+        self._send_json(status, body)
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        # Le corps est toujours lu : sinon il resterait sur la connexion keep-alive
+        # et serait pris pour le début de la requête suivante
+        body = self._read_body()
+        allowed = False
+        for route_method, pattern, handler, roles, read_only, public in ROUTES:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            request = Request(parse_qs(url.query), match.groups(), body)
+            if not public:
+                request.user_id, request.role = authorize(self._bearer_token(), roles, read_only)
+            return handler(request)
+        if allowed:
+            raise HTTPError(405, "Method not allowed")
+        raise HTTPError(404, "Not found")
+
+    def _bearer_token(self):
+        scheme, _, token = (self.headers.get("Authorization") or "").partition(" ")
+        return token.strip() if scheme.lower() == "bearer" else None
+
+    def _read_body(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Sans longueur valide, la fin du corps sur la connexion est inconnue
+            self.close_connection = True
+            raise HTTPError(400, "Invalid Content-Length header")
+        if length == 0:
+            return {}
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            raise HTTPError(413, "Request body too large")
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise HTTPError(400, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return body
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 401:
+            self.send_header("WWW-Authenticate", "Bearer")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host=API_HOST, port=API_PORT, quiet=True):
+    """Create the threaded HTTP server; the engine and its pool are shared by all threads."""
+    from database import get_engine
+
+    # Le pool est créé avant la première requête plutôt que pendant celle-ci
+    get_engine()
+    handler = type("ConfiguredApiHandler", (ApiHandler,), {"quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
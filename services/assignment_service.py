@@ -0,0 +1,51 @@
+from utils.scheduling import assign_intervals
+
+
+def auto_assign(session, date_from=None, date_to=None, dry_run=False):
+    """Assign the unstaffed events of a window to SUPPORT users, balancing their load.
+
+    Returns a dict with the per-support summary rows, the number of events
+    assigned and the IDs of the events no support user was free for.
+    """
+    from dao.event_dao import EventDAO
+    from dao.user_dao import UserDAO
+
+    event_dao = EventDAO(session)
+    supports = UserDAO(session).get_users_by_role("SUPPORT")
+    events = event_dao.get_unassigned_events(date_from, date_to)
+    if not supports or not events:
+        return {"supports": [], "assigned": 0, "unassigned": [event.id for event in events]}
+
+    # Lus avant le commit de assign_supports, qui expire les objets de la session
+    support_ids = [support.id for support in supports]
+    names = {support.id: support.name for support in supports}
+    # Les événements déjà affectés comptent dans la charge et ne sont jamais chevauchés ; ils sont
+    # lus sur la durée réelle des événements à pourvoir, qui peuvent déborder de la fenêtre
+    schedules = event_dao.get_support_schedules(
+        support_ids,
+        min(event.start_date for event in events),
+        max(event.end_date for event in events),
+    )
+    assignments, unassigned = assign_intervals(
+        ((event.start_date, event.end_date, event.id) for event in events),
+        support_ids,
+        schedules,
+    )
+
+    assigned = len(assignments) if dry_run else event_dao.assign_supports(assignments)
+    counts = dict.fromkeys(support_ids, 0)
+    for support_user_id in assignments.values():
+        counts[support_user_id] += 1
+    return {
+        "supports": [
+            {
+                "support_user_id": support_id,
+                "name": names[support_id],
+                "already_booked": len(schedules[support_id]),
+                "assigned": counts[support_id],
+            }
+            for support_id in support_ids
+        ],
+        "assigned": assigned,
+        "unassigned": unassigned,
+    }
@@ -1,12 +1,7 @@
-from dao.user_dao import UserDAO
-from utils.jwt_utils import generate_jwt
-import os
-from database import Session
-from dotenv import load_dotenv, set_key, unset_key
 import json
 
-# Charge les variables d'environnement depuis le fichier .env
-load_dotenv(".env")
+# Les variables d'environnement sont chargées une seule fois par config.py ; le DAO,
+# la base et PyJWT ne sont importés que par login(), pas par la lecture du token.
 
 
 def save_token_to_file(token, filename="token.json"):
@@ -45,6 +40,10 @@ def delete_token_file(filename="token.json"):
 
 def login(email, password):
     """Authenticate the user and generate a JWT token."""
+    from dao.user_dao import UserDAO
+    from database import Session
+    from utils.jwt_utils import generate_jwt
+
     session = Session()  # Crée une session avec la base de données
     user_dao = UserDAO(session)  # Initialise le DAO de l'utilisateur avec la session
     try:
@@ -54,7 +53,7 @@ def login(email, password):
             raise Exception("Invalid credentials")  # Si les informations sont invalides, lever une exception
 
         # Génère un token JWT pour l'utilisateur authentifié
-        token = generate_jwt(user.id)
+        token = generate_jwt(user.id, user.role, user.token_version)
         print(token)  # Affiche le token généré
         save_token_to_file(token)  # Sauvegarde le token dans un fichier
     finally:
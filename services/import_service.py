@@ -0,0 +1,247 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from utils.validation import validate_email, validate_phone
+
+# Nombre de lignes insérées par aller-retour avec la base
+DEFAULT_BATCH_SIZE = 5000
+
+# Lots plus petits pour les collaborateurs : chaque ligne coûte un hachage Argon2
+DEFAULT_COLLABORATOR_BATCH_SIZE = 500
+
+COLLABORATOR_ROLES = ("MANAGEMENT", "SUPPORT", "SALES")
+
+# Noms de colonnes acceptés dans les fichiers, en plus des noms du modèle
+CLIENT_FIELD_ALIASES = {"name": "full_name", "company": "company_name"}
+
+
+def read_records(path):
+    """Yield (line_number, record, error) tuples from a CSV, TSV or JSONL file."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8") as file:
+        if extension in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, {"raw": line.rstrip("\n")}, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, {"raw": record}, "Expected a JSON object"
+                    continue
+                yield line_number, record, None
+        elif extension in (".csv", ".tsv"):
+            reader = csv.DictReader(file, delimiter="\t" if extension == ".tsv" else ",")
+            # La ligne 1 contient les en-têtes
+            for line_number, record in enumerate(reader, start=2):
+                yield line_number, record, None
+        else:
+            raise Exception(f"Unsupported file type '{extension}' (use .csv, .tsv or .jsonl)")
+
+
+def validate_client_record(record):
+    """Normalize a raw client record; return (values, error)."""
+    values = {}
+    for key, value in record.items():
+        if key is None:
+            continue  # Colonnes surnuméraires d'une ligne CSV mal formée
+        key = CLIENT_FIELD_ALIASES.get(key.strip(), key.strip())
+        values[key] = value.strip() if isinstance(value, str) else value
+
+    full_name = values.get("full_name")
+    email = values.get("email")
+    phone = str(values.get("phone") or "")
+    if not full_name:
+        return None, "Missing name"
+    if not email or not validate_email(email):
+        return None, "Invalid email format"
+    if not validate_phone(phone):
+        return None, "Invalid phone number format"
+    return {
+        "full_name": full_name,
+        "email": email,
+        "phone": phone,
+        "company_name": values.get("company_name") or None,
+    }, None
+
+
+def validate_collaborator_record(record):
+    """Normalize a raw collaborator record; return (values, error)."""
+    values = {
+        key.strip(): value.strip() if isinstance(value, str) else value
+        for key, value in record.items()
+        if key is not None
+    }
+    try:
+        employee_number = int(values.get("employee_number"))
+    except (TypeError, ValueError):
+        return None, "Invalid employee number"
+    email = values.get("email")
+    if not values.get("name"):
+        return None, "Missing name"
+    if not email or not validate_email(email):
+        return None, "Invalid email format"
+    if not values.get("password"):
+        return None, "Missing password"
+    if values.get("role") not in COLLABORATOR_ROLES:
+        return None, "Role must be MANAGEMENT, SUPPORT or SALES"
+    return {
+        "employee_number": employee_number,
+        "name": values["name"],
+        "email": email,
+        "password": str(values["password"]),
+        "role": values["role"],
+    }, None
+
+
+def _without_password(record):
+    """Copy a record without its password, before writing it to the rejects file."""
+    # Une ligne illisible ("raw") ou les colonnes CSV surnuméraires (clé None) peuvent
+    # contenir le mot de passe en clair : seuls le numéro de ligne et l'erreur sont gardés
+    return {
+        key: value
+        for key, value in record.items()
+        if key is not None and key != "raw" and key.strip().lower() != "password"
+    }
+
+
+def default_hash_workers():
+    """Return the number of cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class RejectWriter:
+    """Append rejected rows to a JSONL side file, created on the first reject."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+
+    def write(self, line_number, record, error):
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(
+            json.dumps({"line": line_number, "error": error, "record": record}, default=str)
+            + "\n"
+        )
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def default_rejects_path(path):
+    """Return the side file used for rejected rows of an import."""
+    return f"{path}.rejects.jsonl"
+
+
+def import_clients(session, path, commercial_contact, batch_size=DEFAULT_BATCH_SIZE, rejects_path=None):
+    """Import clients from a file in batches; return the inserted and rejected counts."""
+    from dao.client_dao import ClientDAO
+
+    client_dao = ClientDAO(session)
+    rejects = RejectWriter(rejects_path or default_rejects_path(path))
+    seen_emails = set()
+    batch, line_numbers = [], {}
+    inserted = 0
+
+    def flush():
+        nonlocal inserted
+        count, rejected = client_dao.bulk_add_clients(batch)
+        inserted += count
+        for row, error in rejected:
+            rejects.write(line_numbers[id(row)], row, error)
+        batch.clear()
+        line_numbers.clear()
+
+    try:
+        for line_number, record, error in read_records(path):
+            if error is None:
+                values, error = validate_client_record(record)
+            if error is None and values["email"] in seen_emails:
+                error = "Duplicate email in file"
+            if error is not None:
+                rejects.write(line_number, record, error)
+                continue
+
+            # Comme `client add`, le client est attribué au commercial connecté
+            values["commercial_contact"] = commercial_contact
+            seen_emails.add(values["email"])
+            batch.append(values)
+            line_numbers[id(values)] = line_number
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    finally:
+        rejects.close()
+    return {"inserted": inserted, "rejected": rejects.count, "rejects_path": rejects.path}
+
+
+def import_collaborators(
+    session,
+    path,
+    batch_size=DEFAULT_COLLABORATOR_BATCH_SIZE,
+    workers=None,
+    rejects_path=None,
+):
+    """Import collaborators from a file, hashing passwords over a process pool."""
+    from dao.user_dao import UserDAO
+    from utils.security import hash_password
+
+    user_dao = UserDAO(session)
+    workers = workers or default_hash_workers()
+    rejects = RejectWriter(rejects_path or default_rejects_path(path))
+    seen_emails, seen_numbers = set(), set()
+    batch, line_numbers = [], {}
+    inserted = 0
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def hash_passwords(passwords):
+        if executor is None:
+            return [hash_password(p) for p in passwords]
+        # Quelques morceaux par processus : peu d'échanges, charge équilibrée
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(executor.map(hash_password, passwords, chunksize=chunksize))
+
+    def flush():
+        nonlocal inserted
+        count, rejected = user_dao.bulk_create_users(batch, hash_passwords=hash_passwords)
+        inserted += count
+        for row, error in rejected:
+            rejects.write(line_numbers[id(row)], _without_password(row), error)
+        batch.clear()
+        line_numbers.clear()
+
+    try:
+        for line_number, record, error in read_records(path):
+            if error is None:
+                values, error = validate_collaborator_record(record)
+            if error is None and values["email"] in seen_emails:
+                error = "Duplicate email in file"
+            if error is None and values["employee_number"] in seen_numbers:
+                error = "Duplicate employee number in file"
+            if error is not None:
+                rejects.write(line_number, _without_password(record), error)
+                continue
+
+            seen_emails.add(values["email"])
+            seen_numbers.add(values["employee_number"])
+            batch.append(values)
+            line_numbers[id(values)] = line_number
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    finally:
+        rejects.close()
+        if executor is not None:
+            executor.shutdown()
+    return {"inserted": inserted, "rejected": rejects.count, "rejects_path": rejects.path}
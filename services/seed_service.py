@@ -0,0 +1,341 @@
+import csv
+import io
+import random
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+# Valeurs par défaut de `seed`
+DEFAULT_USERS = 100
+DEFAULT_CLIENTS = 10000
+DEFAULT_CONTRACTS = 30000
+DEFAULT_EVENTS = 50000
+DEFAULT_SEED = 42
+DEFAULT_PASSWORD = "seed-password"
+
+# Lignes générées par tâche et écrites par aller-retour avec la base
+DEFAULT_BATCH_SIZE = 10000
+
+# Rôle de l'utilisateur i : ROLE_CYCLE[i % 10], soit 1 manager, 4 commerciaux et
+# 5 supports sur 10 ; les trois premiers utilisateurs couvrent les trois rôles
+ROLE_CYCLE = ("SUPPORT", "MANAGEMENT", "SALES", "SUPPORT", "SALES", "SUPPORT", "SALES", "SUPPORT", "SALES", "SUPPORT")
+
+# Tables dans l'ordre des clés étrangères, avec les colonnes écrites (updated_at
+# et token_version prennent leur valeur par défaut côté serveur)
+TABLE_COLUMNS = {
+    "users": ("id", "employee_number", "name", "email", "password_hash", "role"),
+    "clients": (
+        "id", "full_name", "email", "phone", "company_name",
+        "creation_date", "last_contact_date", "commercial_contact",
+    ),
+    "contracts": (
+        "id", "client_id", "commercial_id", "total_amount",
+        "amount_remaining", "creation_date", "signed",
+    ),
+    "events": (
+        "id", "contract_id", "start_date", "end_date",
+        "support_user_id", "location", "attendees", "notes",
+    ),
+}
+
+FIRST_NAMES = (
+    "Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Gaëlle", "Hugo", "Inès", "Jules",
+    "Karim", "Léa", "Marc", "Nina", "Omar", "Paul", "Rose", "Sofia", "Théo", "Yanis",
+)
+LAST_NAMES = (
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy",
+    "Moreau", "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "Roux", "Fournier", "Girard",
+)
+COMPANY_WORDS = (
+    "Events", "Conseil", "Industries", "Digital", "Voyages", "Santé", "Sport", "Média",
+    "Logistique", "Énergie", "Finance", "Immobilier", "Studio", "Traiteur", "Mode",
+)
+CITIES = ("Paris", "Lyon", "Marseille", "Lille", "Bordeaux", "Nantes", "Toulouse", "Nice", "Rennes")
+
+# Les dates générées couvrent quatre ans
+FIRST_DAY = date(2024, 1, 1)
+DAYS = 4 * 365
+
+
+def role_of(user_id):
+    """Return the role of a generated user."""
+    return ROLE_CYCLE[user_id % len(ROLE_CYCLE)]
+
+
+def seed_user_email(user_id):
+    """Return the login email of a generated user."""
+    return f"user{user_id}@seed.local"
+
+
+def _ids_with_role(users, role):
+    return [user_id for user_id in range(1, users + 1) if role_of(user_id) == role]
+
+
+def _commercial_of(client_id, sales_ids):
+    # Hachage multiplicatif : le commercial d'un client se retrouve sans lire la
+    # table clients, si bien que chaque lot de contrats se génère indépendamment
+    return sales_ids[(client_id * 2654435761) % 4294967296 % len(sales_ids)]
+
+
+def _day(rng):
+    return FIRST_DAY + timedelta(days=rng.randrange(DAYS))
+
+
+def _ascii(name):
+    """Lowercase a name and drop its accents, as validate_email only accepts ASCII."""
+    return unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+
+
+def generate_rows(plan, table, start, stop):
+    """Return the rows of ids [start, stop) of a table as tuples in TABLE_COLUMNS order.
+
+    A batch only depends on the seed, the volumes and its bounds: the same
+    seed gives the same rows whatever the number of worker processes.
+    """
+    rng = random.Random(f"{plan['seed']}:{table}:{start}")
+    rows = []
+    if table == "users":
+        for user_id in range(start, stop):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            rows.append(
+                (user_id, user_id, name, seed_user_email(user_id), plan["password_hash"], role_of(user_id))
+            )
+    elif table == "clients":
+        sales_ids = _ids_with_role(plan["users"], "SALES")
+        for client_id in range(start, stop):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            created = _day(rng)
+            # Un client sur cinq n'a pas de société, un sur trois n'a jamais été recontacté
+            company = f"{last} {rng.choice(COMPANY_WORDS)}" if rng.random() < 0.8 else None
+            contacted = created + timedelta(days=rng.randrange(365)) if rng.random() < 0.7 else None
+            rows.append(
+                (
+                    client_id,
+                    f"{first} {last}",
+                    f"{_ascii(first)}.{_ascii(last)}.{client_id}@client.example",
+                    f"06{rng.randrange(100000000):08d}",
+                    company,
+                    created.isoformat(),
+                    contacted.isoformat() if contacted else None,
+                    _commercial_of(client_id, sales_ids),
+                )
+            )
+    elif table == "contracts":
+        sales_ids = _ids_with_role(plan["users"], "SALES")
+        for contract_id in range(start, stop):
+            client_id = rng.randint(1, plan["clients"])
+            # Montants log-normaux : beaucoup de petits contrats, quelques très gros
+            total = round(rng.lognormvariate(8, 1), 2)
+            signed = rng.random() < 0.7
+            paid = signed and rng.random() < 0.6
+            remaining = 0.0 if paid else round(total * rng.choice((0.3, 0.5, 1.0)), 2)
+            rows.append(
+                (
+                    contract_id,
+                    client_id,
+                    _commercial_of(client_id, sales_ids),
+                    total,
+                    remaining,
+                    _day(rng).isoformat(),
+                    signed,
+                )
+            )
+    elif table == "events":
+        support_ids = _ids_with_role(plan["users"], "SUPPORT")
+        for event_id in range(start, stop):
+            start_date = _day(rng)
+            # Un à trois jours ; un événement sur dix attend encore son support
+            end_date = start_date + timedelta(days=rng.choice((0, 0, 1, 2)))
+            rows.append(
+                (
+                    event_id,
+                    rng.randint(1, plan["contracts"]),
+                    start_date.isoformat(),
+                    end_date.isoformat(),
+                    rng.choice(support_ids) if rng.random() < 0.9 else None,
+                    rng.choice(CITIES),
+                    int(rng.lognormvariate(4, 0.8)),
+                    None,
+                )
+            )
+    else:
+        raise ValueError(f"Unknown table '{table}'")
+    return rows
+
+
+def _tasks(plan, batch_size):
+    for table in TABLE_COLUMNS:
+        total = plan[table]
+        for start in range(1, total + 1, batch_size):
+            yield plan, table, start, min(start + batch_size, total + 1)
+
+
+def _generated(tasks, workers):
+    """Yield (table, rows) in task order, generating up to 2 batches per worker ahead."""
+    if workers <= 1:
+        for plan, table, start, stop in tasks:
+            yield table, generate_rows(plan, table, start, stop)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Fenêtre bornée : les lots générés d'avance ne s'accumulent pas en mémoire
+        pending = deque()
+        for plan, table, start, stop in tasks:
+            pending.append((table, executor.submit(generate_rows, plan, table, start, stop)))
+            if len(pending) >= workers * 2:
+                table_done, future = pending.popleft()
+                yield table_done, future.result()
+        while pending:
+            table_done, future = pending.popleft()
+            yield table_done, future.result()
+
+
+def _write_rows(conn, table, rows):
+    """Write one batch with the fastest path of the database: COPY or a raw executemany."""
+    from sqlalchemy import insert
+    from models.base import Base
+
+    columns = TABLE_COLUMNS[table]
+    raw = conn.connection.dbapi_connection
+    if conn.dialect.name == "sqlite":
+        # Tuples passés tels quels au pilote : pas de compilation ni de conversion par ligne
+        raw.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            rows,
+        )
+        return
+    cursor = raw.cursor()
+    if conn.dialect.name == "postgresql" and hasattr(cursor, "copy_expert"):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)  # None devient un champ vide non cité, lu comme NULL
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return
+    conn.execute(insert(Base.metadata.tables[table]), [dict(zip(columns, row)) for row in rows])
+
+
+def _check_empty(conn):
+    from sqlalchemy import text
+
+    for table in TABLE_COLUMNS:
+        if conn.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first() is not None:
+            raise Exception(f"Table '{table}' is not empty: seed only fills an empty database")
+
+
+def _drop_secondary_indexes(conn):
+    """Drop the indexes and search triggers of the seeded tables; return how to recreate them."""
+    from sqlalchemy import inspect, text
+    from models.base import Base
+    from models.client_search import POSTGRESQL_SEARCH_DDL, SQLITE_SEARCH_DDL, SQLITE_SEARCH_TABLE
+
+    inspector = inspect(conn)
+    indexes = []
+    for table in TABLE_COLUMNS:
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        indexes += [index for index in Base.metadata.tables[table].indexes if index.name in existing]
+    for index in indexes:
+        index.drop(conn)
+
+    # Mettre à jour l'index de recherche ligne par ligne coûte plus cher que le reconstruire
+    search_ddl = []
+    if conn.dialect.name == "sqlite" and inspector.has_table(SQLITE_SEARCH_TABLE):
+        for trigger in ("clients_search_ai", "clients_search_ad", "clients_search_au"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        search_ddl = [
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}) VALUES ('rebuild')"
+        ] + SQLITE_SEARCH_DDL[1:]
+    elif conn.dialect.name == "postgresql":
+        if "ix_clients_search_trgm" in {index["name"] for index in inspector.get_indexes("clients")}:
+            conn.execute(text("DROP INDEX ix_clients_search_trgm"))
+            search_ddl = POSTGRESQL_SEARCH_DDL[1:]
+    return indexes, search_ddl
+
+
+def _restore_indexes(conn, indexes, search_ddl):
+    from sqlalchemy import text
+
+    for index in indexes:
+        index.create(conn)
+    for statement in search_ddl:
+        conn.execute(text(statement))
+    if conn.dialect.name == "postgresql":
+        # Les ID ont été écrits explicitement : les séquences repartent après le plus grand
+        for table in TABLE_COLUMNS:
+            conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"coalesce(max(id), 0) + 1, false) FROM {table}"
+                )
+            )
+    conn.execute(text("ANALYZE"))
+
+
+def seed_database(
+    engine,
+    users=DEFAULT_USERS,
+    clients=DEFAULT_CLIENTS,
+    contracts=DEFAULT_CONTRACTS,
+    events=DEFAULT_EVENTS,
+    seed=DEFAULT_SEED,
+    password=DEFAULT_PASSWORD,
+    workers=1,
+    batch_size=DEFAULT_BATCH_SIZE,
+    on_table_done=None,
+):
+    """Fill empty tables with reproducible synthetic rows; return {table: (rows, seconds)}.
+
+    Users get roles in the ROLE_CYCLE proportions and all share `password`;
+    clients belong to SALES users, contracts to the commercial of their
+    client and 90 % of the events, lasting one to three days, to a SUPPORT
+    user. Worker processes generate the batches while this process streams
+    them into the database, table after table in foreign key order, with
+    the secondary indexes rebuilt once at the end.
+    """
+    from utils.security import hash_password
+
+    if users < 3 and (clients or contracts or events):
+        raise Exception("At least 3 users are needed to have every role")
+    if (contracts and not clients) or (events and not contracts):
+        raise Exception("Contracts need clients and events need contracts")
+    plan = {
+        "users": users,
+        "clients": clients,
+        "contracts": contracts,
+        "events": events,
+        "seed": seed,
+        "password_hash": hash_password(password),  # Un seul hachage Argon2 pour tous
+    }
+    timings = {}
+    with engine.begin() as conn:
+        _check_empty(conn)
+        indexes, search_ddl = _drop_secondary_indexes(conn)
+
+    def table_done(table, count, started):
+        timings[table] = (count, time.perf_counter() - started)
+        if on_table_done:
+            on_table_done(table, *timings[table])
+
+    try:
+        with engine.connect() as conn:
+            current, started, count, transaction = None, None, 0, None
+            for table, rows in _generated(_tasks(plan, batch_size), workers):
+                if table != current:
+                    if transaction is not None:
+                        transaction.commit()
+                        table_done(current, count, started)
+                    # Une transaction par table : une seule synchronisation disque
+                    current, started, count = table, time.perf_counter(), 0
+                    transaction = conn.begin()
+                _write_rows(conn, table, rows)
+                count += len(rows)
+            if transaction is not None:
+                transaction.commit()
+                table_done(current, count, started)
+    finally:
+        # Même après un échec, la base retrouve ses index
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            _restore_indexes(conn, indexes, search_ddl)
+        table_done("indexes", len(indexes) + len(search_ddl), started)
+    return timings
@@ -0,0 +1,213 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+from unittest.mock import patch
+from datetime import datetime
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.user import User
+from models.client import Client
+from models.contract import Contract
+from models.event import Event
+from dao.client_dao import ClientDAO
+from dao.contract_dao import ContractDAO
+from dao.event_dao import EventDAO
+from dao.report_dao import ReportDAO
+from dao.user_dao import UserDAO
+from dao.async_dao import (
+    AsyncClientDAO,
+    AsyncContractDAO,
+    AsyncEventDAO,
+    AsyncReportDAO,
+    AsyncUserDAO,
+    gather_in_sessions,
+)
+from database import async_database_url
+from utils import security
+from config import TEST_DATABASE_URL
+
+
+def _plain(result):
+    """Turn DAO results (ORM objects, rows, lists) into comparable values."""
+    if isinstance(result, (list, tuple)):
+        return [_plain(item) for item in result]
+    if isinstance(result, Base):
+        return {attr.key: getattr(result, attr.key) for attr in inspect(result).mapper.column_attrs}
+    if hasattr(result, "_asdict"):
+        return result._asdict()
+    return result
+
+
+class TestAsyncDAO(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.create_all(cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    async def asyncSetUp(self):
+        self.session = self.Session()
+        for model in (Event, Contract, Client, User):
+            self.session.query(model).delete()
+        self.session.commit()
+
+        self.session.add_all(
+            [
+                User(id=1, employee_number=1, name="Alice", email="alice@example.com",
+                     password_hash="x", role="SALES"),
+                User(id=2, employee_number=2, name="Sam", email="sam@example.com",
+                     password_hash="x", role="SUPPORT"),
+                Client(id=1, full_name="Acme Corp", email="acme@example.com", commercial_contact=1),
+                Client(id=2, full_name="Globex", email="globex@example.com", commercial_contact=1),
+            ]
+        )
+        self.session.flush()
+        self.session.add_all(
+            [
+                Contract(id=1, client_id=1, commercial_id=1, total_amount=1000, amount_remaining=200, signed=True),
+                Contract(id=2, client_id=2, commercial_id=1, total_amount=500, amount_remaining=500, signed=False),
+            ]
+        )
+        self.session.flush()
+        self.session.add_all(
+            [
+                Event(id=1, contract_id=1, support_user_id=2, attendees=10,
+                      start_date=datetime(2026, 1, 1), end_date=datetime(2026, 1, 3)),
+                Event(id=2, contract_id=1, support_user_id=2, attendees=20,
+                      start_date=datetime(2026, 1, 2), end_date=datetime(2026, 1, 4)),
+            ]
+        )
+        self.session.commit()
+
+        self.async_engine = create_async_engine(async_database_url(TEST_DATABASE_URL))
+        self.AsyncSession = async_sessionmaker(bind=self.async_engine, expire_on_commit=False)
+        self.async_session = self.AsyncSession()
+
+    async def asyncTearDown(self):
+        await self.async_session.close()
+        await self.async_engine.dispose()
+        self.session.rollback()
+        self.session.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+
+    async def test_same_method_surface(self):
+        """Test that every public method of the synchronous DAOs has an async counterpart."""
+        for dao_class, async_class in (
+            (ClientDAO, AsyncClientDAO),
+            (ContractDAO, AsyncContractDAO),
+            (EventDAO, AsyncEventDAO),
+            (UserDAO, AsyncUserDAO),
+            (ReportDAO, AsyncReportDAO),
+        ):
+            for name, method in vars(dao_class).items():
+                if not name.startswith("_") and callable(method):
+                    self.assertTrue(asyncio.iscoroutinefunction(getattr(async_class, name)), name)
+
+    async def test_reads_match_sync_variant(self):
+        """Test that both variants return the same rows for the same calls."""
+        calls = [
+            (ClientDAO, AsyncClientDAO, "get_client_by_id", (1,), {}),
+            (ClientDAO, AsyncClientDAO, "get_all_clients", (), {"page_size": 1, "after_id": 1}),
+            (ClientDAO, AsyncClientDAO, "search_clients", ("acme",), {}),
+            (ContractDAO, AsyncContractDAO, "get_unsigned_contracts", (1,), {}),
+            (ContractDAO, AsyncContractDAO, "get_unpaid_contracts", (1,), {}),
+            (EventDAO, AsyncEventDAO, "get_events_for_support", (2,), {}),
+            (EventDAO, AsyncEventDAO, "find_conflicts", (), {}),
+            (UserDAO, AsyncUserDAO, "get_user_by_email", ("sam@example.com",), {}),
+            (ReportDAO, AsyncReportDAO, "revenue_by_commercial", (), {}),
+            (ReportDAO, AsyncReportDAO, "receivables_by_client", (), {}),
+        ]
+        for dao_class, async_class, name, args, kwargs in calls:
+            with self.subTest(name):
+                expected = getattr(dao_class(self.session), name)(*args, **kwargs)
+                result = await getattr(async_class(self.async_session), name)(*args, **kwargs)
+                self.assertEqual(_plain(result), _plain(expected))
+                self.assertTrue(expected)
+
+    async def test_stream_returns_list(self):
+        """Test that streamed listings are loaded into a list by the async variant."""
+        contracts = await AsyncContractDAO(self.async_session).get_all_contracts(stream=True)
+        self.assertEqual([contract.id for contract in contracts], [1, 2])
+
+    async def test_writes_are_committed(self):
+        """Test that async writes are visible to a synchronous session."""
+        dao = AsyncContractDAO(self.async_session)
+        contract = await dao.update_contract(2, 500, 0, True)
+        self.assertTrue(contract.signed)
+
+        client = await AsyncClientDAO(self.async_session).add_client_from_params(
+            "Initech", "initech@example.com", "0123456789", "Initech", 1
+        )
+        self.session.expire_all()
+        self.assertEqual(ContractDAO(self.session).get_contract_by_id(2).amount_remaining, 0)
+        self.assertEqual(ClientDAO(self.session).get_client_by_id(client.id).full_name, "Initech")
+
+    async def test_errors_are_wrapped_like_sync(self):
+        """Test that the async variant raises the messages of the synchronous DAO."""
+        with self.assertRaises(Exception) as sync_error:
+            EventDAO(self.session).delete_event(999)
+        with self.assertRaises(Exception) as async_error:
+            await AsyncEventDAO(self.async_session).delete_event(999)
+        self.assertEqual(str(async_error.exception), str(sync_error.exception))
+
+    async def test_password_hashing_runs_off_the_event_loop(self):
+        """Test that Argon2 never runs on the event loop thread, so a login does not stall other coroutines."""
+        threads = []
+
+        def recorded(function):
+            def call(*args):
+                threads.append(threading.get_ident())
+                return function(*args)
+            return call
+
+        dao = AsyncUserDAO(self.async_session)
+        with patch("dao.async_dao.hash_password", recorded(security.hash_password)), \
+                patch("dao.async_dao.check_password", recorded(security.check_password)), \
+                patch("dao.user_dao.hash_password", side_effect=AssertionError("hashed in run_sync")):
+            user = await dao.create_user(10, "Nora", "nora@example.com", "pw1", "SUPPORT")
+            await dao.update_user(user.id, password="pw2")
+            self.assertIsNotNone(await dao.authenticate_user("nora@example.com", "pw2"))
+            self.assertIsNone(await dao.authenticate_user("nora@example.com", "pw1"))
+            inserted, rejected = await dao.bulk_create_users(
+                [
+                    {"employee_number": 11, "name": "Omar", "email": "omar@example.com",
+                     "password": "same", "role": "SALES"},
+                    {"employee_number": 12, "name": "Dup", "email": "nora@example.com",
+                     "password": "same", "role": "SALES"},
+                    {"employee_number": 13, "name": "Paul", "email": "paul@example.com",
+                     "password": "same", "role": "SALES"},
+                ]
+            )
+        self.assertEqual((inserted, [row["name"] for row, _ in rejected]), (2, ["Dup"]))
+        self.assertTrue(threads)
+        self.assertNotIn(threading.get_ident(), threads)
+        self.assertIsNotNone(UserDAO(self.session).authenticate_user("paul@example.com", "same"))
+
+    async def test_gather_in_sessions(self):
+        """Test concurrent DAO calls, each in its own session, returned in call order."""
+        client, contracts, events = await gather_in_sessions(
+            lambda s: AsyncClientDAO(s).get_client_by_id(1),
+            lambda s: AsyncContractDAO(s).get_unpaid_contracts(1),
+            lambda s: AsyncEventDAO(s).get_events_for_support(2),
+            session_factory=self.AsyncSession,
+        )
+        self.assertEqual(client.full_name, "Acme Corp")
+        self.assertEqual(sorted(contract.id for contract in contracts), [1, 2])
+        self.assertEqual([event.id for event in events], [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
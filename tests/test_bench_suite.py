@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "benchmarks"))
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from services.seed_service import seed_database
+from suite import Context, compare, dao_cases, enable_savepoints, time_case, uncovered_methods
+from config import TEST_DATABASE_URL
+
+
+class TestBenchSuite(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        enable_savepoints(cls.engine)
+        Base.metadata.drop_all(cls.engine)
+        Base.metadata.create_all(cls.engine)
+        seed_database(cls.engine, users=30, clients=50, contracts=100, events=200)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    @classmethod
+    def tearDownClass(cls):
+        Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+
+    def test_every_public_dao_method_has_a_case(self):
+        """Test that a new DAO method cannot be left out of the benchmark suite."""
+        self.assertEqual(uncovered_methods(dao_cases(Context(self.Session))), [])
+
+    def test_cases_run(self):
+        """Test that each case runs against a seeded database."""
+        for case in dao_cases(Context(self.Session)):
+            with self.subTest(case=case.name):
+                stats = time_case(self.Session, case, repeat=1)
+                self.assertEqual(stats["runs"], 1)
+
+    def snapshot(self):
+        with self.engine.connect() as conn:
+            return {
+                table: conn.execute(text(f"SELECT * FROM {table} ORDER BY id")).fetchall()
+                for table in ("users", "clients", "contracts", "events")
+            }
+
+    def test_write_cases_leave_the_data_unchanged(self):
+        """Test that write cases are rolled back, so later runs and cases measure the seeded rows."""
+        before = self.snapshot()
+        cases = [case for case in dao_cases(Context(self.Session)) if case.writes]
+        self.assertEqual(len(cases), 16)
+        for case in cases:
+            with self.subTest(case=case.name):
+                time_case(self.Session, case, repeat=2)
+                self.assertEqual(self.snapshot(), before)
+
+    def test_compare_with_baseline(self):
+        """Test that only slowdowns beyond both the threshold and the minimum delta are regressions."""
+        baseline = {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}, "c": {"median_ms": 0.1}}
+        results = {
+            "a": {"median_ms": 14.0},  # Plus lent, mais sous le seuil de 50 %
+            "b": {"median_ms": 20.0},
+            "c": {"median_ms": 0.5},  # 5 fois plus lent, mais de moins de 2 ms
+            "d": {"median_ms": 99.0},  # Absent de la référence
+        }
+        self.assertEqual(compare(results, baseline, 0.5, 2.0), [("b", 10.0, 20.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
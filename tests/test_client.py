@@ -14,6 +14,7 @@ import unittest
 import sys
 import os
 import uuid
+from datetime import datetime
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -25,7 +26,10 @@ from models.base import Base
 from models.contract import Contract
 from models.event import Event
 from models.client import Client
+from models.user import User
 from dao.client_dao import ClientDAO
+from utils.output import client_row
+from utils.sql_trace import SQLTrace
 from config import TEST_DATABASE_URL
 
 
@@ -96,6 +100,122 @@ class TestClientDAO(unittest.TestCase):
         self.assertEqual(result[0].full_name, "John Doe")
         self.assertEqual(result[1].full_name, "Jane Smith")
 
+    def test_get_all_clients_keyset_pagination(self):
+        """Test paging through clients with an ID cursor."""
+        for name in ("Alpha", "Bravo", "Charlie"):
+            self.client_dao.add_client(
+                Client(
+                    full_name=name,
+                    email=generate_unique_email(name.lower()),
+                    phone="123456789",
+                )
+            )
+        first_page = self.client_dao.get_all_clients(page_size=2)
+        self.assertEqual([c.full_name for c in first_page], ["Alpha", "Bravo"])
+        second_page = self.client_dao.get_all_clients(
+            page_size=2, after_id=first_page[-1].id
+        )
+        self.assertEqual([c.full_name for c in second_page], ["Charlie"])
+
+    def test_get_all_clients_stream(self):
+        """Test streaming clients instead of loading them in a list."""
+        for name in ("Alpha", "Bravo"):
+            self.client_dao.add_client(
+                Client(
+                    full_name=name,
+                    email=generate_unique_email(name.lower()),
+                    phone="123456789",
+                )
+            )
+        result = self.client_dao.get_all_clients(stream=True)
+        self.assertNotIsInstance(result, list)
+        self.assertEqual([c.full_name for c in result], ["Alpha", "Bravo"])
+
+    def test_get_all_clients_since(self):
+        """Test that updated_at is maintained and filters incremental listings."""
+        old, recent = (
+            Client(full_name=name, email=generate_unique_email(name.lower()), phone="123456789")
+            for name in ("Old", "Recent")
+        )
+        self.client_dao.add_client(old)
+        self.client_dao.add_client(recent)
+        self.assertIsNotNone(recent.updated_at)
+        old.updated_at = datetime(2000, 1, 1)
+        self.session.commit()
+
+        result = self.client_dao.get_all_clients(since=datetime(2001, 1, 1))
+        self.assertEqual([c.full_name for c in result], ["Recent"])
+
+        # Toute modification rafraîchit updated_at
+        old.phone = "987654321"
+        self.session.commit()
+        self.assertGreater(old.updated_at, datetime(2001, 1, 1))
+
+    def test_search_clients(self):
+        """Test ranked, typo-tolerant search kept in sync with client writes."""
+        for name, company in (("Gaspard Lefebvre", "Tyrell"), ("Hugo Martin", "Wonka"), ("Emma Petit", None)):
+            self.client_dao.add_client(
+                Client(full_name=name, email=generate_unique_email(name.split()[0].lower()),
+                       phone="123456789", company_name=company)
+            )
+        self.assertEqual([c.full_name for c in self.client_dao.search_clients("lefeb")], ["Gaspard Lefebvre"])
+        self.assertEqual([c.full_name for c in self.client_dao.search_clients("wonka")], ["Hugo Martin"])
+        # Mots inversés puis faute de frappe
+        self.assertEqual(self.client_dao.search_clients("Martin Hugo")[0].full_name, "Hugo Martin")
+        self.assertEqual(self.client_dao.search_clients("Gaspar Lefebre")[0].full_name, "Gaspard Lefebvre")
+
+        # L'index suit les modifications et les suppressions
+        emma = self.client_dao.search_clients("Emma Petit")[0]
+        emma.company_name = "Initech"
+        self.session.commit()
+        self.assertEqual([c.id for c in self.client_dao.search_clients("initech")], [emma.id])
+        self.client_dao.delete_client(emma.id)
+        self.assertEqual(self.client_dao.search_clients("initech"), [])
+
+        with self.assertRaises(Exception):
+            self.client_dao.search_clients("ab")
+
+    def test_list_with_commercial_names(self):
+        """Test that client pages and searches load commercial names in constant queries."""
+        commercial = User(employee_number=7001, name="Sally Sales", email=generate_unique_email("sally"),
+                          password_hash="hash", role="SALES")
+        self.session.add(commercial)
+        self.session.commit()
+        for i in range(4):
+            self.client_dao.add_client(
+                Client(full_name=f"Acme Buyer {i}", email=generate_unique_email("buyer"),
+                       phone="123456789", commercial_contact=commercial.id)
+            )
+        session = self.Session()
+        trace = SQLTrace().attach(self.engine)
+        try:
+            dao = ClientDAO(session)
+            listed = [client_row(c) for c in dao.get_all_clients(with_related=True)]
+            found = [client_row(c) for c in dao.search_clients("Acme Buyer", with_related=True)]
+        finally:
+            trace.detach()
+            session.close()
+        # Une requête pour la page, deux pour la recherche (clients puis commerciaux)
+        self.assertEqual(trace.summary()["queries"], 3)
+        self.assertEqual({row["commercial_name"] for row in listed}, {"Sally Sales"})
+        self.assertEqual(len(found), 4)
+        self.assertEqual({row["commercial_name"] for row in found}, {"Sally Sales"})
+
+    def test_bulk_add_clients(self):
+        """Test inserting a batch of clients and rejecting existing emails."""
+        existing_email = generate_unique_email("existing")
+        self.client_dao.add_client(
+            Client(full_name="Existing", email=existing_email, phone="123456789")
+        )
+        rows = [
+            {"full_name": "New", "email": generate_unique_email("new"), "phone": "0612345678"},
+            {"full_name": "Dup", "email": existing_email, "phone": "0612345678"},
+        ]
+        inserted, rejected = self.client_dao.bulk_add_clients(rows)
+        self.assertEqual(inserted, 1)
+        self.assertEqual([row["full_name"] for row, _ in rejected], ["Dup"])
+        self.assertEqual(len(self.client_dao.get_all_clients()), 2)
+
     def test_update_client(self):
         """Test updating a client."""
         email = generate_unique_email("john.doe")
@@ -122,6 +242,64 @@ class TestClientDAO(unittest.TestCase):
         result = self.client_dao.get_client_by_id(client.id)
         self.assertIsNone(result)
 
+    def test_update_client_single_statement(self):
+        """Test that an update runs one UPDATE ... RETURNING and checks the owner in it."""
+        commercial = User(employee_number=7002, name="Owner", email=generate_unique_email("owner"),
+                          password_hash="hash", role="SALES")
+        self.session.add(commercial)
+        self.session.commit()
+        client = Client(full_name="John Doe", email=generate_unique_email("john"),
+                        phone="123456789", commercial_contact=commercial.id)
+        self.client_dao.add_client(client)
+        client_id, commercial_id = client.id, commercial.id
+
+        trace = SQLTrace().attach(self.engine)
+        try:
+            updated = self.client_dao.update_client(
+                client_id, "Johnathan Doe", client.email, "0600000000", "Doe Inc.", commercial_id=commercial_id
+            )
+        finally:
+            trace.detach()
+        self.assertEqual(trace.summary()["queries"], 1)
+        self.assertTrue(next(iter(trace.statements)).startswith("UPDATE clients"))
+        self.assertEqual(updated.full_name, "Johnathan Doe")
+
+        # Un autre commercial est refusé, un client inconnu est signalé
+        with self.assertRaises(PermissionError):
+            self.client_dao.update_client(client_id, "X", client.email, "0", "X", commercial_id=commercial_id + 1)
+        with self.assertRaises(Exception) as context:
+            self.client_dao.update_client(client_id + 1000, "X", "x@example.com", "0", "X")
+        self.assertIn("Client not found", str(context.exception))
+        self.assertEqual(self.client_dao.get_client_by_id(client_id).full_name, "Johnathan Doe")
+        self.session.query(Client).delete()
+        self.session.query(User).filter(User.id == commercial_id).delete()
+        self.session.commit()
+
+    def test_delete_client_with_contracts_is_refused(self):
+        """Test that a client still referenced by a contract is not deleted."""
+        client = Client(full_name="Jane Doe", email=generate_unique_email("jane"), phone="987654321")
+        self.client_dao.add_client(client)
+        client_id = client.id
+        contract = Contract(client_id=client_id, total_amount=100, amount_remaining=0, signed=True)
+        self.session.add(contract)
+        self.session.commit()
+        with self.assertRaises(Exception) as context:
+            self.client_dao.delete_client(client_id)
+        self.assertIn("Client has contracts", str(context.exception))
+        self.assertIsNotNone(self.client_dao.get_client_by_id(client_id))
+
+        self.session.delete(contract)
+        self.session.commit()
+        trace = SQLTrace().attach(self.engine)
+        try:
+            self.client_dao.delete_client(client_id)
+        finally:
+            trace.detach()
+        self.assertEqual(trace.summary()["queries"], 1)
+        with self.assertRaises(Exception) as context:
+            self.client_dao.delete_client(client_id)
+        self.assertIn("Client not found", str(context.exception))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -13,7 +13,10 @@
 import unittest
 import sys
 import os
+import io
+import json
 import uuid
+from datetime import date
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -25,8 +28,12 @@ from models.base import Base
 from models.event import Event
 from models.client import Client
 from models.contract import Contract
+from models.user import User
 from dao.client_dao import ClientDAO
 from dao.contract_dao import ContractDAO
+from rich.console import Console
+from utils.output import CONTRACT_COLUMNS, contract_row, render_rows
+from utils.sql_trace import SQLTrace
 from config import TEST_DATABASE_URL
 
 
@@ -106,6 +113,39 @@ class TestContractDAO(unittest.TestCase):
         self.assertEqual(result[0].total_amount, 1000.0)
         self.assertEqual(result[1].total_amount, 2000.0)
 
+    def test_get_all_contracts_with_related(self):
+        """Test that a page of contracts with client names costs one query."""
+        for amount in (100.0, 200.0, 300.0):
+            self.contract_dao.add_contract(
+                Contract(client_id=self.client.id, total_amount=amount, amount_remaining=0.0, signed=True)
+            )
+        session = self.Session()
+        trace = SQLTrace().attach(self.engine)
+        try:
+            rows = [contract_row(c) for c in ContractDAO(session).get_all_contracts(with_related=True)]
+        finally:
+            trace.detach()
+            session.close()
+        self.assertEqual(trace.summary()["queries"], 1)
+        self.assertEqual([row["client_name"] for row in rows], ["Test Client"] * 3)
+
+    def test_amounts_are_shown_in_dollars(self):
+        """Test that the contract table prefixes amounts with $ while NDJSON keeps numbers."""
+        self.contract_dao.add_contract(
+            Contract(client_id=self.client.id, total_amount=1500.0, amount_remaining=250.5, signed=True)
+        )
+        rows = [contract_row(c) for c in self.contract_dao.get_all_contracts(with_related=True)]
+        console = Console(file=io.StringIO(), width=200)
+        render_rows(console, "Contracts", CONTRACT_COLUMNS, rows)
+        table = console.file.getvalue()
+        self.assertIn("$1500.0", table)
+        self.assertIn("$250.5", table)
+
+        out = io.StringIO()
+        render_rows(console, "Contracts", CONTRACT_COLUMNS, rows, fmt="ndjson", out=out)
+        line = json.loads(out.getvalue())
+        self.assertEqual((line["total_amount"], line["amount_remaining"]), (1500.0, 250.5))
+
     def test_update_contract(self):
         """Test updating a contract."""
         contract = Contract(
@@ -119,6 +159,62 @@ class TestContractDAO(unittest.TestCase):
         self.contract_dao.update_contract(contract)
         result = self.contract_dao.get_contract_by_id(contract.id)
         self.assertEqual(result.total_amount, 2000.0)
+    def test_update_contract_single_statement(self):
+        """Test that an update runs one UPDATE ... RETURNING and checks the owner in it."""
+        commercial = User(employee_number=7003, name="Owner", email=generate_unique_email("owner"),
+                          password_hash="hash", role="SALES")
+        self.session.add(commercial)
+        self.session.commit()
+        commercial_id = commercial.id
+        contract = Contract(client_id=self.client.id, total_amount=1500.0, amount_remaining=1500.0,
+                            signed=False, commercial_id=commercial_id)
+        self.contract_dao.add_contract(contract)
+        contract_id = contract.id
+
+        trace = SQLTrace().attach(self.engine)
+        try:
+            updated = self.contract_dao.update_contract(contract_id, 2000.0, 500.0, True, commercial_id=commercial_id)
+        finally:
+            trace.detach()
+        self.assertEqual(trace.summary()["queries"], 1)
+        self.assertEqual((updated.total_amount, updated.amount_remaining, updated.signed), (2000.0, 500.0, True))
+
+        # Un autre commercial est refusé, un contrat inconnu est signalé
+        with self.assertRaises(PermissionError):
+            self.contract_dao.update_contract(contract_id, 1.0, 0.0, False, commercial_id=commercial_id + 1)
+        with self.assertRaises(Exception) as context:
+            self.contract_dao.update_contract(contract_id + 1000, 1.0, 0.0, False)
+        self.assertIn("Contract not found", str(context.exception))
+        self.assertEqual(self.contract_dao.get_contract_by_id(contract_id).total_amount, 2000.0)
+        self.session.query(Contract).delete()
+        self.session.query(User).filter(User.id == commercial_id).delete()
+        self.session.commit()
+
+    def test_delete_contract_with_events_is_refused(self):
+        """Test that a contract still referenced by an event is not deleted."""
+        contract = Contract(client_id=self.client.id, total_amount=1200.0, amount_remaining=0.0, signed=True)
+        self.contract_dao.add_contract(contract)
+        contract_id = contract.id
+        event = Event(contract_id=contract_id, start_date=date(2024, 8, 10), end_date=date(2024, 8, 11),
+                      location="Hall", attendees=10)
+        self.session.add(event)
+        self.session.commit()
+        with self.assertRaises(Exception) as context:
+            self.contract_dao.delete_contract(contract_id)
+        self.assertIn("Contract has events", str(context.exception))
+        self.assertIsNotNone(self.contract_dao.get_contract_by_id(contract_id))
+
+        self.session.delete(event)
+        self.session.commit()
+        trace = SQLTrace().attach(self.engine)
+        try:
+            self.contract_dao.delete_contract(contract_id)
+        finally:
+            trace.detach()
+        self.assertEqual(trace.summary()["queries"], 1)
+        with self.assertRaises(Exception) as context:
+            self.contract_dao.delete_contract(contract_id)
+        self.assertIn("Contract not found", str(context.exception))
 
 
 def test_delete_contract(self):
@@ -0,0 +1,96 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool, StaticPool
+from config import DB_MAX_OVERFLOW, DB_POOL_SIZE
+from database import engine_options
+from utils.pool_metrics import PoolMetrics, TimedQueuePool
+
+
+class TestEngineOptions(unittest.TestCase):
+    def test_file_database_uses_sized_queue_pool(self):
+        options = engine_options("sqlite:///crm.db", sqlite_pool_class=None)
+        self.assertIs(options["poolclass"], TimedQueuePool)
+        self.assertEqual(options["pool_size"], DB_POOL_SIZE)
+        self.assertIn("pool_pre_ping", options)
+        self.assertIn("pool_recycle", options)
+
+    def test_memory_database_keeps_sqlalchemy_default(self):
+        options = engine_options("sqlite://", sqlite_pool_class=None)
+        self.assertNotIn("poolclass", options)
+        self.assertNotIn("pool_size", options)
+
+    def test_sqlite_pool_class_setting(self):
+        options = engine_options("sqlite:///crm.db", sqlite_pool_class="NullPool")
+        self.assertIs(options["poolclass"], NullPool)
+        self.assertNotIn("pool_size", options)
+        options = engine_options("sqlite://", sqlite_pool_class="StaticPool")
+        self.assertIs(options["poolclass"], StaticPool)
+
+    def test_unknown_sqlite_pool_class(self):
+        with self.assertRaises(ValueError):
+            engine_options("sqlite:///crm.db", sqlite_pool_class="FastPool")
+
+    def test_server_database_ignores_sqlite_pool_class(self):
+        options = engine_options("postgresql://crm@localhost/crm", sqlite_pool_class="NullPool")
+        self.assertIs(options["poolclass"], TimedQueuePool)
+        self.assertEqual(options["max_overflow"], DB_MAX_OVERFLOW)
+
+
+class TestPoolMetrics(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(self.tmpdir.name, 'pool.db')}"
+        self.engine = create_engine(url, **engine_options(url, sqlite_pool_class=None))
+        self.metrics = PoolMetrics().attach(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_checkouts_and_waits(self):
+        with self.engine.connect() as first, self.engine.connect() as second:
+            first.execute(text("SELECT 1"))
+            second.execute(text("SELECT 1"))
+            stats = self.metrics.snapshot(self.engine.pool)
+            self.assertEqual(stats["checked_out"], 2)
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        stats = self.metrics.snapshot(self.engine.pool)
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["checkins"], 3)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["peak_checked_out"], 2)
+        # La troisième connexion réutilise une connexion du pool
+        self.assertEqual(stats["connects"], 2)
+        self.assertEqual(stats["waits"], 3)
+        self.assertEqual(stats["pool_checked_in"], 2)
+
+    def test_invalidated_connection_is_counted_and_replaced(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.invalidate()
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        stats = self.metrics.snapshot(self.engine.pool)
+        self.assertEqual(stats["invalidations"], 1)
+        self.assertEqual(stats["connects"], 2)
+
+    def test_metrics_survive_dispose(self):
+        self.engine.dispose()
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        self.assertEqual(self.metrics.snapshot()["waits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
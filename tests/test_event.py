@@ -25,9 +25,14 @@ from models.base import Base
 from models.client import Client
 from models.contract import Contract
 from models.event import Event
+from models.user import User
 from dao.client_dao import ClientDAO
 from dao.contract_dao import ContractDAO
 from dao.event_dao import EventDAO
+from utils.scheduling import assign_intervals, find_overlaps
+from services.assignment_service import auto_assign
+from utils.output import event_row
+from utils.sql_trace import SQLTrace
 from config import TEST_DATABASE_URL
 from datetime import date
 
@@ -54,6 +59,7 @@ class TestEventDAO(unittest.TestCase):
         self.session.query(Event).delete()
         self.session.query(Contract).delete()
         self.session.query(Client).delete()
+        self.session.query(User).delete()
         self.session.commit()
 
         client_email = generate_unique_email("test.client")
@@ -121,6 +127,145 @@ class TestEventDAO(unittest.TestCase):
         result = self.event_dao.get_all_events()
         self.assertEqual(len(result), 2)
 
+    def test_get_all_events_with_related(self):
+        """Test that a page of events with client names and contract status costs one query."""
+        for day in (10, 11, 12):
+            self.event_dao.add_event(
+                Event(contract_id=self.contract.id, start_date=date(2024, 8, day), end_date=date(2024, 8, day))
+            )
+        session = self.Session()
+        trace = SQLTrace().attach(self.engine)
+        try:
+            rows = [event_row(event) for event in EventDAO(session).get_all_events(with_related=True)]
+        finally:
+            trace.detach()
+            session.close()
+        self.assertEqual(trace.summary()["queries"], 1)
+        self.assertEqual({row["client_name"] for row in rows}, {"Test Client"})
+        self.assertEqual({row["contract_status"] for row in rows}, {"Signed, unpaid"})
+
+    def test_get_events_for_support(self):
+        """Test retrieving the events assigned to a support user."""
+        support = User(
+            employee_number=4242,
+            name="Support",
+            email=generate_unique_email("support"),
+            password_hash="hash",
+            role="SUPPORT",
+        )
+        self.session.add(support)
+        self.session.commit()
+        assigned = Event(
+            contract_id=self.contract.id,
+            start_date=date(2024, 8, 10),
+            end_date=date(2024, 8, 11),
+            support_user_id=support.id,
+        )
+        unassigned = Event(
+            contract_id=self.contract.id,
+            start_date=date(2024, 9, 10),
+            end_date=date(2024, 9, 11),
+        )
+        self.event_dao.add_event(assigned)
+        self.event_dao.add_event(unassigned)
+        result = self.event_dao.get_events_for_support(support.id)
+        self.assertEqual([e.id for e in result], [assigned.id])
+
+    def test_find_conflicts(self):
+        """Test detecting overlapping events per support user."""
+        supports = [
+            User(employee_number=n, name=f"Support {n}", email=generate_unique_email("support"),
+                 password_hash="hash", role="SUPPORT")
+            for n in (4243, 4244)
+        ]
+        self.session.add_all(supports)
+        self.session.commit()
+        first, second = supports
+
+        def book(support, start, end):
+            event = Event(contract_id=self.contract.id, start_date=start, end_date=end,
+                          support_user_id=support.id)
+            self.event_dao.add_event(event)
+            return event
+
+        a = book(first, date(2024, 8, 1), date(2024, 8, 5))
+        b = book(first, date(2024, 8, 5), date(2024, 8, 6))  # Même jour que la fin de `a`
+        c = book(first, date(2024, 8, 10), date(2024, 8, 12))
+        book(second, date(2024, 8, 1), date(2024, 8, 5))  # Autre support : pas de conflit
+
+        pairs = self.event_dao.find_conflicts()
+        self.assertEqual([(x.id, y.id) for x, y in pairs], [(a.id, b.id)])
+        self.assertEqual(self.event_dao.find_conflicts(date_from=date(2024, 8, 7)), [])
+
+        overlapping = self.event_dao.get_conflicting_events(first.id, date(2024, 8, 4), date(2024, 8, 11))
+        self.assertEqual([e.id for e in overlapping], [a.id, b.id, c.id])
+        overlapping = self.event_dao.get_conflicting_events(
+            first.id, date(2024, 8, 10), date(2024, 8, 12), exclude_event_id=c.id
+        )
+        self.assertEqual(overlapping, [])
+
+    def test_find_overlaps_sweep(self):
+        """Test the sweep line on nested and chained intervals."""
+        intervals = [(1, 10, "long"), (2, 3, "inner"), (4, 5, "second inner"), (11, 12, "after")]
+        self.assertEqual(
+            list(find_overlaps(intervals)),
+            [("long", "inner"), ("long", "second inner")],
+        )
+
+    def test_assign_intervals_balances_load(self):
+        """Test the greedy assignment: no overlap, busy intervals respected, even load."""
+        intervals = [(1, 2, "a"), (1, 2, "b"), (3, 4, "c"), (3, 4, "d"), (3, 4, "e")]
+        assignments, unassigned = assign_intervals(intervals, ["x", "y"], busy={"y": [(4, 6)]})
+        self.assertEqual(assignments, {"a": "x", "b": "y", "c": "x"})
+        self.assertEqual(unassigned, ["d", "e"])
+
+    def test_auto_assign(self):
+        """Test assigning unstaffed events to support users in one go."""
+        first, second = (
+            User(employee_number=n, name=f"Support {n}", email=generate_unique_email("support"),
+                 password_hash="hash", role="SUPPORT")
+            for n in (4245, 4246)
+        )
+        self.session.add_all([first, second])
+        self.session.commit()
+        booked = Event(contract_id=self.contract.id, start_date=date(2024, 8, 1),
+                       end_date=date(2024, 8, 3), support_user_id=first.id)
+        self.event_dao.add_event(booked)
+        unstaffed = [
+            Event(contract_id=self.contract.id, start_date=date(2024, 8, day), end_date=date(2024, 8, day))
+            for day in (2, 4, 5)
+        ]
+        for event in unstaffed:
+            self.event_dao.add_event(event)
+
+        result = auto_assign(self.session, dry_run=True)
+        self.assertEqual(result["assigned"], 3)
+        self.assertIsNone(self.event_dao.get_event_by_id(unstaffed[0].id).support_user_id)
+
+        result = auto_assign(self.session)
+        self.assertEqual(result["unassigned"], [])
+        self.session.expire_all()
+        supports = [self.event_dao.get_event_by_id(e.id).support_user_id for e in unstaffed]
+        # Le 2 août, `first` est déjà pris ; ensuite la charge est équilibrée
+        self.assertEqual(supports, [second.id, first.id, second.id])
+        self.assertEqual(self.event_dao.find_conflicts(), [])
+
+    def test_auto_assign_sees_bookings_past_the_window(self):
+        """Test that an unstaffed event crossing --to is not given to a support booked just after --to."""
+        support = User(employee_number=4247, name="Only support", email=generate_unique_email("support"),
+                       password_hash="hash", role="SUPPORT")
+        self.session.add(support)
+        self.session.commit()
+        self.event_dao.add_event(Event(contract_id=self.contract.id, start_date=date(2024, 9, 2),
+                                       end_date=date(2024, 9, 3), support_user_id=support.id))
+        crossing = Event(contract_id=self.contract.id, start_date=date(2024, 8, 30), end_date=date(2024, 9, 2))
+        self.event_dao.add_event(crossing)
+        crossing_id = crossing.id
+
+        result = auto_assign(self.session, date(2024, 8, 1), date(2024, 8, 31))
+        self.assertEqual((result["assigned"], result["unassigned"]), (0, [crossing_id]))
+        self.assertEqual(self.event_dao.find_conflicts(), [])
+
     def test_update_event(self):
         """Test updating an event."""
         event = Event(
@@ -154,6 +299,33 @@ class TestEventDAO(unittest.TestCase):
         with self.assertRaises(Exception):
             self.event_dao.get_event_by_id(event.id)
 
+    def test_update_and_delete_single_statement(self):
+        """Test that an update and a delete each run one statement and report missing events."""
+        event = Event(contract_id=self.contract.id, start_date=date(2024, 8, 10), end_date=date(2024, 8, 11),
+                      location="Test Location", attendees=100, notes="Test Notes")
+        self.event_dao.add_event(event)
+        event_id = event.id
+
+        for write in (
+            lambda: self.event_dao.update_event(
+                event_id, date(2024, 8, 12), date(2024, 8, 13), None, "Updated Location", 50, "Moved"
+            ),
+            lambda: self.event_dao.delete_event(event_id),
+        ):
+            trace = SQLTrace().attach(self.engine)
+            try:
+                write()
+            finally:
+                trace.detach()
+            self.assertEqual(trace.summary()["queries"], 1)
+        for call in (
+            lambda: self.event_dao.update_event(event_id, None, None, None, "X", 0, ""),
+            lambda: self.event_dao.delete_event(event_id),
+        ):
+            with self.assertRaises(Exception) as context:
+                call()
+            self.assertIn("Event not found", str(context.exception))
+
 
 if __name__ == "__main__":
     unittest.main()
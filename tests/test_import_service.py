@@ -0,0 +1,79 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.user import User
+from services.import_service import import_collaborators
+from config import TEST_DATABASE_URL
+
+PASSWORD = "Sup3r-secret-pw"
+
+
+class TestImportCollaborators(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.create_all(cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    def setUp(self):
+        self.session = self.Session()
+        self.session.query(User).delete()
+        self.session.commit()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.session.rollback()
+        self.session.close()
+        self.tmpdir.cleanup()
+
+    @classmethod
+    def tearDownClass(cls):
+        Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+
+    def import_file(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        with patch("utils.security.hash_password", return_value="hash"):
+            result = import_collaborators(self.session, path, workers=1)
+        with open(result["rejects_path"], encoding="utf-8") as file:
+            return result, file.read()
+
+    def test_rejects_never_contain_passwords(self):
+        """Test that malformed lines and extra CSV columns are rejected without their password."""
+        valid = {"employee_number": 1, "name": "Ann", "email": "ann@example.com",
+                 "password": PASSWORD, "role": "SALES"}
+        result, rejects = self.import_file(
+            "users.jsonl",
+            json.dumps(valid) + "\n"
+            + '{"employee_number": 2, "name": "Bob", "password": "' + PASSWORD + '"\n'  # JSON tronqué
+            + json.dumps([PASSWORD]) + "\n"
+            + json.dumps(dict(valid, employee_number=3, email="bad", Password=PASSWORD)) + "\n",
+        )
+        self.assertEqual((result["inserted"], result["rejected"]), (1, 3))
+        self.assertNotIn(PASSWORD, rejects)
+        self.assertEqual([json.loads(line)["line"] for line in rejects.splitlines()], [2, 3, 4])
+
+        # Colonne surnuméraire (clé None de csv.DictReader) sur une ligne rejetée
+        result, rejects = self.import_file(
+            "users.csv",
+            "employee_number,name,email,password,role\n"
+            f"4,Cid,not-an-email,{PASSWORD},SALES,{PASSWORD}\n",
+        )
+        self.assertEqual(result["rejected"], 1)
+        self.assertNotIn(PASSWORD, rejects)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+from models.base import Base
+from models.client_search import POSTGRESQL_SEARCH_INDEX, SQLITE_SEARCH_TABLE, include_object
+from config import TEST_DATABASE_URL
+
+
+def diff_names(diffs):
+    """Flatten alembic diffs to the names of the tables and indexes they touch."""
+    names = set()
+    for diff in diffs:
+        # Les modifications de colonnes sont des listes de tuples, les autres des tuples
+        for change in diff if isinstance(diff, list) else [diff]:
+            for item in change[1:]:
+                name = getattr(item, "name", None)
+                if isinstance(name, str):
+                    names.add(name)
+    return names
+
+
+def is_search_object(name):
+    return name.startswith(SQLITE_SEARCH_TABLE) or name == POSTGRESQL_SEARCH_INDEX
+
+
+class TestAutogenerate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.drop_all(cls.engine)
+        Base.metadata.create_all(cls.engine)
+
+    @classmethod
+    def tearDownClass(cls):
+        Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+
+    def compare(self, **opts):
+        with self.engine.connect() as connection:
+            return compare_metadata(MigrationContext.configure(connection, opts=opts), Base.metadata)
+
+    def test_search_objects_are_not_dropped(self):
+        """Test that autogenerate leaves the search table and index created outside Base.metadata alone."""
+        # Sans le filtre, autogenerate proposerait de les supprimer
+        self.assertTrue(any(is_search_object(name) for name in diff_names(self.compare())))
+        names = diff_names(self.compare(include_object=include_object))
+        self.assertEqual([name for name in names if is_search_object(name)], [])
+
+    def test_other_objects_are_kept(self):
+        """Test that the filter only hides the search objects."""
+        self.assertTrue(include_object(None, "clients", "table", True, None))
+        self.assertTrue(include_object(None, "ix_clients_email", "index", True, None))
+        self.assertFalse(include_object(None, f"{SQLITE_SEARCH_TABLE}_data", "table", True, None))
+        self.assertFalse(include_object(None, POSTGRESQL_SEARCH_INDEX, "index", True, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.user import User
+from models.client import Client
+from models.contract import Contract
+from models.event import Event
+from dao.report_dao import ReportDAO
+from config import TEST_DATABASE_URL
+
+
+class TestReportDAO(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.create_all(cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    def setUp(self):
+        self.session = self.Session()
+        for model in (Event, Contract, Client, User):
+            self.session.query(model).delete()
+        self.session.commit()
+
+        self.session.add_all(
+            [
+                User(id=1, employee_number=1, name="Alice", email="alice@example.com",
+                     password_hash="x", role="SALES"),
+                User(id=2, employee_number=2, name="Bob", email="bob@example.com",
+                     password_hash="x", role="SALES"),
+                Client(id=1, full_name="Acme", email="acme@example.com", commercial_contact=1),
+                Client(id=2, full_name="Globex", email="globex@example.com", commercial_contact=2),
+            ]
+        )
+        self.session.flush()
+        self.session.add_all(
+            [
+                Contract(client_id=1, commercial_id=1, total_amount=1000, amount_remaining=200, signed=True),
+                Contract(client_id=1, commercial_id=1, total_amount=500, amount_remaining=500, signed=False),
+                Contract(client_id=2, commercial_id=2, total_amount=300, amount_remaining=0, signed=True),
+                Contract(client_id=2, commercial_id=None, total_amount=50, amount_remaining=50, signed=True),
+            ]
+        )
+        self.session.commit()
+        self.report_dao = ReportDAO(self.session)
+
+    def tearDown(self):
+        self.session.rollback()
+        self.session.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+
+    def test_revenue_by_commercial(self):
+        """Test signed revenue, collected amount and balance per commercial."""
+        report = self.report_dao.revenue_by_commercial()
+        self.assertEqual(
+            [(r["commercial_name"], r["contracts"], r["revenue"], r["collected"], r["outstanding"])
+             for r in report],
+            [("Alice", 1, 1000.0, 800.0, 200.0), ("Bob", 1, 300.0, 300.0, 0.0),
+             ("Unassigned", 1, 50.0, 0.0, 50.0)],
+        )
+
+    def test_revenue_with_only_unsigned_contracts(self):
+        """Test that a commercial without signed contracts has zero revenue and comes last."""
+        self.session.add(User(id=3, employee_number=3, name="Carol", email="carol@example.com",
+                              password_hash="x", role="SALES"))
+        self.session.add(Contract(client_id=2, commercial_id=3, total_amount=900, amount_remaining=900, signed=False))
+        self.session.commit()
+        report = self.report_dao.revenue_by_commercial()
+        self.assertEqual(
+            [(r["commercial_name"], r["revenue"]) for r in report],
+            [("Alice", 1000.0), ("Bob", 300.0), ("Unassigned", 50.0), ("Carol", 0.0)],
+        )
+        self.assertEqual((report[-1]["contracts"], report[-1]["collected"], report[-1]["outstanding"]), (0, 0.0, 0.0))
+
+    def test_receivables_by_client(self):
+        """Test the outstanding balance per client, largest first."""
+        report = self.report_dao.receivables_by_client()
+        self.assertEqual(
+            [(r["full_name"], r["contracts"], r["outstanding"]) for r in report],
+            [("Acme", 2, 700.0), ("Globex", 1, 50.0)],
+        )
+        self.assertEqual(len(self.report_dao.receivables_by_client(limit=1)), 1)
+
+    def test_signed_summary(self):
+        """Test the signed versus unsigned totals."""
+        report = self.report_dao.signed_summary()
+        self.assertEqual(
+            report,
+            [
+                {"signed": True, "contracts": 3, "total_amount": 1350.0, "amount_remaining": 250.0},
+                {"signed": False, "contracts": 1, "total_amount": 500.0, "amount_remaining": 500.0},
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
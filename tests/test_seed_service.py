@@ -0,0 +1,115 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.user import User
+from models.client import Client
+from models.contract import Contract
+from models.event import Event
+from dao.client_dao import ClientDAO
+from dao.user_dao import UserDAO
+from services.seed_service import TABLE_COLUMNS, generate_rows, seed_database, seed_user_email
+from utils.validation import validate_email
+from config import TEST_DATABASE_URL
+
+# Un hachage factice : Argon2 n'est pas ce que ces tests vérifient
+FAKE_HASH = "hash"
+
+
+class TestSeedService(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.drop_all(self.engine)
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+
+    def tearDown(self):
+        self.session.close()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def seed(self, **options):
+        volumes = {"users": 20, "clients": 100, "contracts": 300, "events": 500, "batch_size": 64}
+        with patch("utils.security.hash_password", return_value=FAKE_HASH):
+            return seed_database(self.engine, **dict(volumes, **options))
+
+    def test_volumes_and_relations(self):
+        """Test the row counts and that owners have the expected role."""
+        timings = self.seed()
+        self.assertEqual({table: rows for table, (rows, _) in timings.items() if table != "indexes"},
+                         {"users": 20, "clients": 100, "contracts": 300, "events": 500})
+        roles = dict(self.session.query(User.id, User.role))
+        self.assertEqual(roles[1], "MANAGEMENT")
+        commercial_of = dict(self.session.query(Client.id, Client.commercial_contact))
+        self.assertTrue(all(roles[user_id] == "SALES" for user_id in commercial_of.values()))
+        for contract in self.session.query(Contract):
+            self.assertEqual(contract.commercial_id, commercial_of[contract.client_id])
+            self.assertLessEqual(contract.amount_remaining, contract.total_amount)
+        for event in self.session.query(Event):
+            if event.support_user_id is not None:
+                self.assertEqual(roles[event.support_user_id], "SUPPORT")
+            self.assertLessEqual((event.end_date - event.start_date).days, 2)
+
+    def test_indexes_and_search_are_restored(self):
+        """Test that the indexes dropped for the load exist again and the search index is filled."""
+        expected = {index.name for index in Base.metadata.tables["events"].indexes}
+        self.seed()
+        self.assertTrue(expected <= {index["name"] for index in inspect(self.engine).get_indexes("events")})
+        client = self.session.get(Client, 1)
+        found = ClientDAO(self.session).search_clients(client.full_name, limit=1000)
+        self.assertIn(1, [c.id for c in found])
+
+        # Les triggers recréés tiennent l'index de recherche à jour
+        ClientDAO(self.session).add_client_from_params(
+            "Zéphyrin Quasimodo", "zq@example.com", "0600000000", None, 2
+        )
+        self.assertEqual(len(ClientDAO(self.session).search_clients("Quasimodo")), 1)
+
+    def test_same_seed_same_rows(self):
+        """Test that the rows only depend on the seed, not on the batches or workers."""
+        plan = {"users": 20, "clients": 100, "contracts": 300, "events": 500, "seed": 7, "password_hash": "x"}
+        self.assertEqual(generate_rows(plan, "events", 1, 51), generate_rows(plan, "events", 1, 51))
+        self.assertNotEqual(generate_rows(plan, "events", 1, 51), generate_rows(dict(plan, seed=8), "events", 1, 51))
+
+        # updated_at vaut l'heure du chargement : seules les colonnes générées sont comparées
+        query = text(f"SELECT {', '.join(TABLE_COLUMNS['events'])} FROM events ORDER BY id")
+        self.seed(seed=7, workers=2)
+        rows = self.session.execute(query).fetchall()
+        self.session.close()
+        Base.metadata.drop_all(self.engine)
+        Base.metadata.create_all(self.engine)
+        self.seed(seed=7, workers=1)
+        self.assertEqual(rows, self.session.execute(query).fetchall())
+
+    def test_generated_emails_are_valid(self):
+        """Test that every generated email passes the validation used by `client add`."""
+        plan = {"users": 20, "clients": 500, "contracts": 0, "events": 0, "seed": 7, "password_hash": "x"}
+        emails = [row[3] for row in generate_rows(plan, "users", 1, 21)]
+        emails += [row[2] for row in generate_rows(plan, "clients", 1, 501)]
+        self.assertEqual([email for email in emails if not validate_email(email)], [])
+
+    def test_seeded_users_can_log_in(self):
+        """Test that every generated user shares the given password."""
+        seed_database(self.engine, users=3, clients=0, contracts=0, events=0, password="pw")
+        user = UserDAO(self.session).authenticate_user(seed_user_email(3), "pw")
+        self.assertEqual(user.role, "SUPPORT")
+
+    def test_refuses_non_empty_database(self):
+        """Test that seeding twice fails without touching the existing rows or indexes."""
+        self.seed()
+        with self.assertRaises(Exception) as context:
+            self.seed()
+        self.assertIn("not empty", str(context.exception))
+        self.assertEqual(self.session.query(Event).count(), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+import sentry_sdk
+from sentry_sdk.transport import Transport
+import sentry
+
+TEST_DSN = "https://public@sentry.invalid/1"
+
+
+class CapturingTransport(Transport):
+    """Local stand-in transport keeping envelopes in memory instead of sending them."""
+
+    def __init__(self, options=None):
+        super().__init__(options)
+        self.envelopes = []
+
+    def capture_envelope(self, envelope):
+        self.envelopes.append(envelope)
+
+    def item_types(self):
+        return [item.type for envelope in self.envelopes for item in envelope.items]
+
+
+class TestSentry(unittest.TestCase):
+    def setUp(self):
+        self.transport = CapturingTransport()
+
+    def tearDown(self):
+        # Remet le SDK dans son état non initialisé pour le test suivant
+        sentry_sdk.get_client().close()
+        sentry_sdk.get_global_scope().set_client(None)
+        sentry._init_thread = None
+
+    def test_options_come_from_config(self):
+        """Test that sample rates default to config.py and can be overridden."""
+        options = sentry.sentry_options()
+        self.assertEqual(options["traces_sample_rate"], sentry.SENTRY_TRACES_SAMPLE_RATE)
+        self.assertEqual(options["profiles_sample_rate"], sentry.SENTRY_PROFILES_SAMPLE_RATE)
+        self.assertEqual(sentry.sentry_options(traces_sample_rate=0.25)["traces_sample_rate"], 0.25)
+
+    def test_disabled_mode(self):
+        """Test that a disabled Sentry is never initialized."""
+        result = sentry.call_sentry(enabled=False, dsn=TEST_DSN, transport=self.transport)
+        self.assertIsNone(result)
+        self.assertFalse(sentry_sdk.get_client().is_active())
+
+    def test_missing_dsn_disables_sentry(self):
+        """Test that no DSN means no initialization."""
+        self.assertIsNone(sentry.call_sentry(enabled=True, dsn=None))
+        self.assertFalse(sentry_sdk.get_client().is_active())
+
+    def test_background_initialization(self):
+        """Test that Sentry initializes in a background thread and reports events."""
+        thread = sentry.call_sentry(enabled=True, dsn=TEST_DSN, transport=self.transport)
+        self.assertIsNotNone(thread)
+        thread.join(timeout=10)
+        self.assertTrue(sentry_sdk.get_client().is_active())
+        # Un second appel réutilise l'initialisation déjà lancée
+        self.assertIs(sentry.call_sentry(enabled=True, dsn=TEST_DSN), thread)
+
+        sentry_sdk.capture_message("background init works")
+        sentry_sdk.flush()
+        self.assertIn("event", self.transport.item_types())
+
+    def test_zero_traces_sample_rate_sends_no_transaction(self):
+        """Test that traces_sample_rate=0 drops every transaction."""
+        sentry.call_sentry(
+            enabled=True,
+            background=False,
+            dsn=TEST_DSN,
+            transport=self.transport,
+            traces_sample_rate=0.0,
+        )
+        with sentry_sdk.start_transaction(name="client list"):
+            pass
+        sentry_sdk.flush()
+        self.assertNotIn("transaction", self.transport.item_types())
+
+    def test_full_traces_sample_rate_sends_transaction(self):
+        """Test that traces_sample_rate=1 keeps every transaction."""
+        sentry.call_sentry(
+            enabled=True,
+            background=False,
+            dsn=TEST_DSN,
+            transport=self.transport,
+            traces_sample_rate=1.0,
+        )
+        with sentry_sdk.start_transaction(name="client list"):
+            pass
+        sentry_sdk.flush()
+        self.assertIn("transaction", self.transport.item_types())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+import unittest
+import http.client
+import json
+import os
+import socket
+import sys
+import threading
+from datetime import datetime
+from unittest.mock import patch
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.user import User
+from models.client import Client
+from models.contract import Contract
+from models.event import Event
+from utils.security import hash_password
+import database
+import utils.auth
+from dao.user_dao import UserDAO
+from server import make_server
+from config import TEST_DATABASE_URL
+
+PASSWORD = "secret-password"
+
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.create_all(cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine)
+        cls.password_hash = hash_password(PASSWORD)
+        # Le serveur et l'authentification ouvrent leurs sessions via database.Session()
+        cls._previous_factory = database._session_factory
+        database._session_factory = cls.Session
+        cls.httpd = make_server("127.0.0.1", 0)
+        cls.port = cls.httpd.server_address[1]
+        cls.thread = threading.Thread(target=cls.httpd.serve_forever, daemon=True)
+        cls.thread.start()
+
+    def setUp(self):
+        utils.auth._token_versions.clear()
+        session = self.Session()
+        for model in (Event, Contract, Client, User):
+            session.query(model).delete()
+        session.commit()
+
+        password_hash = self.password_hash
+        session.add_all(
+            [
+                User(id=1, employee_number=1, name="Mia", email="mia@example.com",
+                     password_hash=password_hash, role="MANAGEMENT"),
+                User(id=2, employee_number=2, name="Sal", email="sal@example.com",
+                     password_hash=password_hash, role="SALES"),
+                User(id=3, employee_number=3, name="Sam", email="sam@example.com",
+                     password_hash=password_hash, role="SUPPORT"),
+            ]
+            + [
+                Client(id=i, full_name=f"Client {i}", email=f"client{i}@example.com", commercial_contact=2)
+                for i in range(1, 6)
+            ]
+        )
+        session.flush()
+        session.add(Contract(id=1, client_id=1, commercial_id=2, total_amount=100, amount_remaining=0, signed=True))
+        session.flush()
+        session.add_all(
+            [
+                Event(id=1, contract_id=1, support_user_id=3, attendees=5,
+                      start_date=datetime(2026, 1, 1), end_date=datetime(2026, 1, 2)),
+                Event(id=2, contract_id=1, support_user_id=None, attendees=5,
+                      start_date=datetime(2026, 2, 1), end_date=datetime(2026, 2, 2)),
+            ]
+        )
+        session.commit()
+        session.close()
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+
+    def tearDown(self):
+        self.conn.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+        database._session_factory = cls._previous_factory
+        Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+
+    def request(self, method, path, token=None, body=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def login(self, email):
+        status, body = self.request("POST", "/login", body={"email": email, "password": PASSWORD})
+        self.assertEqual(status, 200)
+        return body["token"]
+
+    def test_keep_alive(self):
+        """Test that successive requests reuse the same connection."""
+        self.assertEqual(self.request("GET", "/health"), (200, {"status": "ok"}))
+        sock = self.conn.sock
+        self.assertEqual(self.request("GET", "/health")[0], 200)
+        self.assertIs(self.conn.sock, sock)
+
+    def test_login_with_invalid_credentials(self):
+        """Test that a wrong password is refused."""
+        status, body = self.request("POST", "/login", body={"email": "mia@example.com", "password": "nope"})
+        self.assertEqual(status, 401)
+        self.assertEqual(body["error"], "Invalid credentials")
+
+    def test_paginated_clients(self):
+        """Test keyset pagination of the client list."""
+        token = self.login("sal@example.com")
+        status, body = self.request("GET", "/clients?page_size=2", token)
+        self.assertEqual(status, 200)
+        self.assertEqual([c["id"] for c in body["items"]], [1, 2])
+        self.assertEqual(body["next_after_id"], 2)
+
+        status, body = self.request("GET", "/clients?page_size=2&after_id=4", token)
+        self.assertEqual([c["id"] for c in body["items"]], [5])
+        self.assertIsNone(body["next_after_id"])
+
+    def test_role_rules(self):
+        """Test that the endpoints apply the role rules of the CLI commands."""
+        self.assertEqual(self.request("GET", "/clients")[0], 401)
+        self.assertEqual(self.request("GET", "/clients", "not-a-token")[0], 401)
+        sales = self.login("sal@example.com")
+        self.assertEqual(self.request("GET", "/collaborators", sales)[0], 403)
+        self.assertEqual(self.request("GET", "/events", sales)[0], 403)
+        management = self.login("mia@example.com")
+        self.assertEqual(self.request("GET", "/collaborators", management)[0], 200)
+
+    def test_support_sees_own_events(self):
+        """Test that support users only list the events assigned to them."""
+        status, body = self.request("GET", "/events", self.login("sam@example.com"))
+        self.assertEqual(status, 200)
+        self.assertEqual([e["id"] for e in body["items"]], [1])
+        status, body = self.request("GET", "/events", self.login("mia@example.com"))
+        self.assertEqual([e["id"] for e in body["items"]], [1, 2])
+
+    def test_invalid_requests(self):
+        """Test the errors returned for bad parameters and unknown routes."""
+        token = self.login("mia@example.com")
+        self.assertEqual(self.request("GET", "/clients?page_size=0", token)[0], 400)
+        self.assertEqual(self.request("GET", "/clients/search?q=ab", token)[0], 400)
+        self.assertEqual(self.request("GET", "/clients/99", token)[0], 404)
+        self.assertEqual(self.request("GET", "/nowhere", token)[0], 404)
+        self.assertEqual(self.request("POST", "/clients", token, body={})[0], 405)
+        # La connexion reste utilisable après une erreur
+        self.assertEqual(self.request("GET", "/health")[0], 200)
+
+
+    def test_revoked_tokens_are_refused_at_once(self):
+        """Test that a role change or a deletion through the DAO revokes tokens despite the version cache."""
+        for email, change in (
+            ("sal@example.com", lambda dao: dao.update_user(2, role="SUPPORT")),
+            ("mia@example.com", lambda dao: dao.delete_user(1)),
+        ):
+            with self.subTest(email=email):
+                token = self.login(email)
+                # Le premier contrôle met la version du token en cache
+                utils.auth.authorize(token)
+                session = self.Session()
+                try:
+                    change(UserDAO(session))
+                finally:
+                    session.close()
+                with self.assertRaises(utils.auth.AuthError):
+                    utils.auth.authorize(token)
+
+    def raw_request(self, content_length):
+        """Send a POST /login with the given Content-Length header; return the response and what follows."""
+        with socket.create_connection(("127.0.0.1", self.port), timeout=10) as sock:
+            sock.sendall(
+                f"POST /login HTTP/1.1\r\nHost: localhost\r\nContent-Length: {content_length}\r\n\r\n{{}}".encode()
+            )
+            data = b""
+            while chunk := sock.recv(4096):
+                data += chunk
+        return data
+
+    def test_invalid_content_length(self):
+        """Test that a bad Content-Length gets a 400 and the connection is closed."""
+        for content_length in ("abc", "-5"):
+            with self.subTest(content_length=content_length):
+                # recv() ne rend b"" qu'une fois la connexion fermée par le serveur
+                response = self.raw_request(content_length)
+                self.assertTrue(response.startswith(b"HTTP/1.1 400"))
+                self.assertIn(b"Invalid Content-Length header", response)
+
+    def test_internal_error_is_not_echoed(self):
+        """Test that an unexpected error returns a generic message and is logged."""
+        token = self.login("mia@example.com")
+        detail = "Error retrieving all clients: (sqlite3.OperationalError) no such column"
+        with patch("dao.client_dao.ClientDAO.get_all_clients", side_effect=Exception(detail)), \
+                self.assertLogs("server", "ERROR") as logs:
+            status, body = self.request("GET", "/clients", token)
+        self.assertEqual((status, body), (500, {"error": "Internal server error"}))
+        self.assertIn(detail, "\n".join(logs.output))
+
+if __name__ == "__main__":
+    unittest.main()
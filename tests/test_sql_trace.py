@@ -0,0 +1,113 @@
+import unittest
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from rich.console import Console
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from models.base import Base
+from models.user import User
+from models.client import Client
+from models.contract import Contract
+from utils.sql_trace import SQLTrace
+from config import TEST_DATABASE_URL
+
+
+class TestSQLTrace(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.create_all(cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    def setUp(self):
+        self.session = self.Session()
+        for model in (Contract, Client, User):
+            self.session.query(model).delete()
+        self.session.add_all(
+            [Client(id=i, full_name=f"Client {i}", email=f"client{i}@example.com") for i in range(1, 7)]
+        )
+        self.session.flush()
+        self.session.add_all(
+            [Contract(id=i, client_id=i, total_amount=100, amount_remaining=0, signed=True) for i in range(1, 7)]
+        )
+        self.session.commit()
+        self.session.close()
+        self.session = self.Session()
+        self.trace = SQLTrace(repeat_threshold=5).attach(self.engine)
+
+    def tearDown(self):
+        self.trace.detach()
+        self.session.rollback()
+        self.session.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+
+    def test_lazy_loads_are_flagged_as_n_plus_one(self):
+        """Test that one lazy load per row is reported as an N+1 suspect."""
+        contracts = self.session.query(Contract).all()
+        names = [contract.client.full_name for contract in contracts]
+
+        self.assertEqual(len(names), 6)
+        summary = self.trace.summary("contract list")
+        self.assertEqual(summary["command"], "contract list")
+        self.assertEqual(summary["queries"], 7)
+        self.assertEqual(summary["distinct_statements"], 2)
+        self.assertEqual(len(summary["n_plus_one"]), 1)
+        self.assertEqual(summary["n_plus_one"][0]["count"], 6)
+        self.assertIn("FROM clients", summary["n_plus_one"][0]["statement"])
+        self.assertGreater(summary["slowest"]["ms"], 0)
+
+    def test_few_repeats_are_not_flagged(self):
+        """Test that statements repeated fewer times than the threshold are not flagged."""
+        for client_id in range(1, 5):
+            self.session.get(Client, client_id)
+        self.assertEqual(self.trace.summary()["queries"], 4)
+        self.assertEqual(self.trace.repeated(), [])
+
+    def test_failed_statement_is_not_counted(self):
+        """Test that a failing statement does not break the following measurements."""
+        with self.engine.connect() as conn:
+            with self.assertRaises(Exception):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.rollback()
+            conn.execute(text("SELECT 1"))
+        self.assertEqual(self.trace.summary()["queries"], 1)
+
+    def test_detach_stops_recording(self):
+        """Test that statements run after detach() are ignored."""
+        self.session.get(Client, 1)
+        self.trace.detach()
+        self.session.get(Client, 2)
+        self.assertEqual(self.trace.summary()["queries"], 1)
+
+    def test_report_and_json(self):
+        """Test the console summary and the JSON file for CI."""
+        for contract in self.session.query(Contract).all():
+            contract.client
+        out = io.StringIO()
+        self.trace.report(Console(file=out, width=200))
+        self.assertIn("SQL: 7 queries (2 distinct)", out.getvalue())
+        self.assertIn("N+1 suspect: 6 x SELECT", out.getvalue())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trace.json")
+            self.trace.write_json(path, "contract list")
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+        self.assertEqual(data["queries"], 7)
+        self.assertEqual(sum(item["count"] for item in data["statements"]), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,6 +24,9 @@ from sqlalchemy.orm import sessionmaker
 from models.base import Base
 from models.user import User
 from dao.user_dao import UserDAO
+from dao.user_cache import UserCache
+from argon2 import PasswordHasher
+from utils.security import hash_password, needs_rehash, verify_password
 from config import TEST_DATABASE_URL
 
 
@@ -102,6 +105,22 @@ class TestUserDAO(unittest.TestCase):
         self.assertEqual(updated_user.name, "Charlie Brown")
         self.assertEqual(updated_user.role, "Development")
 
+    def test_role_change_bumps_token_version(self):
+        """Test that changing a role revokes the tokens already issued."""
+        email = generate_unique_email("frank")
+        user = self.user_dao.create_user(
+            employee_number="1415",
+            name="Frank",
+            email=email,
+            password="password131415",
+            role="SALES",
+        )
+        self.assertEqual(self.user_dao.get_token_version(user.id), 0)
+        self.user_dao.update_user(user.id, name="Franck", role="SALES")
+        self.assertEqual(self.user_dao.get_token_version(user.id), 0)
+        self.user_dao.update_user(user.id, role="SUPPORT")
+        self.assertEqual(self.user_dao.get_token_version(user.id), 1)
+
     def test_delete_user(self):
         """Test deleting a user by their ID."""
         email = generate_unique_email("dave")
@@ -116,6 +135,36 @@ class TestUserDAO(unittest.TestCase):
         result = self.user_dao.get_user_by_email(email)
         self.assertIsNone(result)
 
+    def test_bulk_create_users(self):
+        """Test inserting a batch of users and rejecting email/employee number conflicts."""
+        existing_email = generate_unique_email("grace")
+        self.user_dao.create_user(
+            employee_number="100", name="Grace", email=existing_email, password="pw", role="SALES"
+        )
+        rows = [
+            {"employee_number": 101, "name": "Heidi", "email": generate_unique_email("heidi"),
+             "password": "pw101", "role": "SUPPORT"},
+            {"employee_number": 102, "name": "Dup email", "email": existing_email,
+             "password": "pw102", "role": "SALES"},
+            {"employee_number": 100, "name": "Dup number", "email": generate_unique_email("ivan"),
+             "password": "pw103", "role": "SALES"},
+        ]
+        hashed = []
+
+        def hash_passwords(passwords):
+            hashed.extend(passwords)
+            return [hash_password(p) for p in passwords]
+
+        inserted, rejected = self.user_dao.bulk_create_users(rows, hash_passwords=hash_passwords)
+        self.assertEqual(inserted, 1)
+        self.assertEqual(
+            [(row["name"], error) for row, error in rejected],
+            [("Dup email", "Email already exists"), ("Dup number", "Employee number already exists")],
+        )
+        # Les lignes en conflit ne sont pas hachées
+        self.assertEqual(hashed, ["pw101"])
+        self.assertIsNotNone(self.user_dao.authenticate_user(rows[0]["email"], "pw101"))
+
     def test_user_authentication(self):
         """Test user authentication."""
         email = generate_unique_email("eve")
@@ -132,6 +181,104 @@ class TestUserDAO(unittest.TestCase):
         self.assertIsNotNone(authenticated_user)
         self.assertEqual(authenticated_user.name, "Eve")
 
+    def test_authentication_rehashes_outdated_hash(self):
+        """Test that a login upgrades a hash made with other Argon2 parameters."""
+        email = generate_unique_email("frank")
+        user = self.user_dao.create_user(
+            employee_number="9012",
+            name="Frank",
+            email=email,
+            password="password789",
+            role="SUPPORT",
+        )
+        # Hash produit avec des paramètres plus faibles que ceux de la configuration
+        weak_hasher = PasswordHasher(time_cost=1, memory_cost=8192, parallelism=1)
+        user.password_hash = weak_hasher.hash("password789")
+        self.session.commit()
+        version = user.token_version
+
+        authenticated_user = self.user_dao.authenticate_user(email=email, password="password789")
+        self.assertIsNotNone(authenticated_user)
+        self.assertFalse(needs_rehash(authenticated_user.password_hash))
+        self.assertTrue(verify_password(authenticated_user.password_hash, "password789"))
+        self.assertEqual(authenticated_user.token_version, version)
+
+
+class FakeClock:
+    """Clock advanced by hand to test the cache TTL."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestUserCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.create_all(cls.engine)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    def setUp(self):
+        self.session = self.Session()
+        self.session.query(User).delete()
+        self.session.commit()
+        self.clock = FakeClock()
+        self.cache = UserCache(max_size=2, ttl=60, clock=self.clock)
+        self.user = UserDAO(self.session).create_user(
+            employee_number="42", name="Judy", email=generate_unique_email("judy"),
+            password="pw", role="SALES",
+        )
+
+    def tearDown(self):
+        self.session.rollback()
+        self.session.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+
+    def dao(self):
+        """Return a DAO on a fresh session sharing the test cache."""
+        session = self.Session()
+        self.addCleanup(session.close)
+        return UserDAO(session, cache=self.cache)
+
+    def test_lookups_hit_the_cache(self):
+        """Test that repeated lookups by id and by email are served from the cache."""
+        self.assertEqual(self.dao().get_user_by_id(self.user.id).name, "Judy")
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 1, "size": 1})
+
+        cached = self.dao().get_user_by_id(self.user.id)
+        self.assertEqual(cached.email, self.user.email)
+        self.assertEqual(self.dao().get_user_by_email(self.user.email).id, self.user.id)
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_update_and_delete_invalidate(self):
+        """Test that writes through the DAO evict the cached user."""
+        dao = self.dao()
+        dao.get_user_by_id(self.user.id)
+        dao.update_user(self.user.id, name="Judith")
+        self.assertEqual(self.dao().get_user_by_id(self.user.id).name, "Judith")
+
+        self.dao().delete_user(self.user.id)
+        self.assertIsNone(self.dao().get_user_by_id(self.user.id))
+
+    def test_ttl_and_lru_eviction(self):
+        """Test that entries expire after the TTL and the least recently used is evicted."""
+        self.dao().get_user_by_id(self.user.id)
+        self.clock.now = 61
+        self.assertIsNone(self.cache.get_by_id(self.user.id))
+
+        for user_id in (1, 2, 3):
+            self.cache.put({"id": user_id, "email": f"u{user_id}@example.com"})
+        self.assertIsNone(self.cache.get_by_id(1))
+        self.assertIsNone(self.cache.get_by_email("u1@example.com"))
+        self.assertIsNotNone(self.cache.get_by_email("u3@example.com"))
+
 
 if __name__ == "__main__":
     unittest.main()
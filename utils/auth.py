@@ -1,50 +1,116 @@
+import time
 from functools import wraps
-from rich.console import Console
+from config import TOKEN_VERSION_CACHE_TTL
 from services.auth_service import load_token_from_file
-from utils.jwt_utils import decode_jwt
+from utils.console import console
 
-console = Console()
+# Versions de token déjà vérifiées : {user_id: (token_version, vérifiée_à)}
+_token_versions = {}
+# Dernier token décodé, réutilisé par les commandes successives du mode `shell`
+_decoded_token = (None, None)
 
-from functools import wraps
-from rich.console import Console
-from services.auth_service import load_token_from_file
-from utils.jwt_utils import decode_jwt
-from dao.user_dao import UserDAO
-from database import Session
 
-console = Console()
+def _decode_token(token):
+    """Decode a token, reusing the claims of the previous call for the same token."""
+    global _decoded_token
+    cached_token, claims = _decoded_token
+    if token != cached_token:
+        from utils.jwt_utils import decode_jwt_claims
+
+        claims = decode_jwt_claims(token)
+        _decoded_token = (token, claims)
+    elif claims["exp"] <= time.time():
+        # La signature a déjà été vérifiée, seule l'expiration peut avoir changé
+        raise Exception("Token has expired")
+    return claims
+
+
+def _current_token_version(user_id):
+    """Return the stored token version of a user, cached for TOKEN_VERSION_CACHE_TTL seconds."""
+    cached = _token_versions.get(user_id)
+    if cached and time.monotonic() - cached[1] < TOKEN_VERSION_CACHE_TTL:
+        return cached[0]
+    from dao.user_dao import UserDAO
+    from database import Session
+
+    session = Session()
+    try:
+        version = UserDAO(session).get_token_version(user_id)
+    finally:
+        session.close()
+    if version is not None:
+        _token_versions[user_id] = (version, time.monotonic())
+    return version
+
+
+def forget_token_version(user_id):
+    """Drop the cached token version of a user, after a change that revokes their tokens."""
+    _token_versions.pop(int(user_id), None)
+
+
+def _role_from_database(user_id):
+    """Read the role of a user for tokens issued without role claims."""
+    from dao.user_cache import shared_user_cache
+    from dao.user_dao import UserDAO
+    from database import Session
+
+    session = Session()
+    try:
+        user = UserDAO(session, cache=shared_user_cache()).get_user_by_id(user_id)
+        return user.role if user else None
+    finally:
+        session.close()
+
+
+class AuthError(Exception):
+    """Authentication or authorization failure; `status` is the matching HTTP code."""
+
+    def __init__(self, message, status=401):
+        super().__init__(message)
+        self.status = status
+
+
+def authorize(token, roles=None, read_only=False):
+    """Check a token against the role rules; return (user_id, role) or raise AuthError."""
+    if not token:
+        raise AuthError("Authentication required: Please log in first.")
+    try:
+        claims = _decode_token(token)
+        user_id = claims["user_id"]
+    except Exception as e:
+        raise AuthError(f"Authentication failed: {str(e)}")
+
+    if "role" in claims:
+        # Le rôle signé dans le token suffit ; seule la version est contrôlée
+        # pour que les changements de rôle ou de mot de passe révoquent le token
+        version = _current_token_version(user_id)
+        if version is None:
+            raise AuthError("Unauthorized: User not found.")
+        if version != claims.get("ver", 0):
+            raise AuthError("Session revoked: Please log in again.")
+        role = claims["role"]
+    else:
+        # Ancien token sans claims de rôle : lecture de l'utilisateur en base
+        role = _role_from_database(user_id)
+        if role is None:
+            raise AuthError("Unauthorized: User not found.")
+
+    # Autorisation pour lecture seule : tous les rôles passent
+    if roles and role not in roles and not read_only:
+        raise AuthError("Unauthorized: Insufficient permissions.", status=403)
+    return user_id, role
+
 
 def auth_required(roles=None, read_only=False):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             token = load_token_from_file()
-            if not token:
-                console.print("[bold red]Authentication required: Please log in first.[/bold red]")
-                return
             try:
-                user_id = decode_jwt(token)
-            except Exception as e:
-                console.print(f"[bold red]Authentication failed: {str(e)}[/bold red]")
+                user_id, _ = authorize(token, roles, read_only)
+            except AuthError as e:
+                console.print(f"[bold red]{e}[/bold red]")
                 return
-
-            session = Session()
-            user_dao = UserDAO(session)
-            try:
-                user = user_dao.get_user_by_id(user_id)
-                if not user:
-                    console.print("[bold red]Unauthorized: User not found.[/bold red]")
-                    return
-
-                if roles and user.role not in roles:
-                    if read_only:
-                        # Autorisation pour lecture seule
-                        return f(user_id, *args, **kwargs)
-                    console.print("[bold red]Unauthorized: Insufficient permissions.[/bold red]")
-                    return
-            finally:
-                session.close()
-
             return f(user_id, *args, **kwargs)
         return decorated_function
-    return decorator
\ No newline at end of file
+    return decorator
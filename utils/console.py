@@ -0,0 +1,18 @@
+class _LazyConsole:
+    """rich Console created on first use, so `cli.py --help` never imports rich."""
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(**self._kwargs)
+        return getattr(self._console, name)
+
+
+# Consoles partagées par la CLI : sortie standard et erreurs
+console = _LazyConsole()
+err_console = _LazyConsole(stderr=True)
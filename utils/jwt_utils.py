@@ -15,13 +15,17 @@ from datetime import datetime, timedelta
 from config import JWT_SECRET_KEY, JWT_ALGORITHM, JWT_EXP_DELTA_SECONDS
 
 
-def generate_jwt(user_id):
+def generate_jwt(user_id, role=None, token_version=None):
     """Generate a JSON Web Token for a user."""
     # Calcul du temps d'expiration du token en ajoutant une durée définie par JWT_EXP_DELTA_SECONDS
     exp = datetime.utcnow() + timedelta(seconds=JWT_EXP_DELTA_SECONDS)
     
     # Création du payload contenant l'ID de l'utilisateur et l'heure d'expiration
     payload = {"user_id": user_id, "exp": exp}
+    if role is not None:
+        # Le rôle et la version signés évitent de relire l'utilisateur à chaque commande
+        payload["role"] = role
+        payload["ver"] = token_version or 0
     
     # Génération du token avec le payload, la clé secrète et l'algorithme de signature définis dans la configuration
     return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
@@ -29,12 +33,15 @@ def generate_jwt(user_id):
 
 def decode_jwt(token):
     """Decode a JSON Web Token."""
+    # Retourne l'ID de l'utilisateur contenu dans le token
+    return decode_jwt_claims(token)["user_id"]
+
+
+def decode_jwt_claims(token):
+    """Decode a JSON Web Token and return all its verified claims."""
     try:
         # Décode le token en utilisant la clé secrète et l'algorithme spécifié dans la configuration
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        
-        # Retourne l'ID de l'utilisateur contenu dans le token
-        return payload["user_id"]
+        return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         # Si le token a expiré, lève une exception avec un message approprié
         raise Exception("Token has expired")
@@ -0,0 +1,233 @@
+import csv
+import datetime
+import json
+import sys
+
+# Formats disponibles pour les commandes `list`
+OUTPUT_FORMATS = ("table", "ndjson", "csv", "tsv")
+
+# Colonnes affichées par entité : (clé, en-tête, style rich)
+CLIENT_COLUMNS = [
+    ("id", "ID", "cyan"),
+    ("full_name", "Name", "magenta"),
+    ("email", "Email", "green"),
+    ("phone", "Phone", "yellow"),
+    ("company_name", "Company", "blue"),
+    ("commercial_contact", "Commercial ID", "red"),
+    ("commercial_name", "Commercial", "red"),
+    ("creation_date", "Creation Date", "white"),
+    ("last_contact_date", "Last Contact Date", "white"),
+    ("updated_at", "Updated At", "white"),
+]
+
+CONTRACT_COLUMNS = [
+    ("id", "ID", "cyan"),
+    ("client_id", "Client ID", "magenta"),
+    ("client_name", "Client", "magenta"),
+    ("total_amount", "Total Amount", "green"),
+    ("amount_remaining", "Amount Remaining", "red"),
+    ("signed", "Signed", "yellow"),
+    ("updated_at", "Updated At", "white"),
+]
+
+# Montants des contrats, préfixés par $ dans le tableau ; NDJSON et CSV gardent des nombres
+CURRENCY_KEYS = ("total_amount", "amount_remaining")
+
+EVENT_COLUMNS = [
+    ("id", "ID", "cyan"),
+    ("contract_id", "Contract ID", "magenta"),
+    ("client_name", "Client", "magenta"),
+    ("contract_status", "Contract Status", "yellow"),
+    ("start_date", "Start Date", "green"),
+    ("end_date", "End Date", "red"),
+    ("support_user_id", "Support ID", "yellow"),
+    ("location", "Location", "blue"),
+    ("attendees", "Attendees", "white"),
+    ("updated_at", "Updated At", "white"),
+]
+
+CONFLICT_COLUMNS = [
+    ("support_user_id", "Support ID", "yellow"),
+    ("event_id", "Event ID", "cyan"),
+    ("start_date", "Start Date", "green"),
+    ("end_date", "End Date", "red"),
+    ("other_event_id", "Other Event", "magenta"),
+    ("other_start_date", "Other Start", "green"),
+    ("other_end_date", "Other End", "red"),
+]
+
+ASSIGNMENT_COLUMNS = [
+    ("support_user_id", "Support ID", "cyan"),
+    ("name", "Name", "magenta"),
+    ("already_booked", "Already Booked", "yellow"),
+    ("assigned", "Newly Assigned", "green"),
+]
+
+USER_COLUMNS = [
+    ("id", "ID", "cyan"),
+    ("employee_number", "Employee Number", "magenta"),
+    ("name", "Name", "green"),
+    ("email", "Email", "yellow"),
+    ("role", "Role", "blue"),
+    ("updated_at", "Updated At", "white"),
+]
+
+# Colonnes des rapports : les lignes sont déjà des dicts produits par ReportDAO
+REVENUE_COLUMNS = [
+    ("commercial_id", "Commercial ID", "cyan"),
+    ("commercial_name", "Commercial", "magenta"),
+    ("contracts", "Signed Contracts", "white"),
+    ("revenue", "Signed Revenue", "green"),
+    ("collected", "Collected", "blue"),
+    ("outstanding", "Outstanding", "red"),
+]
+
+RECEIVABLE_COLUMNS = [
+    ("client_id", "Client ID", "cyan"),
+    ("full_name", "Name", "magenta"),
+    ("company_name", "Company", "blue"),
+    ("contracts", "Unpaid Contracts", "white"),
+    ("outstanding", "Outstanding", "red"),
+]
+
+SIGNED_COLUMNS = [
+    ("signed", "Signed", "yellow"),
+    ("contracts", "Contracts", "white"),
+    ("total_amount", "Total Amount", "green"),
+    ("amount_remaining", "Amount Remaining", "red"),
+]
+
+POOL_STATS_COLUMNS = [
+    ("metric", "Metric", "cyan"),
+    ("value", "Value", "green"),
+]
+
+
+def _row(obj, columns, **related):
+    """Extract the listed attributes of an ORM object into a plain dict."""
+    return {key: related[key] if key in related else getattr(obj, key) for key, _, _ in columns}
+
+
+def _contract_status(contract):
+    """Describe whether a contract is signed and fully paid."""
+    if contract is None:
+        return None
+    if not contract.signed:
+        return "Unsigned"
+    return "Signed, unpaid" if contract.amount_remaining else "Signed, paid"
+
+
+# Les colonnes des objets liés lisent des relations : les DAO les chargent avec
+# `with_related=True` pour éviter une requête par ligne
+def client_row(client) -> dict:
+    """Serialize a client for the list renderers."""
+    commercial = client.commercial
+    return _row(client, CLIENT_COLUMNS, commercial_name=commercial.name if commercial else None)
+
+
+def contract_row(contract) -> dict:
+    """Serialize a contract for the list renderers."""
+    client = contract.client
+    return _row(contract, CONTRACT_COLUMNS, client_name=client.full_name if client else None)
+
+
+def event_row(event) -> dict:
+    """Serialize an event for the list renderers."""
+    contract = event.contract
+    client = contract.client if contract else None
+    return _row(
+        event,
+        EVENT_COLUMNS,
+        client_name=client.full_name if client else None,
+        contract_status=_contract_status(contract),
+    )
+
+
+def conflict_row(first, second) -> dict:
+    """Serialize a pair of overlapping events for the list renderers."""
+    return {
+        "support_user_id": first.support_user_id,
+        "event_id": first.id,
+        "start_date": first.start_date,
+        "end_date": first.end_date,
+        "other_event_id": second.id,
+        "other_start_date": second.start_date,
+        "other_end_date": second.end_date,
+    }
+
+
+def user_row(user) -> dict:
+    """Serialize a collaborator for the list renderers (never the password hash)."""
+    return _row(user, USER_COLUMNS)
+
+
+def default_format(console) -> str:
+    """Use the rich table on a terminal and NDJSON when the output is piped."""
+    return "table" if console.is_terminal else "ndjson"
+
+
+def _cell(value, key=None) -> str:
+    """Format a value for a rich table cell."""
+    if value is None or value == "":
+        return "N/A"
+    if key in CURRENCY_KEYS:
+        return f"${value}"
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, datetime.date):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+def _plain(value):
+    """Convert a value into something json/csv can write."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def plain_row(row, columns) -> dict:
+    """Keep the listed keys of a row, with values json can write (NDJSON and HTTP API)."""
+    return {key: _plain(row[key]) for key, _, _ in columns}
+
+
+def render_rows(console, title, columns, rows, fmt="table", out=None):
+    """Render rows as a rich table or stream them as NDJSON/CSV/TSV.
+
+    Returns the number of rows written and the last row, so callers can
+    print the cursor of the next page.
+    """
+    count, last = 0, None
+    if fmt == "table":
+        # Le tableau rich doit mesurer toutes les lignes avant d'imprimer : il
+        # n'est utilisé que pour des pages de taille bornée.
+        from rich.table import Table
+
+        table = Table(title=title)
+        for _, header, style in columns:
+            table.add_column(header, style=style)
+        for row in rows:
+            table.add_row(*(_cell(row[key], key) for key, _, _ in columns))
+            count, last = count + 1, row
+        console.print(table)
+        return count, last
+
+    # Les autres formats écrivent chaque ligne dès qu'elle arrive du curseur
+    out = out or sys.stdout
+    keys = [key for key, _, _ in columns]
+    if fmt == "ndjson":
+        for row in rows:
+            out.write(json.dumps(plain_row(row, columns)) + "\n")
+            count, last = count + 1, row
+    elif fmt in ("csv", "tsv"):
+        writer = csv.writer(out, delimiter="," if fmt == "csv" else "\t")
+        writer.writerow(keys)
+        for row in rows:
+            writer.writerow(["" if row[k] is None else _plain(row[k]) for k in keys])
+            count, last = count + 1, row
+    else:
+        raise ValueError(f"Unknown output format: {fmt}")
+    out.flush()
+    return count, last
@@ -0,0 +1,114 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Checkout, connection and wait counters of an engine's pool, fed by pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connect_started = threading.local()
+        self.checkouts = 0
+        self.checkins = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.connects = 0
+        self.connect_ms_total = 0.0
+        self.connect_ms_max = 0.0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def attach(self, engine):
+        """Listen to the pool events of an engine (they survive engine.dispose())."""
+        event.listen(engine, "do_connect", self._on_do_connect)
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        if isinstance(engine.pool, TimedQueuePool):
+            engine.pool.metrics = self
+        return self
+
+    def _on_do_connect(self, dialect, conn_rec, cargs, cparams):
+        self._connect_started.value = time.perf_counter()
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        started = getattr(self._connect_started, "value", None)
+        elapsed = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+        self._connect_started.value = None
+        with self._lock:
+            self.connects += 1
+            self.connect_ms_total += elapsed
+            self.connect_ms_max = max(self.connect_ms_max, elapsed)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            # Une connexion invalidée avant son checkout est rendue sans avoir été comptée
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        # Inclut les connexions coupées détectées par pool_pre_ping
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, elapsed_ms):
+        """Record the time a checkout spent obtaining a connection from the pool."""
+        with self._lock:
+            self.waits += 1
+            self.wait_ms_total += elapsed_ms
+            self.wait_ms_max = max(self.wait_ms_max, elapsed_ms)
+
+    def snapshot(self, pool=None) -> dict:
+        """Return the counters, plus the current state of `pool` when given."""
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "connects": self.connects,
+                "connect_ms_avg": round(self.connect_ms_total / self.connects, 3) if self.connects else 0.0,
+                "connect_ms_max": round(self.connect_ms_max, 3),
+                "invalidations": self.invalidations,
+                "waits": self.waits,
+                "wait_ms_avg": round(self.wait_ms_total / self.waits, 3) if self.waits else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+            }
+        if pool is not None:
+            stats["pool_class"] = type(pool).__name__
+            if isinstance(pool, QueuePool):
+                stats["pool_size"] = pool.size()
+                stats["pool_checked_in"] = pool.checkedin()
+                stats["pool_overflow"] = pool.overflow()
+        return stats
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool timing how long each checkout waits for a free or new connection."""
+
+    metrics = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait((time.perf_counter() - started) * 1000)
+
+    def recreate(self):
+        # engine.dispose() remplace le pool : les compteurs suivent le nouveau
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
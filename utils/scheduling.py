@@ -0,0 +1,74 @@
+import bisect
+import heapq
+
+
+def find_overlaps(intervals):
+    """Yield the overlapping pairs of (start, end, item) intervals sorted by start.
+
+    Bounds are inclusive: an event ending the day another one starts
+    overlaps it. A sweep line keeps the intervals still open at the current
+    start in a min-heap of end dates, so the cost is O(n log n + k) for k
+    overlapping pairs instead of comparing every pair.
+    """
+    active = []  # (fin, rang, élément) : le rang départage les fins identiques
+    for rank, (start, end, item) in enumerate(intervals):
+        # Les intervalles terminés avant ce début ne chevaucheront plus aucun suivant
+        while active and active[0][0] < start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            yield other, item
+        heapq.heappush(active, (end, rank, item))
+
+
+def assign_intervals(intervals, workers, busy=None):
+    """Assign (start, end, item) intervals to workers without overlaps, balancing the load.
+
+    Intervals are taken by start date; each one goes to the free worker with
+    the fewest assignments (ties broken by worker id). `busy` maps a worker
+    to intervals it already holds: they count in its load and are never
+    overlapped. Returns ({item: worker}, [items left unassigned]).
+    """
+    busy = busy or {}
+    schedules = {}
+    available = []  # (charge, travailleur) des travailleurs libres
+    for worker in workers:
+        held = sorted(busy.get(worker, ()))
+        max_ends, latest = [], None
+        for _, end in held:
+            latest = end if latest is None or end > latest else latest
+            max_ends.append(latest)
+        schedules[worker] = ([start for start, _ in held], max_ends)
+        available.append((len(held), worker))
+    heapq.heapify(available)
+    working = []  # (fin, charge, travailleur) des travailleurs occupés par une affectation
+
+    assignments, unassigned = {}, []
+    for start, end, item in sorted(intervals, key=lambda interval: interval[:2]):
+        # Les travailleurs dont la dernière affectation est terminée redeviennent libres
+        while working and working[0][0] < start:
+            _, load, worker = heapq.heappop(working)
+            heapq.heappush(available, (load, worker))
+
+        skipped, chosen = [], None
+        while available:
+            load, worker = heapq.heappop(available)
+            starts, max_ends = schedules[worker]
+            if starts:
+                # Parmi les intervalles déjà tenus commençant au plus tard à `end`, il y a
+                # chevauchement si le plus tardif à se terminer finit au plus tôt à `start`
+                index = bisect.bisect_right(starts, end)
+                if index and max_ends[index - 1] >= start:
+                    skipped.append((load, worker))
+                    continue
+            chosen = (load, worker)
+            break
+        for entry in skipped:
+            heapq.heappush(available, entry)
+
+        if chosen is None:
+            unassigned.append(item)
+            continue
+        load, worker = chosen
+        assignments[item] = worker
+        heapq.heappush(working, (end, load + 1, worker))
+    return assignments, unassigned
@@ -10,10 +10,20 @@
 #                                                                              #
 # **************************************************************************** #
 
+import statistics
+import time
 from argon2 import PasswordHasher
+from config import ARGON2_MEMORY_COST, ARGON2_PARALLELISM, ARGON2_TIME_COST
 
 # Initialise le mot de passe hashé avec la bibliothèque Argon2
-ph = PasswordHasher()
+ph = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM,
+)
+
+# Mémoire minimale (KiB) testée par `calibrate` avant d'abandonner
+MIN_MEMORY_COST = 8192
 
 
 def hash_password(password):
@@ -32,3 +42,62 @@ def verify_password(stored_password, provided_password):
     except Exception:
         # Si la vérification échoue (par exemple, le mot de passe ne correspond pas), retourne False
         return False
+
+
+def needs_rehash(stored_password):
+    """Tell whether a stored hash was made with other parameters than the configured ones."""
+    return ph.check_needs_rehash(stored_password)
+
+
+def check_password(stored_password, provided_password):
+    """Verify a password; also return a new hash when the stored one uses outdated parameters."""
+    if not verify_password(stored_password, provided_password):
+        return False, None
+    # Hachage avec les paramètres configurés, à enregistrer après une connexion réussie
+    return True, hash_password(provided_password) if needs_rehash(stored_password) else None
+
+
+def measure_verify_ms(hasher, runs=3):
+    """Return the median time in ms taken by `hasher` to verify a password."""
+    stored = hasher.hash("calibration-password")
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        hasher.verify(stored, "calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms, memory_cost=ARGON2_MEMORY_COST, parallelism=ARGON2_PARALLELISM, max_time_cost=20, runs=3):
+    """Pick the most expensive Argon2 parameters whose verify time stays under target_ms.
+
+    time_cost is raised while the target holds; when even time_cost=1 is too
+    slow, memory_cost is halved down to MIN_MEMORY_COST. Returns a dict with
+    time_cost, memory_cost, parallelism and the measured verify_ms.
+    """
+    while True:
+        best = None
+        for time_cost in range(1, max_time_cost + 1):
+            hasher = PasswordHasher(
+                time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+            )
+            elapsed = measure_verify_ms(hasher, runs)
+            if elapsed > target_ms:
+                break
+            best = {
+                "time_cost": time_cost,
+                "memory_cost": memory_cost,
+                "parallelism": parallelism,
+                "verify_ms": elapsed,
+            }
+        if best is not None:
+            return best
+        if memory_cost // 2 < MIN_MEMORY_COST:
+            # Objectif inatteignable : on renvoie les paramètres les moins coûteux testés
+            return {
+                "time_cost": 1,
+                "memory_cost": memory_cost,
+                "parallelism": parallelism,
+                "verify_ms": elapsed,
+            }
+        memory_cost //= 2
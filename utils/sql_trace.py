@@ -0,0 +1,132 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from config import SQL_TRACE_REPEAT_THRESHOLD
+
+# Longueur des requêtes affichées dans le résumé console (le JSON les garde entières)
+DISPLAY_LENGTH = 120
+
+
+def _one_line(statement):
+    """Shorten a statement to one line, escaped for rich markup."""
+    from rich.markup import escape
+
+    return escape(re.sub(r"\s+", " ", statement).strip()[:DISPLAY_LENGTH])
+
+
+class SQLTrace:
+    """Count the statements an engine runs and flag the ones repeated N times (N+1)."""
+
+    def __init__(self, repeat_threshold=SQL_TRACE_REPEAT_THRESHOLD):
+        self.repeat_threshold = repeat_threshold
+        self._lock = threading.Lock()
+        self._engine = None
+        # {requête: [nombre, durée totale en ms]}, dans l'ordre de première exécution
+        self.statements = OrderedDict()
+        self.queries = 0
+        self.total_ms = 0.0
+        self.slowest = (None, 0.0)
+
+    def attach(self, engine):
+        """Start recording the statements run on `engine`."""
+        from sqlalchemy import event
+
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._on_error)
+        self._engine = engine
+        return self
+
+    def detach(self):
+        """Stop recording; the collected counters are kept."""
+        from sqlalchemy import event
+
+        if self._engine is not None:
+            event.remove(self._engine, "before_cursor_execute", self._before)
+            event.remove(self._engine, "after_cursor_execute", self._after)
+            event.remove(self._engine, "handle_error", self._on_error)
+            self._engine = None
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        # Une pile par connexion, comme dans la recette de la documentation SQLAlchemy
+        conn.info.setdefault("sql_trace_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = (time.perf_counter() - conn.info["sql_trace_started"].pop()) * 1000
+        with self._lock:
+            self.queries += 1
+            self.total_ms += elapsed
+            entry = self.statements.setdefault(statement, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > self.slowest[1]:
+                self.slowest = (statement, elapsed)
+
+    def _on_error(self, exception_context):
+        # after_cursor_execute n'est pas appelé quand la requête échoue
+        conn = exception_context.connection
+        started = conn.info.get("sql_trace_started") if conn is not None else None
+        if started:
+            started.pop()
+
+    def repeated(self) -> list[tuple]:
+        """Return (statement, count) of the statements run at least `repeat_threshold` times."""
+        with self._lock:
+            return sorted(
+                (
+                    (statement, count)
+                    for statement, (count, _) in self.statements.items()
+                    if count >= self.repeat_threshold
+                ),
+                key=lambda item: -item[1],
+            )
+
+    def summary(self, command=None) -> dict:
+        """Return the trace as a JSON-serializable dict."""
+        repeated = self.repeated()
+        with self._lock:
+            slowest_statement, slowest_ms = self.slowest
+            return {
+                "command": command,
+                "queries": self.queries,
+                "distinct_statements": len(self.statements),
+                "total_ms": round(self.total_ms, 3),
+                "slowest": {"statement": slowest_statement, "ms": round(slowest_ms, 3)},
+                "n_plus_one": [
+                    {"statement": statement, "count": count} for statement, count in repeated
+                ],
+                "statements": [
+                    {"statement": statement, "count": count, "total_ms": round(total, 3)}
+                    for statement, (count, total) in self.statements.items()
+                ],
+            }
+
+    def report(self, console):
+        """Print the query count, total and slowest time, then the N+1 suspects."""
+        summary = self.summary()
+        console.print(
+            f"[dim]SQL: {summary['queries']} queries "
+            f"({summary['distinct_statements']} distinct), "
+            f"{summary['total_ms']:.1f} ms total[/dim]"
+        )
+        if summary["slowest"]["statement"] is not None:
+            console.print(
+                f"[dim]slowest {summary['slowest']['ms']:.1f} ms: "
+                f"{_one_line(summary['slowest']['statement'])}[/dim]",
+                highlight=False,
+                soft_wrap=True,
+            )
+        for item in summary["n_plus_one"]:
+            console.print(
+                f"[bold yellow]N+1 suspect: {item['count']} x "
+                f"{_one_line(item['statement'])}[/bold yellow]",
+                highlight=False,
+                soft_wrap=True,
+            )
+
+    def write_json(self, path, command=None):
+        """Write the summary to a JSON file (CI regression checks)."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(command), file, indent=2)
@@ -0,0 +1,21 @@
+import time
+
+
+class StartupTimer:
+    """Record the phases of a CLI run and report how long each one took."""
+
+    def __init__(self, started_at=None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, phase):
+        """Close the current phase under the given name."""
+        self.marks.append((phase, time.perf_counter()))
+
+    def report(self, console):
+        """Print one line per phase, then the total, in milliseconds."""
+        previous = self.started_at
+        for phase, at in self.marks:
+            console.print(f"[dim]{phase:<16}{(at - previous) * 1000:>9.1f} ms[/dim]")
+            previous = at
+        console.print(f"[dim]{'total':<16}{(previous - self.started_at) * 1000:>9.1f} ms[/dim]")